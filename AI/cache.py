@@ -0,0 +1,268 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+# Caches live outside the app database so they can be wiped without touching user data
+CACHE_DIR = os.environ.get(
+    "CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "cache"),
+)
+
+
+class LRUCache:
+    """Thread-safe, size-bounded in-memory LRU mapping."""
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key not in self._data:
+                return None
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def pop(self, key):
+        with self._lock:
+            return self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class SQLiteStore:
+    """
+    Durable key/value table in its own SQLite file.
+    Connections are opened lazily, one per thread, so the store can be shared by worker threads.
+    """
+
+    def __init__(self, path, table):
+        self.path = path
+        self.table = table
+        self._local = threading.local()
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.table} ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            conn.execute(
+                f"CREATE INDEX IF NOT EXISTS ix_{self.table}_accessed_at ON {self.table} (accessed_at)"
+            )
+            conn.commit()
+            self._local.conn = conn
+        return conn
+
+    def get(self, key, max_age=None):
+        """Returns the stored value, or None if missing or older than max_age seconds."""
+        try:
+            conn = self._connect()
+            row = conn.execute(
+                f"SELECT value, created_at FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            now = time.time()
+            if max_age is not None and now - row[1] > max_age:
+                conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+                conn.commit()
+                return None
+            conn.execute(f"UPDATE {self.table} SET accessed_at = ? WHERE key = ?", (now, key))
+            conn.commit()
+            return row[0]
+        except sqlite3.Error as e:
+            logger.warning(f"Cache read failed ({self.table}): {e}")
+            return None
+
+    def set(self, key, value):
+        try:
+            conn = self._connect()
+            now = time.time()
+            conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, value, now, now),
+            )
+            conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Cache write failed ({self.table}): {e}")
+
+    def delete(self, key):
+        try:
+            conn = self._connect()
+            conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+            conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Cache delete failed ({self.table}): {e}")
+
+    def prune(self, max_entries):
+        """Drops the least recently used rows beyond max_entries."""
+        try:
+            conn = self._connect()
+            conn.execute(
+                f"DELETE FROM {self.table} WHERE key IN ("
+                f"SELECT key FROM {self.table} ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (max_entries,),
+            )
+            conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Cache prune failed ({self.table}): {e}")
+
+
+def file_digest(path, chunk_size=1024 * 1024):
+    """SHA-256 of a file's bytes, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def normalize_text(text):
+    """Collapses runs of spaces and blank lines left behind by PDF extraction."""
+    lines = [re.sub(r"[ \t\f\v]+", " ", line).strip() for line in text.splitlines()]
+    return re.sub(r"\n{3,}", "\n\n", "\n".join(lines)).strip()
+
+
+class TieredCache:
+    """Hit/miss bookkeeping shared by the memory + SQLite caches below."""
+
+    def __init__(self, memory_entries):
+        self.memory = LRUCache(memory_entries)
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def stats(self):
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.memory_hits + self.disk_hits) / lookups, 3) if lookups else 0.0,
+            "memory_entries": len(self.memory),
+        }
+
+    def _count(self, counter):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+
+class TextExtractionCache(TieredCache):
+    """
+    Content-addressed cache of extracted PDF text.
+    Keys are SHA-256 digests of the file bytes; entries hold the normalized text,
+    page count and how long the original extraction took.
+    """
+
+    def __init__(self, path=None, max_entries=128):
+        super().__init__(max_entries)
+        self.disk = SQLiteStore(path or os.path.join(CACHE_DIR, "pdf_text.db"), "pdf_text")
+
+    def lookup(self, digest):
+        entry = self.memory.get(digest)
+        if entry is not None:
+            self._count("memory_hits")
+            return entry
+
+        raw = self.disk.get(digest)
+        if raw is not None:
+            entry = json.loads(raw)
+            self.memory.set(digest, entry)
+            self._count("disk_hits")
+            return entry
+
+        self._count("misses")
+        return None
+
+    def store(self, digest, entry):
+        self.memory.set(digest, entry)
+        self.disk.set(digest, json.dumps(entry))
+
+
+class ResponseCache(TieredCache):
+    """
+    Cache of LLM completions keyed on model, prompt hash, format and options.
+    Entries expire after ttl seconds; both tiers are size-bounded LRU.
+    """
+
+    def __init__(self, path=None, ttl=7 * 24 * 3600, max_entries=2000, memory_entries=256):
+        super().__init__(memory_entries)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.disk = SQLiteStore(path or os.path.join(CACHE_DIR, "llm_responses.db"), "llm_responses")
+        self._writes = 0
+
+    @staticmethod
+    def make_key(model, prompt, format=None, options=None):
+        payload = {
+            "model": model,
+            "prompt": hashlib.sha256(prompt.encode("utf-8")).hexdigest(),
+            "format": format,
+            "options": options or {},
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def lookup(self, key):
+        entry = self.memory.get(key)
+        if entry is not None:
+            if time.time() - entry[1] <= self.ttl:
+                self._count("memory_hits")
+                return entry[0]
+            self.memory.pop(key)
+
+        raw = self.disk.get(key, max_age=self.ttl)
+        if raw is not None:
+            entry = json.loads(raw)
+            self.memory.set(key, (entry["content"], entry["created_at"]))
+            self._count("disk_hits")
+            return entry["content"]
+
+        self._count("misses")
+        return None
+
+    def store(self, key, content):
+        now = time.time()
+        self.memory.set(key, (content, now))
+        self.disk.set(key, json.dumps({"content": content, "created_at": now}))
+        with self._lock:
+            self._writes += 1
+            prune = self._writes % 100 == 0
+        if prune:
+            self.disk.prune(self.max_entries)
+
+
+# Shared by every ResumeAnalyzer in the process
+text_cache = TextExtractionCache()
+response_cache = ResponseCache(
+    ttl=int(os.environ.get("LLM_CACHE_TTL", 7 * 24 * 3600)),
+    max_entries=int(os.environ.get("LLM_CACHE_MAX_ENTRIES", 2000)),
+)
@@ -0,0 +1,102 @@
+import base64
+import hashlib
+import logging
+import os
+import re
+import threading
+
+import numpy as np
+
+from AI.cache import CACHE_DIR, LRUCache, SQLiteStore
+
+logger = logging.getLogger(__name__)
+
+EMBEDDING_MODEL = os.environ.get("EMBEDDING_MODEL", "all-MiniLM-L6-v2")
+
+
+def strip_html(text):
+    """Reduces pasted HTML (e.g. from the Quill editor) to plain text."""
+    text = re.sub(r"<[^<]+?>", " ", text or "")
+    return re.sub(r"\s+", " ", text).strip()
+
+
+class Embedder:
+    """
+    Local sentence-transformers embeddings, L2-normalized so a dot product is cosine similarity.
+    Vectors are cached by text hash in memory and in SQLite. The model is loaded on first use;
+    if sentence-transformers is not installed, embed() returns None and callers skip the
+    semantic stage.
+    """
+
+    def __init__(self, model_name=EMBEDDING_MODEL, cache_path=None):
+        self.model_name = model_name
+        self.memory = LRUCache(2048)
+        self.disk = SQLiteStore(cache_path or os.path.join(CACHE_DIR, "embeddings.db"), "embeddings")
+        self._model = None
+        self._unavailable = False
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if self._model is not None or self._unavailable:
+            return self._model
+        with self._lock:
+            if self._model is None and not self._unavailable:
+                try:
+                    from sentence_transformers import SentenceTransformer
+                    self._model = SentenceTransformer(self.model_name, device="cpu")
+                except Exception as e:
+                    logger.warning(f"Embedding model unavailable, semantic scoring disabled: {e}")
+                    self._unavailable = True
+        return self._model
+
+    @property
+    def available(self):
+        return self._load() is not None
+
+    def _key(self, text):
+        return hashlib.sha256(f"{self.model_name}\0{text}".encode("utf-8")).hexdigest()
+
+    def embed(self, texts):
+        """Returns an (n, dim) float32 array for the given texts, or None if no model is available."""
+        model = self._load()
+        if model is None:
+            return None
+
+        keys = [self._key(text) for text in texts]
+        vectors = [None] * len(texts)
+        missing = []
+        for i, key in enumerate(keys):
+            vector = self.memory.get(key)
+            if vector is None:
+                raw = self.disk.get(key)
+                if raw is not None:
+                    vector = np.frombuffer(base64.b64decode(raw), dtype=np.float32)
+                    self.memory.set(key, vector)
+            if vector is None:
+                missing.append(i)
+            vectors[i] = vector
+
+        if missing:
+            encoded = model.encode(
+                [texts[i] for i in missing],
+                batch_size=32,
+                normalize_embeddings=True,
+                convert_to_numpy=True,
+            ).astype(np.float32)
+            for i, vector in zip(missing, encoded):
+                vectors[i] = vector
+                self.memory.set(keys[i], vector)
+                self.disk.set(keys[i], base64.b64encode(vector.tobytes()).decode("ascii"))
+
+        return np.vstack(vectors) if vectors else np.zeros((0, 0), dtype=np.float32)
+
+    def similarities(self, query, documents):
+        """Cosine similarity of one query against many documents, as a 1-D array."""
+        matrix = self.embed([query] + list(documents))
+        if matrix is None:
+            return None
+        return matrix[1:] @ matrix[0]
+
+
+# Shared by ranking, fast scoring and the vector indexes
+embedder = Embedder()
@@ -0,0 +1,100 @@
+import re
+from collections import Counter
+
+from AI.embeddings import strip_html
+
+STOPWORDS = frozenset("""
+a about above across after again against all also am an and any are as at be because been before being
+below between both but by can could did do does doing down during each etc few for from further had has
+have having he her here hers him his how i if in into is it its itself just level may me more most must
+my no nor not now of off on once only or other our ours out over own per plus same she should so some
+such than that the their theirs them then there these they this those through to too under until up
+upon us very via was we well were what when where which while who whom why will with within without
+would you your yours
+ability able applicant applicants apply benefits candidate candidates company competitive degree
+description duties employer environment equal excellent experience familiarity good great help ideal
+including job join knowledge looking need needs new opportunity position preferred plus related required
+requirements responsibilities role salary skills strong team teams understanding work working world
+year years
+""".split())
+
+# Keeps tokens like c++, c#, node.js and ci/cd intact
+TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#./-]*[a-z0-9+#]|[a-z0-9]")
+
+
+def tokenize(text):
+    return TOKEN_RE.findall(text.lower())
+
+
+def extract_keywords(job_description, limit=25):
+    """
+    Picks the terms a job description leans on: frequent non-stopword unigrams and bigrams,
+    with bigrams weighted up because phrases like 'machine learning' carry more signal.
+    """
+    tokens = tokenize(strip_html(job_description))
+    counts = Counter()
+    for i, token in enumerate(tokens):
+        if token in STOPWORDS or token.isdigit() or len(token) < 2:
+            continue
+        counts[token] += 1
+        if i + 1 < len(tokens):
+            nxt = tokens[i + 1]
+            if nxt not in STOPWORDS and not nxt.isdigit() and len(nxt) > 1:
+                counts[f"{token} {nxt}"] += 1.5
+
+    # A bigram that only ever appears once is usually just adjacent words
+    ranked = [
+        (term, weight) for term, weight in counts.items()
+        if " " not in term or weight >= 3
+    ]
+    ranked.sort(key=lambda item: (-item[1], item[0]))
+
+    keywords = []
+    for term, _ in ranked:
+        # Skip unigrams already covered by a chosen phrase
+        if any(term in kept.split() for kept in keywords if " " in kept):
+            continue
+        keywords.append(term)
+        if len(keywords) >= limit:
+            break
+    return keywords
+
+
+def fast_score(resume_text, job_description, embedder=None):
+    """
+    Scores a resume against a job description on CPU only, without calling Ollama.
+    Blends keyword coverage with embedding similarity (when an embedding model is available)
+    and returns the same keys as ResumeAnalyzer.analyze, minus the rewritten resume.
+    """
+    keywords = extract_keywords(job_description)
+    resume_tokens = " " + " ".join(tokenize(resume_text or "")) + " "
+    matching = [k for k in keywords if f" {k} " in resume_tokens]
+    missing = [k for k in keywords if f" {k} " not in resume_tokens]
+    coverage = len(matching) / len(keywords) if keywords else 0.0
+
+    semantic = None
+    if embedder is not None and resume_text:
+        similarities = embedder.similarities(strip_html(job_description), [resume_text])
+        if similarities is not None:
+            # MiniLM cosines for related documents sit roughly between 0.2 and 0.7
+            semantic = min(1.0, max(0.0, (float(similarities[0]) - 0.2) / 0.5))
+
+    blended = coverage if semantic is None else 0.6 * semantic + 0.4 * coverage
+    score = int(round(blended * 100))
+
+    if score >= 75:
+        verdict = "Strong Fit"
+    elif score >= 50:
+        verdict = "Potential Fit"
+    else:
+        verdict = "Poor Fit"
+
+    return {
+        "score": score,
+        "summary": f"{verdict}. Quick score: the resume covers {len(matching)} of {len(keywords)} key terms "
+                   f"from the job description. Run the full analysis for a detailed critique and rewrite.",
+        "matching_keywords": matching,
+        "missing_keywords": missing,
+        "recommendations": [f"Add concrete evidence of '{k}' if you have it." for k in missing[:3]],
+        "mode": "fast",
+    }
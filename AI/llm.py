@@ -0,0 +1,73 @@
+import logging
+import os
+import threading
+
+import httpx
+import ollama
+
+logger = logging.getLogger(__name__)
+
+OLLAMA_HOST = os.environ.get("OLLAMA_HOST", "http://127.0.0.1:11434")
+LLM_CONNECT_TIMEOUT = float(os.environ.get("LLM_CONNECT_TIMEOUT", 5))
+# Time allowed between bytes; a non-streamed completion sends nothing until it is finished
+LLM_READ_TIMEOUT = float(os.environ.get("LLM_READ_TIMEOUT", 300))
+LLM_MAX_CONNECTIONS = int(os.environ.get("LLM_MAX_CONNECTIONS", 16))
+LLM_MAX_KEEPALIVE = int(os.environ.get("LLM_MAX_KEEPALIVE", 8))
+
+
+class LLMClient:
+    """
+    Process-wide Ollama client. Owns a single ollama.Client whose httpx connection pool is
+    kept alive between calls, so connection setup is paid once per worker process rather
+    than on every request. All model calls in the app go through this class.
+    """
+
+    def __init__(self, host=OLLAMA_HOST, connect_timeout=LLM_CONNECT_TIMEOUT, read_timeout=LLM_READ_TIMEOUT,
+                 max_connections=LLM_MAX_CONNECTIONS, max_keepalive=LLM_MAX_KEEPALIVE):
+        self.host = host
+        self.timeout = httpx.Timeout(read_timeout, connect=connect_timeout)
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive,
+            keepalive_expiry=60,
+        )
+        self._client = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    @property
+    def client(self):
+        # Rebuilt after a fork (e.g. gunicorn preload) so workers never share a socket
+        with self._lock:
+            if self._client is None or self._pid != os.getpid():
+                self._client = ollama.Client(host=self.host, timeout=self.timeout, limits=self.limits)
+                self._pid = os.getpid()
+                logger.info(f"Connected LLM client to {self.host}")
+            return self._client
+
+    def chat(self, model, messages, **kwargs):
+        """Same arguments as ollama.chat; returns a response, or an iterator of chunks with stream=True."""
+        return self.client.chat(model=model, messages=messages, **kwargs)
+
+    def preload(self, model, keep_alive):
+        """Loads a model into memory without generating anything and keeps it loaded for keep_alive."""
+        self.client.chat(model=model, messages=[], keep_alive=keep_alive)
+
+    def loaded_models(self):
+        """Names of the models currently loaded on the Ollama server."""
+        response = self.client.ps()
+        return [model.get("model") or model.get("name") for model in response.get("models", [])]
+
+    def list_models(self):
+        """Names of the models installed on the Ollama server."""
+        response = self.client.list()
+        names = []
+        for model in response.get("models", []):
+            # Newer servers report "model", older ones "name"
+            name = model.get("model") or model.get("name")
+            if name:
+                names.append(name)
+        return names
+
+
+llm = LLMClient()
@@ -1,35 +1,246 @@
-import ollama
 import json
 import logging
+import time
 from pypdf import PdfReader
+from AI.cache import text_cache as default_text_cache, response_cache as default_response_cache, file_digest, normalize_text
+from AI.embeddings import embedder as default_embedder
+from AI.llm import llm as default_llm
+from AI.prompts import prepare_inputs, usage as default_usage
+from AI.fast_score import fast_score
+from AI.streaming import JSONFieldStream
+from AI.schemas import (AnalysisResult, InterviewPrep, NetworkingMessages, LinkedInProfile, ApplicationKitResult,
+                        NegotiationScripts)
+from AI.structured import STRUCTURED_REPAIR_ATTEMPTS, json_schema, loads_lenient, repair_prompt, validate
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class ResumeAnalyzer:
-    def __init__(self, model_name="gpt-oss:120b-cloud"):
+    def __init__(self, model_name="gpt-oss:120b-cloud", text_cache=None, response_cache=None, embedder=None, llm=None):
         self.model_name = model_name
+        self.llm = llm or default_llm
+        self.usage = default_usage
+        self.text_cache = text_cache or default_text_cache
+        self.response_cache = response_cache or default_response_cache
+        self.embedder = embedder or default_embedder
 
-    def extract_text_from_pdf(self, pdf_path):
-        """Extracts text from a PDF file."""
+    def chat(self, prompt, model_name=None, format=None, options=None, use_cache=True, tool=None):
+        """
+        Sends a single-turn prompt to the model and returns the message content.
+        Completions are cached; use_cache=False forces a fresh generation and refreshes the cached copy.
+        tool labels the call in the token usage stats.
+        """
+        model_to_use = model_name if model_name else self.model_name
+        key = self.response_cache.make_key(model_to_use, prompt, format, options)
+        if use_cache:
+            cached = self.response_cache.lookup(key)
+            if cached is not None:
+                return cached
+
+        kwargs = {}
+        if format:
+            kwargs['format'] = format # Enforce JSON mode if supported, otherwise styling prompt is key
+        if options:
+            kwargs['options'] = options
+        response = self.llm.chat(
+            model=model_to_use,
+            messages=[{'role': 'user', 'content': prompt}],
+            **kwargs
+        )
+        self.usage.record_completion(tool, response.get('prompt_eval_count'), response.get('eval_count'))
+        content = response['message']['content']
+        if not format:
+            # JSON answers are cached by chat_json() once they validate, so a broken one is never served again
+            self.response_cache.store(key, content)
+        return content
+
+    def chat_stream(self, prompt, model_name=None, format=None, options=None, use_cache=True, tool=None):
+        """
+        Streaming counterpart of chat(): yields content chunks as Ollama produces them.
+        A cached completion is yielded as a single chunk; a finished stream refreshes the cache.
+        """
+        model_to_use = model_name if model_name else self.model_name
+        key = self.response_cache.make_key(model_to_use, prompt, format, options)
+        if use_cache:
+            cached = self.response_cache.lookup(key)
+            if cached is not None:
+                yield cached
+                return
+
+        kwargs = {}
+        if format:
+            kwargs['format'] = format
+        if options:
+            kwargs['options'] = options
+        parts = []
+        for chunk in self.llm.chat(
+            model=model_to_use,
+            messages=[{'role': 'user', 'content': prompt}],
+            stream=True,
+            **kwargs
+        ):
+            piece = chunk['message']['content']
+            if piece:
+                parts.append(piece)
+                yield piece
+            if chunk.get('done'):
+                # Only the final chunk carries the token counts
+                self.usage.record_completion(tool, chunk.get('prompt_eval_count'), chunk.get('eval_count'))
+
+        if not format:
+            self.response_cache.store(key, "".join(parts))
+
+    def chat_json(self, prompt, schema, model_name=None, options=None, use_cache=True, tool=None):
+        """
+        Runs a JSON tool and returns its answer validated against schema (a pydantic model) as a
+        dict, or None. The schema goes to Ollama as `format`, so the model is constrained to it.
+        """
+        model_to_use = model_name if model_name else self.model_name
+        key = self.response_cache.make_key(model_to_use, prompt, json_schema(schema), options)
+        if use_cache:
+            cached = self.response_cache.lookup(key)
+            if cached is not None:
+                return json.loads(cached)
+
+        content = self.chat(prompt, model_to_use, format=json_schema(schema), options=options, use_cache=False, tool=tool)
+        result = self.repair(prompt, schema, content, model_to_use, options, tool)
+        if result is not None:
+            # Only validated answers are cached, in their repaired form, so a reload costs no model call
+            self.response_cache.store(key, json.dumps(result))
+        return result
+
+    def repair(self, prompt, schema, content, model_name, options=None, tool=None):
+        """
+        Turns a JSON tool's raw answer into a validated dict, or None. Near-miss JSON (fences,
+        trailing commas, truncation) is fixed locally; fields still missing or invalid are then
+        asked for on their own, with the schema narrowed to them, instead of rerunning the task.
+        Those re-requests skip the response cache: chat() never stores answers sent with a format.
+        """
+        try:
+            data = json.loads(content)
+        except ValueError:
+            data = loads_lenient(content)
+            if data is not None:
+                self.usage.record_structured(tool, "fixed")
+
+        result, broken = validate(schema, data)
+        for _ in range(STRUCTURED_REPAIR_ATTEMPTS):
+            if not broken:
+                break
+            logger.info(f"Re-requesting {', '.join(broken)} for {tool}")
+            self.usage.record_structured(tool, "repairs")
+            fix = self.chat(repair_prompt(prompt, broken), model_name, format=json_schema(schema, tuple(broken)),
+                            options=options, use_cache=False, tool=tool)
+            patch = loads_lenient(fix) or {}
+            data = dict(data or {}, **{key: value for key, value in patch.items() if key in broken})
+            result, broken = validate(schema, data)
+
+        if broken:
+            self.usage.record_structured(tool, "failures")
+            logger.error(f"Invalid {tool} response, broken fields: {', '.join(broken)}")
+        return result
+
+    def stream_tool(self, tool, resume_text, job_description, model_name=None, regenerate=False):
+        """
+        Streams one of the generation tools as (event, payload) pairs:
+        ("token", text) for plain-text tools, ("field", {"key", "value"}) for each completed
+        top-level field of JSON tools, then ("done", None) or ("error", message).
+        """
+        builders = {
+            "cover_letter": (self._cover_letter_prompt, None),
+            "interview_prep": (self._interview_prep_prompt, InterviewPrep),
+            "networking": (self._networking_prompt, NetworkingMessages),
+            "linkedin": (self._linkedin_prompt, LinkedInProfile),
+        }
+        build_prompt, schema = builders[tool]
+        if not resume_text:
+            yield "error", "Could not extract text from resume."
+            return
+
+        job_description, resume_text = prepare_inputs(tool, job_description, resume_text)
+        prompt = build_prompt(resume_text, job_description)
+        model_to_use = model_name if model_name else self.model_name
+        options = {'temperature': 0.7}
+        format = json_schema(schema) if schema else None
+        fields = JSONFieldStream() if schema else None
+        parts = []
         try:
+            if schema:
+                # JSON answers are cached whole once validated (see chat_json), so a hit needs no stream
+                cache_key = self.response_cache.make_key(model_to_use, prompt, format, options)
+                cached = None if regenerate else self.response_cache.lookup(cache_key)
+                if cached is not None:
+                    for key, value in json.loads(cached).items():
+                        yield "field", {"key": key, "value": value}
+                    yield "done", None
+                    return
+
+            use_cache = not regenerate and fields is None
+            for piece in self.chat_stream(prompt, model_to_use, format=format, options=options, use_cache=use_cache, tool=tool):
+                if fields is None:
+                    yield "token", piece
+                else:
+                    parts.append(piece)
+                    for key, value in fields.feed(piece):
+                        yield "field", {"key": key, "value": value}
+
+            if schema:
+                # Fields the stream got wrong are repaired after it and sent again
+                content = "".join(parts)
+                result = self.repair(prompt, schema, content, model_to_use, options, tool)
+                if result is None:
+                    yield "error", "The model returned an incomplete answer. Please try again."
+                    return
+                self.response_cache.store(cache_key, json.dumps(result))
+                streamed = loads_lenient(content) or {}
+                for key, value in result.items():
+                    if streamed.get(key) != value:
+                        yield "field", {"key": key, "value": value}
+            yield "done", None
+        except Exception as e:
+            logger.error(f"Error streaming {tool}: {e}")
+            yield "error", str(e)
+
+    def extract_pdf(self, pdf_path):
+        """
+        Extracts normalized text from a PDF file, keyed on the SHA-256 of its bytes.
+        Returns a dict with sha256, text, page_count and extraction_ms, or None on failure.
+        """
+        try:
+            digest = file_digest(pdf_path)
+            cached = self.text_cache.lookup(digest)
+            if cached is not None:
+                return dict(cached, sha256=digest)
+
+            started = time.perf_counter()
             reader = PdfReader(pdf_path)
-            text = ""
-            for page in reader.pages:
-                text += page.extract_text() + "\n"
-            return text
+            pages = [page.extract_text() or "" for page in reader.pages]
+            entry = {
+                "text": normalize_text("\n".join(pages)),
+                "page_count": len(pages),
+                "extraction_ms": round((time.perf_counter() - started) * 1000, 2),
+            }
+            self.text_cache.store(digest, entry)
+            logger.info(f"Extracted {entry['page_count']} PDF pages in {entry['extraction_ms']} ms")
+            return dict(entry, sha256=digest)
         except Exception as e:
             logger.error(f"Error extracting text from PDF: {e}")
             return None
 
-    def analyze(self, resume_path, job_description, model_name=None):
+    def extract_text_from_pdf(self, pdf_path):
+        """Extracts text from a PDF file."""
+        extracted = self.extract_pdf(pdf_path)
+        return extracted["text"] if extracted else None
+
+    def analyze(self, resume_text, job_description, model_name=None, regenerate=False, mode="full", raise_errors=False):
         """
-        Analyzes a resume against a job description using Ollama.
+        Analyzes a resume's extracted text against a job description using Ollama.
         Returns a dictionary with score, summary, matching_keywords, missing_keywords, and recommendations.
+        mode="fast" scores locally from keywords and embeddings without calling the model.
+        Model and connection errors come back as a score-0 result, or are raised with raise_errors.
         """
         model_to_use = model_name if model_name else self.model_name
-        resume_text = self.extract_text_from_pdf(resume_path)
         if not resume_text:
             return {
                 "score": 0,
@@ -39,6 +250,11 @@ class ResumeAnalyzer:
                 "recommendations": []
             }
 
+        if mode == "fast":
+            return fast_score(resume_text, job_description, self.embedder)
+
+        job_description, resume_text = prepare_inputs("analyze", job_description, resume_text)
+
         # prompt for the LLM
         prompt = f"""
         You are a razor-sharp Fortune 500 Executive Recruiter and ATS Optimization Expert.
@@ -82,26 +298,12 @@ class ResumeAnalyzer:
         """
 
         try:
-            response = ollama.chat(
-                model=model_to_use,
-                messages=[{'role': 'user', 'content': prompt}],
-                format='json', # Enforce JSON mode if supported, otherwise styling prompt is key
-                options={'temperature': 0.1}
-            )
-            
-            content = response['message']['content']
-            try:
-                result = json.loads(content)
-                return result
-            except json.JSONDecodeError:
-                if "```json" in content:
-                    content = content.split("```json")[1].split("```")[0]
-                    return json.loads(content)
-                logger.error(f"Failed to parse JSON response: {content}")
-                return None
+            return self.chat_json(prompt, AnalysisResult, model_to_use, options={'temperature': 0.1}, use_cache=not regenerate, tool="analyze")
 
         except Exception as e:
             logger.error(f"Error during AI analysis: {e}")
+            if raise_errors:
+                raise
             return {
                 "score": 0,
                 "summary": f"Error during analysis: {str(e)}",
@@ -110,14 +312,9 @@ class ResumeAnalyzer:
                 "recommendations": []
             }
 
-    def generate_cover_letter(self, resume_path, job_description, model_name=None):
-        """Generate a customized cover letter."""
-        model_to_use = model_name if model_name else self.model_name
-        resume_text = self.extract_text_from_pdf(resume_path)
-        if not resume_text:
-            return None
-            
-        prompt = f"""
+    def _cover_letter_prompt(self, resume_text, job_description):
+        """Prompt for the cover letter tool."""
+        return f"""
         You are a professional Ghostwriter for top executives.
         Write a disruptive, attention-grabbing cover letter that breaks the mold of "I am writing to apply...".
         
@@ -139,26 +336,10 @@ class ResumeAnalyzer:
         - The Proof (1-2 key achievements mapping to JD pains)
         - The Close (Call to action)
         """
-        
-        try:
-            response = ollama.chat(
-                model=model_to_use,
-                messages=[{'role': 'user', 'content': prompt}],
-                options={'temperature': 0.7}
-            )
-            return response['message']['content']
-        except Exception as e:
-            logger.error(f"Error generating cover letter: {e}")
-            return None
 
-    def generate_interview_prep(self, resume_path, job_description, model_name=None):
-        """Generate interview preparation questions and answers."""
-        model_to_use = model_name if model_name else self.model_name
-        resume_text = self.extract_text_from_pdf(resume_path)
-        if not resume_text:
-            return None
-            
-        prompt = f"""
+    def _interview_prep_prompt(self, resume_text, job_description):
+        """Prompt for the interview prep tool."""
+        return f"""
         You are an expert technical recruiter and interview coach.
         Generate a set of interview preparation materials based on the candidate's resume and the job description.
         
@@ -181,33 +362,10 @@ class ResumeAnalyzer:
             ]
         }}
         """
-        
-        try:
-            response = ollama.chat(
-                model=model_to_use,
-                messages=[{'role': 'user', 'content': prompt}],
-                format='json',
-                options={'temperature': 0.7}
-            )
-            content = response['message']['content']
-            try:
-                return json.loads(content)
-            except:
-                if "```json" in content:
-                    return json.loads(content.split("```json")[1].split("```")[0])
-                return json.loads(content) 
-        except Exception as e:
-            logger.error(f"Error generating interview prep: {e}")
-            return None
 
-    def generate_networking_messages(self, resume_path, job_description, model_name=None):
-        """Generate networking messages (Cold Email & LinkedIn)."""
-        model_to_use = model_name if model_name else self.model_name
-        resume_text = self.extract_text_from_pdf(resume_path)
-        if not resume_text:
-            return None
-            
-        prompt = f"""
+    def _networking_prompt(self, resume_text, job_description):
+        """Prompt for the networking messages tool."""
+        return f"""
         You are an expert career coach and networking strategist.
         Generate networking messages for a candidate based on their resume and a target job description.
         
@@ -227,33 +385,10 @@ class ResumeAnalyzer:
             "informational_interview_request": "Email body asking for 15 mins of advice from a peer."
         }}
         """
-        
-        try:
-            response = ollama.chat(
-                model=model_to_use,
-                messages=[{'role': 'user', 'content': prompt}],
-                format='json',
-                options={'temperature': 0.7}
-            )
-            content = response['message']['content']
-            try:
-                return json.loads(content)
-            except:
-                if "```json" in content:
-                    return json.loads(content.split("```json")[1].split("```")[0])
-                return json.loads(content)
-        except Exception as e:
-            logger.error(f"Error generating networking messages: {e}")
-            return None
 
-    def optimize_linkedin(self, resume_path, job_description, model_name=None):
-        """Generate LinkedIn profile optimization suggestions."""
-        model_to_use = model_name if model_name else self.model_name
-        resume_text = self.extract_text_from_pdf(resume_path)
-        if not resume_text:
-            return None
-            
-        prompt = f"""
+    def _linkedin_prompt(self, resume_text, job_description):
+        """Prompt for the LinkedIn optimization tool."""
+        return f"""
         You are a LinkedIn Profile Expert.
         Optimize the candidate's LinkedIn profile to attract recruiters for the specific target job.
         
@@ -274,31 +409,143 @@ class ResumeAnalyzer:
             ]
         }}
         """
+
+    def generate_cover_letter(self, resume_text, job_description, model_name=None, regenerate=False):
+        """Generate a customized cover letter."""
+        model_to_use = model_name if model_name else self.model_name
+        if not resume_text:
+            return None
+            
+        job_description, resume_text = prepare_inputs("cover_letter", job_description, resume_text)
+        prompt = self._cover_letter_prompt(resume_text, job_description)
+        
+        try:
+            return self.chat(prompt, model_to_use, options={'temperature': 0.7}, use_cache=not regenerate, tool="cover_letter")
+        except Exception as e:
+            logger.error(f"Error generating cover letter: {e}")
+            return None
+
+    def generate_interview_prep(self, resume_text, job_description, model_name=None, regenerate=False):
+        """Generate interview preparation questions and answers."""
+        model_to_use = model_name if model_name else self.model_name
+        if not resume_text:
+            return None
+            
+        job_description, resume_text = prepare_inputs("interview_prep", job_description, resume_text)
+        prompt = self._interview_prep_prompt(resume_text, job_description)
         
         try:
-            response = ollama.chat(
-                model=model_to_use,
-                messages=[{'role': 'user', 'content': prompt}],
-                format='json',
-                options={'temperature': 0.7}
-            )
-            content = response['message']['content']
-            try:
-                return json.loads(content)
-            except:
-                if "```json" in content:
-                    return json.loads(content.split("```json")[1].split("```")[0])
-                return json.loads(content)
+            return self.chat_json(prompt, InterviewPrep, model_to_use, options={'temperature': 0.7}, use_cache=not regenerate, tool="interview_prep")
+        except Exception as e:
+            logger.error(f"Error generating interview prep: {e}")
+            return None
+
+    def generate_networking_messages(self, resume_text, job_description, model_name=None, regenerate=False):
+        """Generate networking messages (Cold Email & LinkedIn)."""
+        model_to_use = model_name if model_name else self.model_name
+        if not resume_text:
+            return None
+            
+        job_description, resume_text = prepare_inputs("networking", job_description, resume_text)
+        prompt = self._networking_prompt(resume_text, job_description)
+        
+        try:
+            return self.chat_json(prompt, NetworkingMessages, model_to_use, options={'temperature': 0.7}, use_cache=not regenerate, tool="networking")
+        except Exception as e:
+            logger.error(f"Error generating networking messages: {e}")
+            return None
+
+    def optimize_linkedin(self, resume_text, job_description, model_name=None, regenerate=False):
+        """Generate LinkedIn profile optimization suggestions."""
+        model_to_use = model_name if model_name else self.model_name
+        if not resume_text:
+            return None
+            
+        job_description, resume_text = prepare_inputs("linkedin", job_description, resume_text)
+        prompt = self._linkedin_prompt(resume_text, job_description)
+        
+        try:
+            return self.chat_json(prompt, LinkedInProfile, model_to_use, options={'temperature': 0.7}, use_cache=not regenerate, tool="linkedin")
         except Exception as e:
             logger.error(f"Error optimizing LinkedIn profile: {e}")
             return None
 
-    def generate_negotiation_scripts(self, job_title, offer_details=None, model_name=None):
+    def _application_kit_prompt(self, resume_text, job_description):
+        """Prompt for the application kit: all four tools in one generation."""
+        return f"""
+        You are a career coach preparing a complete application package for one job:
+        a cover letter, interview preparation, networking messages and LinkedIn profile suggestions.
+        
+        JOB DESCRIPTION:
+        {job_description}
+        
+        RESUME:
+        {resume_text}
+        
+        COVER LETTER GUIDELINES:
+        1. Hook the reader immediately in the first sentence with a relevant achievement or passion.
+        2. Focus on "What I can do for you", not "What I have done".
+        3. Keep it under 250 words, in Markdown.
+        
+        Output a valid JSON object with the following structure:
+        {{
+            "cover_letter": "Markdown cover letter",
+            "interview_prep": {{
+                "technical_questions": [
+                    {{"question": "...", "ideal_answer_points": "..."}}
+                ],
+                "behavioral_questions": [
+                    {{"question": "...", "star_answer_guide": "..."}}
+                ],
+                "questions_to_ask_interviewer": [
+                    "..."
+                ]
+            }},
+            "networking": {{
+                "cold_email_hiring_manager": {{
+                    "subject": "...",
+                    "body": "..."
+                }},
+                "linkedin_connection_request": "Max 300 characters. Professional and personalized.",
+                "informational_interview_request": "Email body asking for 15 mins of advice from a peer."
+            }},
+            "linkedin": {{
+                "headline": "SEO-optimized headline (max 220 chars)",
+                "about_section": "Engaging, first-person summary optimized for the target role.",
+                "key_skills_to_pin": ["Skill 1", "Skill 2", "Skill 3"],
+                "experience_enhancements": [
+                    "Specific bullet point to add to latest role...",
+                    "Keyword to emphasize..."
+                ]
+            }}
+        }}
+        """
+
+    def generate_application_kit(self, resume_text, job_description, model_name=None, regenerate=False):
+        """
+        Generate the cover letter, interview prep, networking messages and LinkedIn suggestions
+        in a single call, so the resume and job description are only sent (and prefilled) once.
+        """
+        model_to_use = model_name if model_name else self.model_name
+        if not resume_text:
+            return None
+            
+        job_description, resume_text = prepare_inputs("application_kit", job_description, resume_text)
+        prompt = self._application_kit_prompt(resume_text, job_description)
+        
+        try:
+            return self.chat_json(prompt, ApplicationKitResult, model_to_use, options={'temperature': 0.7}, use_cache=not regenerate, tool="application_kit")
+        except Exception as e:
+            logger.error(f"Error generating application kit: {e}")
+            return None
+
+    def generate_negotiation_scripts(self, job_title, offer_details=None, model_name=None, regenerate=False):
         """Generate salary negotiation scripts."""
         model_to_use = model_name if model_name else self.model_name
         
         context = f"Job Title: {job_title}"
         if offer_details:
+            offer_details, _ = prepare_inputs("negotiation", offer_details)
             context += f"\nOffer Details: {offer_details}"
             
         prompt = f"""
@@ -318,19 +565,7 @@ class ResumeAnalyzer:
         """
         
         try:
-            response = ollama.chat(
-                model=model_to_use,
-                messages=[{'role': 'user', 'content': prompt}],
-                format='json',
-                options={'temperature': 0.7}
-            )
-            content = response['message']['content']
-            try:
-                return json.loads(content)
-            except:
-                if "```json" in content:
-                    return json.loads(content.split("```json")[1].split("```")[0])
-                return json.loads(content)
+            return self.chat_json(prompt, NegotiationScripts, model_to_use, options={'temperature': 0.7}, use_cache=not regenerate, tool="negotiation")
         except Exception as e:
             logger.error(f"Error generating negotiation scripts: {e}")
             return None
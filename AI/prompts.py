@@ -0,0 +1,135 @@
+import html
+import logging
+import os
+import re
+import threading
+
+from AI.cache import normalize_text
+from AI.tokens import count_tokens, truncate_to_tokens
+
+logger = logging.getLogger(__name__)
+
+# Token budgets for the user-supplied parts of each prompt: (job description, resume)
+PROMPT_BUDGETS = {
+    "analyze": (1500, 2500),
+    "cover_letter": (1200, 1800),
+    "interview_prep": (1200, 1800),
+    "networking": (1000, 1200),
+    "linkedin": (1000, 1800),
+    "application_kit": (1500, 2500),
+    "negotiation": (600, 0),
+    "scraper": (2500, 0),
+}
+# Scales every budget, e.g. 2 for models with a large context window
+PROMPT_BUDGET_SCALE = float(os.environ.get("PROMPT_BUDGET_SCALE", 1))
+
+# Lines that carry no signal for matching or writing: EEO and legal footers, privacy and
+# cookie notices, and job board chrome
+BOILERPLATE_RE = re.compile(
+    r"equal (employment )?opportunity|affirmative action|e-verify|without regard to (race|sex|age)|"
+    r"reasonable accommodation|protected veteran|genetic information|sexual orientation|"
+    r"privacy (policy|notice|statement)|cookie|all rights reserved|terms of (use|service)|"
+    r"^(apply( now)?|share( this job)?|save( job)?|report( this)? job|back to (search|jobs)|"
+    r"sign in|log in|similar jobs)\W*$",
+    re.IGNORECASE,
+)
+BLOCK_TAG_RE = re.compile(r"<\s*(br|/p|/div|/ul|/ol|/h[1-6]|/tr)\b[^>]*>", re.IGNORECASE)
+LIST_ITEM_RE = re.compile(r"<\s*li\b[^>]*>", re.IGNORECASE)
+TAG_RE = re.compile(r"<[^<]+?>")
+
+
+def html_to_text(text):
+    """Like strip_html, but keeps paragraph and list structure as lines."""
+    text = BLOCK_TAG_RE.sub("\n", text or "")
+    text = LIST_ITEM_RE.sub("\n- ", text)
+    return html.unescape(TAG_RE.sub(" ", text))
+
+
+def clean_posting(text):
+    """
+    Normalizes whitespace and drops repeated and boilerplate lines from a job posting.
+    Only short lines are treated as boilerplate so a matching phrase inside a real
+    requirement is never removed.
+    """
+    kept = []
+    seen = set()
+    for line in normalize_text(text).splitlines():
+        key = line.lower().strip(" -*•")
+        if key:
+            if key in seen:
+                continue
+            seen.add(key)
+            if len(line) < 400 and BOILERPLATE_RE.search(line):
+                continue
+        kept.append(line)
+    return re.sub(r"\n{3,}", "\n\n", "\n".join(kept)).strip()
+
+
+class PromptUsage:
+    """
+    Per-tool token counts: what was sent, what trimming saved, and what the model reported.
+    JSON tools also count answers fixed locally, field repairs sent back and answers given up on.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tools = {}
+
+    def _entry(self, tool):
+        return self._tools.setdefault(tool or "other", {
+            "calls": 0,
+            "input_tokens": 0,
+            "trimmed_tokens": 0,
+            "model_calls": 0,
+            "prompt_tokens": 0,
+            "completion_tokens": 0,
+            "json_fixed": 0,
+            "json_repairs": 0,
+            "json_failures": 0,
+        })
+
+    def record_input(self, tool, kept, trimmed):
+        with self._lock:
+            entry = self._entry(tool)
+            entry["calls"] += 1
+            entry["input_tokens"] += kept
+            entry["trimmed_tokens"] += trimmed
+
+    def record_completion(self, tool, prompt_tokens, completion_tokens):
+        with self._lock:
+            entry = self._entry(tool)
+            entry["model_calls"] += 1
+            entry["prompt_tokens"] += prompt_tokens or 0
+            entry["completion_tokens"] += completion_tokens or 0
+
+    def record_structured(self, tool, outcome):
+        with self._lock:
+            self._entry(tool)[f"json_{outcome}"] += 1
+
+    def stats(self):
+        with self._lock:
+            return {tool: dict(entry) for tool, entry in self._tools.items()}
+
+
+usage = PromptUsage()
+
+
+def prepare_inputs(tool, job_description, resume_text=None, budgets=None):
+    """
+    Cleans and trims the job description and resume for a tool's prompt so each stays
+    within its token budget. Returns (job_description, resume_text) and records the counts.
+    """
+    jd_budget, resume_budget = (budgets or PROMPT_BUDGETS)[tool]
+    jd_budget = int(jd_budget * PROMPT_BUDGET_SCALE)
+    resume_budget = int(resume_budget * PROMPT_BUDGET_SCALE)
+
+    raw_tokens = count_tokens(job_description) + count_tokens(resume_text)
+    job_description = truncate_to_tokens(clean_posting(html_to_text(job_description)), jd_budget)
+    if resume_text:
+        # Resumes have no boilerplate, and repeated lines (titles, dates) are meaningful
+        resume_text = truncate_to_tokens(normalize_text(resume_text), resume_budget)
+
+    kept_tokens = count_tokens(job_description) + count_tokens(resume_text)
+    usage.record_input(tool, kept_tokens, max(0, raw_tokens - kept_tokens))
+    logger.info(f"{tool}: {kept_tokens} input tokens ({raw_tokens - kept_tokens} trimmed)")
+    return job_description, resume_text
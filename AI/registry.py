@@ -0,0 +1,127 @@
+import logging
+import os
+import threading
+import time
+
+from AI.llm import llm as default_llm
+
+logger = logging.getLogger(__name__)
+
+MODEL_LIST_TTL = int(os.environ.get("MODEL_LIST_TTL", 300))
+# How long Ollama keeps a preloaded model in memory after its last use
+MODEL_KEEP_ALIVE = os.environ.get("MODEL_KEEP_ALIVE", "30m")
+MODEL_WARM_INTERVAL = int(os.environ.get("MODEL_WARM_INTERVAL", 600))
+FALLBACK_MODELS = ["gpt-oss:120b-cloud", "llama3", "mistral"]
+
+
+class ModelRegistry:
+    """
+    Cached view of the models on the Ollama server.
+    The model list and the set of loaded models are refreshed in the background once they
+    are older than MODEL_LIST_TTL, so page views never wait on Ollama after the first one.
+    warm() preloads a model with keep_alive so the next real request finds it hot.
+    """
+
+    def __init__(self, llm=None, ttl=MODEL_LIST_TTL, keep_alive=MODEL_KEEP_ALIVE, warm_interval=MODEL_WARM_INTERVAL):
+        self.llm = llm or default_llm
+        self.ttl = ttl
+        self.keep_alive = keep_alive
+        self.warm_interval = warm_interval
+        self._models = None
+        self._loaded = set()
+        self._refreshed_at = 0
+        self._refreshing = False
+        self._warming = set()
+        self._warmed_at = {}
+        self._errors = {}
+        self._lock = threading.Lock()
+
+    def refresh(self):
+        """Fetches the model list and load state from Ollama. Returns False if the server is unreachable."""
+        try:
+            models = self.llm.list_models()
+            loaded = set(self.llm.loaded_models())
+        except Exception as e:
+            logger.warning(f"Could not refresh model list: {e}")
+            with self._lock:
+                self._refreshed_at = time.monotonic()
+                self._refreshing = False
+            return False
+        with self._lock:
+            self._models = models
+            self._loaded = loaded
+            self._refreshed_at = time.monotonic()
+            self._refreshing = False
+        return True
+
+    def _refresh_in_background(self):
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        threading.Thread(target=self.refresh, name="model-registry-refresh", daemon=True).start()
+
+    def available_models(self):
+        """Installed model names, falling back to a default list while Ollama is unreachable."""
+        if self._models is None and self._refreshed_at == 0:
+            # Nothing to serve yet, so the very first call waits for the server
+            self.refresh()
+        elif time.monotonic() - self._refreshed_at > self.ttl:
+            self._refresh_in_background()
+        return list(self._models) if self._models else list(FALLBACK_MODELS)
+
+    def warm(self, model):
+        """
+        Preloads a model in the background. Calls within warm_interval of the last successful
+        preload are no-ops, so this is cheap enough to call on every request.
+        """
+        if not model:
+            return
+        now = time.monotonic()
+        with self._lock:
+            if model in self._warming or now - self._warmed_at.get(model, -self.warm_interval) < self.warm_interval:
+                return
+            self._warming.add(model)
+        threading.Thread(target=self._preload, args=(model,), name="model-registry-warm", daemon=True).start()
+
+    def _preload(self, model):
+        started = time.monotonic()
+        try:
+            self.llm.preload(model, self.keep_alive)
+        except Exception as e:
+            logger.warning(f"Could not preload model {model}: {e}")
+            with self._lock:
+                self._errors[model] = str(e)
+                # Back off as if it had been warmed so a missing model isn't retried on every request
+                self._warmed_at[model] = time.monotonic()
+                self._warming.discard(model)
+            return
+        logger.info(f"Preloaded model {model} in {time.monotonic() - started:.1f}s")
+        with self._lock:
+            self._errors.pop(model, None)
+            self._loaded.add(model)
+            self._warmed_at[model] = time.monotonic()
+            self._warming.discard(model)
+
+    def load_state(self, model):
+        """One of 'loading', 'loaded', 'available', 'failed' or 'missing'."""
+        with self._lock:
+            if model in self._warming:
+                return "loading"
+            if model in self._loaded:
+                return "loaded"
+            if model in self._errors:
+                return "failed"
+            if self._models is None or model in self._models:
+                return "available"
+        return "missing"
+
+    def status(self):
+        models = self.available_models()
+        return {
+            "models": [{"name": name, "state": self.load_state(name)} for name in models],
+            "refreshed_seconds_ago": round(time.monotonic() - self._refreshed_at, 1) if self._refreshed_at else None,
+        }
+
+
+registry = ModelRegistry()
@@ -0,0 +1,75 @@
+from typing import List, Optional
+
+from pydantic import BaseModel, Field, field_validator
+
+# Response shapes of the JSON tools. Their JSON Schema is sent to Ollama as `format`, so the
+# model is constrained to them, and every reply is validated against them (see AI/structured.py).
+
+
+class AnalysisResult(BaseModel):
+    score: int
+    summary: str
+    matching_keywords: List[str]
+    missing_keywords: List[str]
+    recommendations: List[str]
+    updated_resume_markdown: str = Field(min_length=1)
+
+    @field_validator("score")
+    @classmethod
+    def clamp_score(cls, value):
+        # An out-of-range score is still a score; not worth a repair round trip
+        return max(0, min(100, value))
+
+
+class TechnicalQuestion(BaseModel):
+    question: str
+    ideal_answer_points: str
+
+
+class BehavioralQuestion(BaseModel):
+    question: str
+    star_answer_guide: str
+
+
+class InterviewPrep(BaseModel):
+    technical_questions: List[TechnicalQuestion] = Field(min_length=1)
+    behavioral_questions: List[BehavioralQuestion] = Field(min_length=1)
+    questions_to_ask_interviewer: List[str]
+
+
+class ColdEmail(BaseModel):
+    subject: str
+    body: str
+
+
+class NetworkingMessages(BaseModel):
+    cold_email_hiring_manager: ColdEmail
+    linkedin_connection_request: str
+    informational_interview_request: str
+
+
+class LinkedInProfile(BaseModel):
+    headline: str
+    about_section: str
+    key_skills_to_pin: List[str]
+    experience_enhancements: List[str]
+
+
+class ApplicationKitResult(BaseModel):
+    cover_letter: str = Field(min_length=1)
+    interview_prep: InterviewPrep
+    networking: NetworkingMessages
+    linkedin: LinkedInProfile
+
+
+class NegotiationScripts(BaseModel):
+    email_script: str
+    phone_script: str
+    questions_to_ask: List[str]
+    strategy_tips: List[str]
+
+
+class JobExtraction(BaseModel):
+    title: str = Field(min_length=1)
+    description: str = Field(min_length=1)
+    company: Optional[str] = None
@@ -0,0 +1,58 @@
+import json
+
+
+class JSONFieldStream:
+    """
+    Incremental reader for a JSON object arriving in chunks.
+    feed() returns the (key, value) pairs of top-level fields that completed in that chunk,
+    so callers can show each field as soon as the model finishes writing it. Anything before
+    the opening brace (e.g. a ```json fence) is ignored.
+    """
+
+    def __init__(self):
+        self.buffer = ""
+        self.pos = 0
+        self.depth = 0
+        self.in_string = False
+        self.escape = False
+        self.field_start = None
+        self.finished = False
+
+    def feed(self, chunk):
+        fields = []
+        self.buffer += chunk
+        while self.pos < len(self.buffer) and not self.finished:
+            ch = self.buffer[self.pos]
+            if self.in_string:
+                if self.escape:
+                    self.escape = False
+                elif ch == "\\":
+                    self.escape = True
+                elif ch == '"':
+                    self.in_string = False
+            elif ch == '"':
+                if self.depth > 0:
+                    self.in_string = True
+            elif ch in "{[":
+                self.depth += 1
+                if self.depth == 1:
+                    self.field_start = self.pos + 1
+            elif ch in "}]":
+                if self.depth == 1:
+                    fields.extend(self._complete_field(self.pos))
+                    self.finished = True
+                self.depth -= 1
+            elif ch == "," and self.depth == 1:
+                fields.extend(self._complete_field(self.pos))
+                self.field_start = self.pos + 1
+            self.pos += 1
+        return fields
+
+    def _complete_field(self, end):
+        segment = self.buffer[self.field_start:end].strip()
+        if not segment:
+            return []
+        try:
+            return list(json.loads("{" + segment + "}").items())
+        except ValueError:
+            return []
@@ -0,0 +1,132 @@
+import json
+import os
+import re
+from functools import lru_cache
+
+from pydantic import ValidationError
+
+# How many times the fields still broken after local fixing are re-requested from the model
+STRUCTURED_REPAIR_ATTEMPTS = int(os.environ.get("STRUCTURED_REPAIR_ATTEMPTS", 1))
+
+FENCE_RE = re.compile(r"```(?:json)?\s*(.*?)(?:```|$)", re.S | re.I)
+LITERALS = {"True": "true", "False": "false", "None": "null"}
+
+
+def _close(text):
+    """
+    Rewrites near-miss JSON into something json.loads accepts: drops trailing commas and
+    anything after the top-level object, turns Python literals into JSON ones, and closes a
+    cut-off answer (open string, dangling key, unclosed brackets).
+    """
+    out = []
+    stack = []
+    in_string = False
+    escape = False
+    i = 0
+    while i < len(text):
+        ch = text[i]
+        if in_string:
+            out.append(ch)
+            if escape:
+                escape = False
+            elif ch == "\\":
+                escape = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+            out.append(ch)
+        elif ch in "{[":
+            stack.append("}" if ch == "{" else "]")
+            out.append(ch)
+        elif ch in "}]":
+            while out and (out[-1].isspace() or out[-1] == ","):
+                out.pop()
+            if stack:
+                out.append(stack.pop())
+            if not stack:
+                break
+        elif ch.isalpha():
+            word = re.match(r"[A-Za-z]+", text[i:]).group(0)
+            out.append(LITERALS.get(word, word))
+            i += len(word)
+            continue
+        else:
+            out.append(ch)
+        i += 1
+
+    if in_string:
+        if escape:
+            out.pop()
+        out.append('"')
+    tail = "".join(out).rstrip()
+    if tail.endswith(":"):
+        tail += " null"
+    tail = tail.rstrip(", \n\t")
+    return tail + "".join(reversed(stack))
+
+
+def loads_lenient(content):
+    """
+    Parses a model's JSON answer, tolerating code fences, surrounding prose, trailing commas,
+    raw newlines in strings and truncation. Returns a dict, or None if no object can be recovered.
+    """
+    text = (content or "").strip()
+    fence = FENCE_RE.search(text)
+    if fence:
+        text = fence.group(1)
+    try:
+        data = json.loads(text, strict=False)
+        if isinstance(data, dict):
+            return data
+    except ValueError:
+        pass
+
+    start = text.find("{")
+    if start == -1:
+        return None
+    try:
+        data = json.loads(_close(text[start:]), strict=False)
+    except ValueError:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+@lru_cache(maxsize=None)
+def _model_schema(model):
+    return model.model_json_schema()
+
+
+def json_schema(model, fields=None):
+    """The JSON Schema for a response model, or for just some of its top-level fields."""
+    schema = _model_schema(model)
+    if not fields:
+        return schema
+    schema = dict(schema)
+    schema["properties"] = {key: value for key, value in schema["properties"].items() if key in fields}
+    schema["required"] = [key for key in schema.get("required", []) if key in fields]
+    return schema
+
+
+def validate(model, data):
+    """
+    Validates parsed data against a response model. Returns (result, broken): the validated
+    dict and an empty list, or None and the top-level fields that are missing or invalid.
+    """
+    if not isinstance(data, dict):
+        return None, list(model.model_fields)
+    try:
+        return model.model_validate(data).model_dump(), []
+    except ValidationError as e:
+        broken = {error["loc"][0] for error in e.errors() if error["loc"]}
+        return None, [key for key in model.model_fields if key in broken] or list(model.model_fields)
+
+
+def repair_prompt(prompt, fields):
+    """The original task narrowed to the fields that came back broken, so only they are regenerated."""
+    names = ", ".join(f'"{field}"' for field in fields)
+    return f"""{prompt}
+
+        Your previous answer was missing or had invalid values for these keys: {names}.
+        Output a valid JSON object with ONLY these keys, following the structure above.
+        """
@@ -0,0 +1,53 @@
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+_encoding = None
+_encoding_lock = threading.Lock()
+_encoding_failed = False
+
+
+def get_encoding():
+    """Loads the tiktoken encoding once per process; returns None if it is unavailable."""
+    global _encoding, _encoding_failed
+    if _encoding is not None or _encoding_failed:
+        return _encoding
+    with _encoding_lock:
+        if _encoding is None and not _encoding_failed:
+            try:
+                import tiktoken
+                _encoding = tiktoken.get_encoding("cl100k_base")
+            except Exception as e:
+                # tiktoken fetches its BPE files on first use, which fails offline
+                logger.warning(f"tiktoken unavailable, falling back to approximate token counts: {e}")
+                _encoding_failed = True
+    return _encoding
+
+
+def count_tokens(text):
+    """Counts tokens with tiktoken, or approximates at ~4 characters per token."""
+    if not text:
+        return 0
+    encoding = get_encoding()
+    if encoding is None:
+        return max(1, len(text) // 4)
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def truncate_to_tokens(text, max_tokens):
+    """
+    Cuts text down to at most max_tokens, backing up to the last line break so the model
+    never sees half a sentence. Returns the text unchanged if it already fits.
+    """
+    if not text or count_tokens(text) <= max_tokens:
+        return text
+    encoding = get_encoding()
+    if encoding is None:
+        cut = text[:max_tokens * 4]
+    else:
+        cut = encoding.decode(encoding.encode(text, disallowed_special=())[:max_tokens])
+    newline = cut.rfind("\n")
+    if newline > len(cut) // 2:
+        cut = cut[:newline]
+    return cut.rstrip()
@@ -0,0 +1,128 @@
+import logging
+import os
+import threading
+
+import numpy as np
+from filelock import FileLock
+
+try:
+    import faiss
+except ImportError:  # faiss-cpu is optional at runtime; search simply reports unavailable
+    faiss = None
+
+logger = logging.getLogger(__name__)
+
+# Most recently searched indexes, kept open between requests
+_open_indexes = {}
+_open_lock = threading.Lock()
+MAX_OPEN_INDEXES = 64
+
+
+def _mmap_flags():
+    flag = getattr(faiss, "IO_FLAG_MMAP_IFC", None) or faiss.IO_FLAG_MMAP
+    return flag | faiss.IO_FLAG_READ_ONLY
+
+
+class VectorIndex:
+    """
+    FAISS inner-product index over normalized embeddings, keyed by database row id.
+    Writes take a file lock and atomically replace the index file, so several app processes
+    can share it; searches use a lazily loaded, memory-mapped read-only copy that is
+    reopened whenever the file changes.
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    @staticmethod
+    def available():
+        return faiss is not None
+
+    def _lock(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        return FileLock(f"{self.path}.lock")
+
+    def _load_writable(self, dim):
+        if os.path.exists(self.path):
+            index = faiss.read_index(self.path)
+            if index.d == dim:
+                return index
+            logger.warning(f"Embedding size changed, rebuilding {self.path}")
+        return faiss.IndexIDMap2(faiss.IndexFlatIP(dim))
+
+    def _write(self, index):
+        tmp_path = f"{self.path}.tmp"
+        faiss.write_index(index, tmp_path)
+        os.replace(tmp_path, self.path)
+
+    def upsert(self, item_id, vector):
+        """Adds or replaces the vector stored for item_id."""
+        if faiss is None:
+            return
+        vector = np.asarray(vector, dtype=np.float32).reshape(1, -1)
+        ids = np.array([item_id], dtype=np.int64)
+        with self._lock():
+            index = self._load_writable(vector.shape[1])
+            index.remove_ids(ids)
+            index.add_with_ids(vector, ids)
+            self._write(index)
+
+    def remove(self, item_id):
+        if faiss is None or not os.path.exists(self.path):
+            return
+        with self._lock():
+            index = faiss.read_index(self.path)
+            index.remove_ids(np.array([item_id], dtype=np.int64))
+            self._write(index)
+
+    def rebuild(self, items):
+        """Replaces the whole index with (item_id, vector) pairs."""
+        if faiss is None:
+            return
+        with self._lock():
+            if not items:
+                if os.path.exists(self.path):
+                    os.remove(self.path)
+                return
+            vectors = np.vstack([np.asarray(v, dtype=np.float32) for _, v in items])
+            index = faiss.IndexIDMap2(faiss.IndexFlatIP(vectors.shape[1]))
+            index.add_with_ids(vectors, np.array([i for i, _ in items], dtype=np.int64))
+            self._write(index)
+
+    def _open_for_search(self):
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        # Writers replace the file, so a new inode or mtime means the cached copy is stale
+        version = (st.st_ino, st.st_mtime_ns)
+
+        with _open_lock:
+            cached = _open_indexes.get(self.path)
+            if cached is not None and cached[0] == version:
+                return cached[1]
+
+        try:
+            index = faiss.read_index(self.path, _mmap_flags())
+        except RuntimeError:
+            index = faiss.read_index(self.path)
+
+        with _open_lock:
+            _open_indexes.pop(self.path, None)
+            _open_indexes[self.path] = (version, index)
+            while len(_open_indexes) > MAX_OPEN_INDEXES:
+                _open_indexes.pop(next(iter(_open_indexes)))
+        return index
+
+    def search(self, vector, k=5):
+        """Returns up to k (item_id, similarity) pairs, best first."""
+        if faiss is None:
+            return []
+        index = self._open_for_search()
+        if index is None or index.ntotal == 0:
+            return []
+        query = np.asarray(vector, dtype=np.float32).reshape(1, -1)
+        if query.shape[1] != index.d:
+            return []
+        scores, ids = index.search(query, min(k, index.ntotal))
+        return [(int(i), float(s)) for i, s in zip(ids[0], scores[0]) if i != -1]
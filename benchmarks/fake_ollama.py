@@ -0,0 +1,58 @@
+import json
+import os
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+def load_responses(path=None):
+    with open(path or os.path.join(FIXTURES, "responses.json")) as f:
+        return json.load(f)
+
+
+class FakeOllamaClient:
+    """
+    Drop-in for AI.llm.LLMClient that answers instantly and deterministically from
+    fixtures/responses.json, so timings measure this app's code rather than the model.
+    A request with a JSON Schema `format` gets the canned answer that has every requested
+    key (a narrowed repair schema gets just those keys); anything else gets the canned text.
+    """
+
+    def __init__(self, responses=None, chunk_size=64):
+        self.responses = responses or load_responses()
+        self.chunk_size = chunk_size
+        self.calls = 0
+
+    def content_for(self, format=None):
+        if not isinstance(format, dict):
+            return self.responses["text"]
+        keys = list(format.get("properties", {}))
+        for answer in self.responses["json"].values():
+            if keys and all(key in answer for key in keys):
+                return json.dumps({key: answer[key] for key in keys})
+        return "{}"
+
+    def chat(self, model, messages, stream=False, format=None, **kwargs):
+        self.calls += 1
+        content = self.content_for(format)
+        # Roughly four characters per token, like the real counts for English text
+        prompt_tokens = sum(len(message["content"]) for message in messages) // 4
+        completion_tokens = len(content) // 4
+        if stream:
+            return self._stream(model, content, prompt_tokens, completion_tokens)
+        return {
+            "model": model,
+            "message": {"role": "assistant", "content": content},
+            "done": True,
+            "prompt_eval_count": prompt_tokens,
+            "eval_count": completion_tokens,
+        }
+
+    def _stream(self, model, content, prompt_tokens, completion_tokens):
+        for start in range(0, len(content), self.chunk_size):
+            yield {"model": model, "message": {"role": "assistant", "content": content[start:start + self.chunk_size]},
+                   "done": False}
+        yield {"model": model, "message": {"role": "assistant", "content": ""}, "done": True,
+               "prompt_eval_count": prompt_tokens, "eval_count": completion_tokens}
+
+    def preload(self, model, keep_alive=None):
+        pass
@@ -0,0 +1,124 @@
+"""
+Regenerates the files in benchmarks/fixtures/. They are committed, so this only needs to run
+when a fixture should change; the output is deterministic.
+
+    python -m benchmarks.make_fixtures
+"""
+import json
+import os
+import random
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+
+SKILLS = ["Python", "Flask", "Django", "PostgreSQL", "Redis", "Docker", "Kubernetes", "AWS", "Terraform", "Kafka",
+          "React", "TypeScript", "GraphQL", "Airflow", "Spark", "pandas", "CI/CD", "gRPC", "Celery", "Linux"]
+VERBS = ["Built", "Led", "Designed", "Shipped", "Optimized", "Migrated", "Automated", "Scaled", "Owned", "Reduced"]
+OBJECTS = ["a payments API", "the data platform", "an internal search service", "the billing pipeline",
+           "a multi-tenant scheduler", "the onboarding flow", "observability tooling", "a feature store"]
+RESULTS = ["cutting p95 latency by {n}%", "serving {n}k requests per minute", "saving ${n}k a year",
+           "raising test coverage to {n}%", "for {n} enterprise customers", "with {n}% fewer incidents"]
+
+
+def _bullet(rng):
+    return f"{rng.choice(VERBS)} {rng.choice(OBJECTS)} using {rng.choice(SKILLS)} and {rng.choice(SKILLS)}, " \
+           + rng.choice(RESULTS).format(n=rng.randint(10, 90))
+
+
+def resume_pages(rng, page_count):
+    pages = [["Jane Doe - Senior Software Engineer", "jane@example.com | Austin, TX",
+              "Skills: " + ", ".join(rng.sample(SKILLS, 10))]]
+    for page in range(page_count):
+        lines = pages[-1] if page == 0 else []
+        lines.append(f"Company {page + 1} - Engineer ({2024 - page} - {2025 - page})")
+        lines.extend(_bullet(rng) for _ in range(40 - len(lines)))
+        if page:
+            pages.append(lines)
+    return pages
+
+
+def make_pdf(path, pages):
+    """Writes a minimal text PDF (Helvetica, one line per string) with the given pages."""
+    objs = [b"<< /Type /Catalog /Pages 2 0 R >>"]
+    page_ids = [4 + 2 * i for i in range(len(pages))]
+    objs.append(("<< /Type /Pages /Kids [%s] /Count %d >>"
+                 % (" ".join("%d 0 R" % p for p in page_ids), len(pages))).encode())
+    objs.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    for i, lines in enumerate(pages):
+        text = " ".join("(%s) '" % line.replace("(", "\\(").replace(")", "\\)") for line in lines)
+        stream = "BT /F1 10 Tf 40 760 Td 13 TL " + text + " ET"
+        objs.append(("<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Resources << /Font << /F1 3 0 R >> >> "
+                     "/Contents %d 0 R >>" % (5 + 2 * i)).encode())
+        objs.append(("<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream)).encode())
+
+    out = b"%PDF-1.4\n"
+    offsets = []
+    for i, obj in enumerate(objs):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % (i + 1) + obj + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objs) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objs) + 1, xref)
+    with open(path, "wb") as f:
+        f.write(out)
+
+
+def job_description(rng):
+    paragraphs = [
+        "<h2>About the role</h2>",
+        "<p>Acme Payments is hiring a Senior Backend Engineer to build the services that move money for "
+        "thousands of small businesses. You will own APIs end to end, from design reviews to on-call.</p>",
+        "<h3>What you will do</h3><ul>"
+        + "".join(f"<li>{_bullet(rng)}</li>" for _ in range(12)) + "</ul>",
+        "<h3>What we are looking for</h3><ul>"
+        + "".join(f"<li>{rng.randint(3, 8)}+ years with {skill}</li>" for skill in rng.sample(SKILLS, 10)) + "</ul>",
+        "<h3>Benefits</h3><p>Remote-first, equity, 401(k) match, and a learning budget.</p>",
+        "<p>Acme Payments is an equal opportunity employer. All qualified applicants will receive consideration "
+        "for employment without regard to race, color, religion, sex, or national origin.</p>",
+    ]
+    return "\n".join(paragraphs)
+
+
+def page_chrome(rng, body):
+    """Wraps content in the navigation, scripts and footer a real job board page carries."""
+    nav = "<nav>" + "".join(f'<a href="/jobs/{i}">Related job {i}</a>' for i in range(60)) + "</nav>"
+    scripts = "".join(f"<script>window.__chunk{i} = {json.dumps(['x' * 80] * 40)};</script>" for i in range(20))
+    footer = "<footer>" + "".join(f"<p>Footer link {i} · Privacy · Terms · Cookies</p>" for i in range(40)) + "</footer>"
+    return f"<!DOCTYPE html><html><head><title>Senior Backend Engineer - Acme</title>{scripts}</head>" \
+           f"<body>{nav}<main><article>{body}</article></main>{footer}</body></html>"
+
+
+def main():
+    rng = random.Random(42)
+    os.makedirs(FIXTURES, exist_ok=True)
+
+    make_pdf(os.path.join(FIXTURES, "resume_small.pdf"), resume_pages(rng, 2))
+    make_pdf(os.path.join(FIXTURES, "resume_large.pdf"), resume_pages(rng, 30))
+
+    description = job_description(rng)
+    with open(os.path.join(FIXTURES, "job_description.html"), "w") as f:
+        f.write(description)
+
+    posting = {
+        "@context": "https://schema.org", "@type": "JobPosting", "title": "Senior Backend Engineer",
+        "description": description, "hiringOrganization": {"@type": "Organization", "name": "Acme Payments"},
+        "jobLocation": {"@type": "Place", "address": {"addressLocality": "Austin", "addressRegion": "TX"}},
+        "baseSalary": {"currency": "USD", "value": {"minValue": 150000, "maxValue": 190000, "unitText": "YEAR"}},
+    }
+    jsonld = f'<script type="application/ld+json">{json.dumps(posting)}</script>'
+    with open(os.path.join(FIXTURES, "job_page_jsonld.html"), "w") as f:
+        f.write(page_chrome(rng, jsonld + "<h1>Senior Backend Engineer</h1>" + description))
+    # No structured data and a thin body: extract_job_info has to fall back to the model
+    with open(os.path.join(FIXTURES, "job_page_plain.html"), "w") as f:
+        f.write(page_chrome(rng, "<div><p>Senior Backend Engineer at Acme Payments. Apply today.</p></div>"))
+
+    with open(os.path.join(FIXTURES, "resume.md"), "w") as f:
+        f.write("## Summary\nBackend engineer who ships reliable payment systems.\n\n## Experience\n")
+        for job in range(6):
+            f.write(f"\n### Company {job + 1}\n" + "".join(f"- **{_bullet(rng)}**\n" for _ in range(8)))
+        f.write("\n## Skills\n| Area | Tools |\n|---|---|\n")
+        f.write("".join(f"| {skill} | {', '.join(rng.sample(SKILLS, 4))} |\n" for skill in rng.sample(SKILLS, 8)))
+
+
+if __name__ == "__main__":
+    main()
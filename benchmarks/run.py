@@ -0,0 +1,291 @@
+"""
+Micro-benchmarks for the CPU-bound hot paths: PDF text extraction, prompt assembly, parsing
+and validating model JSON, job page cleanup and markdown rendering. The model is replaced by
+a deterministic fake (benchmarks/fake_ollama.py) and all inputs come from benchmarks/fixtures/.
+
+    python -m benchmarks.run                  # run, save results, compare with the baseline
+    python -m benchmarks.run --save-baseline  # run and make these results the new baseline
+    python -m benchmarks.run -k pdf           # only benchmarks whose name contains "pdf"
+
+Exits with status 1 when a benchmark's best round is more than --threshold slower than the
+baseline's (the fastest round is the least disturbed by other load, as with timeit).
+"""
+import argparse
+import gc
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+# Caches write under CACHE_DIR when AI.cache is imported; keep benchmark runs out of the real one
+os.environ.setdefault("CACHE_DIR", tempfile.mkdtemp(prefix="careerpilot-bench-"))
+
+from benchmarks.fake_ollama import FIXTURES, FakeOllamaClient
+
+HERE = os.path.dirname(__file__)
+BASELINE_PATH = os.path.join(HERE, "baseline.json")
+RESULTS_PATH = os.path.join(HERE, "results", "latest.json")
+
+BENCHMARKS = []
+
+
+def benchmark(name, units=1, unit="calls"):
+    """Registers a benchmark. The function does its setup and returns the callable to time."""
+    def register(setup):
+        BENCHMARKS.append({"name": name, "setup": setup, "units": units, "unit": unit})
+        return setup
+    return register
+
+
+class NoCache:
+    """Text cache that never hits, so extraction is timed rather than the lookup."""
+
+    def lookup(self, key):
+        return None
+
+    def store(self, key, entry):
+        pass
+
+
+def fixture(name):
+    with open(os.path.join(FIXTURES, name)) as f:
+        return f.read()
+
+
+def _analyzer(**kwargs):
+    from AI.main import ResumeAnalyzer
+    return ResumeAnalyzer(llm=FakeOllamaClient(), **kwargs)
+
+
+def _resume_text():
+    return _analyzer(text_cache=NoCache()).extract_text_from_pdf(os.path.join(FIXTURES, "resume_small.pdf"))
+
+
+@benchmark("pdf_extract_small", units=2, unit="pages")
+def bench_pdf_small():
+    analyzer = _analyzer(text_cache=NoCache())
+    path = os.path.join(FIXTURES, "resume_small.pdf")
+    return lambda: analyzer.extract_pdf(path)
+
+
+@benchmark("pdf_extract_large", units=30, unit="pages")
+def bench_pdf_large():
+    analyzer = _analyzer(text_cache=NoCache())
+    path = os.path.join(FIXTURES, "resume_large.pdf")
+    return lambda: analyzer.extract_pdf(path)
+
+
+@benchmark("prompt_assembly")
+def bench_prompt_assembly():
+    from AI.prompts import prepare_inputs
+    analyzer = _analyzer()
+    resume_text = _resume_text()
+    description = fixture("job_description.html")
+
+    def run():
+        job_description, resume = prepare_inputs("application_kit", description, resume_text)
+        return analyzer._application_kit_prompt(resume, job_description)
+    return run
+
+
+@benchmark("analyze_fake_model")
+def bench_analyze():
+    analyzer = _analyzer()
+    resume_text = _resume_text()
+    description = fixture("job_description.html")
+    return lambda: analyzer.analyze(resume_text, description, regenerate=True)
+
+
+def _json_bench(transform):
+    from AI.schemas import ApplicationKitResult
+    analyzer = _analyzer()
+    content = transform(analyzer.llm.content_for({"properties": dict.fromkeys(ApplicationKitResult.model_fields)}))
+    return lambda: analyzer.repair("prompt", ApplicationKitResult, content, analyzer.model_name, use_cache=False,
+                                   tool="benchmark")
+
+
+@benchmark("json_parse_clean")
+def bench_json_clean():
+    return _json_bench(lambda content: content)
+
+
+@benchmark("json_parse_fenced")
+def bench_json_fenced():
+    # A code fence, a trailing comma and chatter after it: fixed locally
+    return _json_bench(lambda content: "```json\n" + content[:-1] + ",}\n```\nLet me know if you need more.")
+
+
+@benchmark("json_parse_truncated")
+def bench_json_truncated():
+    # Cut off inside the last section: closed locally, then that one field is re-requested
+    return _json_bench(lambda content: content[:int(len(content) * 0.9)])
+
+
+@benchmark("extract_job_jsonld")
+def bench_extract_jsonld():
+    from utils.scraper import extract_job_info
+    analyzer = _analyzer()
+    page = fixture("job_page_jsonld.html")
+    return lambda: extract_job_info(page, analyzer)
+
+
+@benchmark("extract_job_plain")
+def bench_extract_plain():
+    from utils.scraper import extract_job_info
+    analyzer = _analyzer()
+    page = fixture("job_page_plain.html")
+    return lambda: extract_job_info(page, analyzer)
+
+
+@benchmark("markdown_cover_letter")
+def bench_markdown_small():
+    from main import markdown_filter
+    text = FakeOllamaClient().content_for()
+    return lambda: markdown_filter(text)
+
+
+@benchmark("markdown_resume")
+def bench_markdown_large():
+    from main import markdown_filter
+    text = fixture("resume.md")
+    return lambda: markdown_filter(text)
+
+
+def measure(func, rounds, min_time):
+    """
+    Seconds per call for each round; each round repeats func until it has run for min_time.
+    The garbage collector is paused while timing, as timeit does, so its pauses don't land at random.
+    """
+    func()  # warm up imports and caches
+    gc.collect()
+    gc.disable()
+    try:
+        return _timed_rounds(func, rounds, min_time)
+    finally:
+        gc.enable()
+
+
+def _timed_rounds(func, rounds, min_time):
+    number = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_time:
+            break
+        number *= 2 if elapsed == 0 else max(2, int(min_time / elapsed) + 1)
+
+    timings = [elapsed / number]
+    for _ in range(rounds - 1):
+        started = time.perf_counter()
+        for _ in range(number):
+            func()
+        timings.append((time.perf_counter() - started) / number)
+    return timings, number
+
+
+def run(selected, rounds, min_time):
+    results = {}
+    for bench in selected:
+        timings, number = measure(bench["setup"](), rounds, min_time)
+        median = statistics.median(timings)
+        results[bench["name"]] = {
+            "median_ms": round(median * 1000, 4),
+            "min_ms": round(min(timings) * 1000, 4),
+            "stdev_ms": round(statistics.stdev(timings) * 1000, 4) if len(timings) > 1 else 0.0,
+            "throughput": round(bench["units"] / median, 2),
+            "unit": f"{bench['unit']}/s",
+            "rounds": rounds,
+            "calls_per_round": number,
+        }
+        print(f"{bench['name']:<24} {results[bench['name']]['median_ms']:>10.3f} ms"
+              f" {results[bench['name']]['throughput']:>12,.1f} {bench['unit']}/s", flush=True)
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Prints each benchmark's change against the baseline and returns the names that regressed."""
+    regressions = []
+    print(f"\n{'benchmark':<24} {'baseline':>12} {'current':>12} {'change':>8}")
+    for name, result in results.items():
+        before = baseline.get("benchmarks", {}).get(name)
+        if before is None:
+            print(f"{name:<24} {'-':>12} {result['min_ms']:>10.3f}ms {'new':>8}")
+            continue
+        change = result["min_ms"] / before["min_ms"] - 1
+        flag = ""
+        if change > threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<24} {before['min_ms']:>10.3f}ms {result['min_ms']:>10.3f}ms {change:>+7.1%}{flag}")
+    return regressions
+
+
+def environment():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=HERE).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+    }
+
+
+def write_json(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(data, f, indent=2)
+        f.write("\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the CareerPilot micro-benchmarks.")
+    parser.add_argument("-k", "--filter", help="only run benchmarks whose name contains this")
+    parser.add_argument("--rounds", type=int, default=7, help="timed rounds per benchmark (default 7)")
+    parser.add_argument("--min-time", type=float, default=0.2, help="minimum seconds per round (default 0.2)")
+    parser.add_argument("--output", default=RESULTS_PATH, help="where to write the results JSON")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="slowdown in the best round that counts as a regression (default 0.25 = 25%%)")
+    parser.add_argument("--save-baseline", action="store_true", help="write these results as the new baseline")
+    args = parser.parse_args(argv)
+
+    # Per-call INFO logs (token counts, repairs) would be timed along with the code
+    logging.disable(logging.INFO)
+    selected = [bench for bench in BENCHMARKS if not args.filter or args.filter in bench["name"]]
+    if not selected:
+        parser.error(f"no benchmark matches {args.filter!r}")
+
+    report = {"environment": environment(), "benchmarks": run(selected, args.rounds, args.min_time)}
+    write_json(args.output, report)
+    print(f"\nResults written to {args.output}")
+
+    if args.save_baseline:
+        write_json(args.baseline, report)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        print("No baseline to compare against; run with --save-baseline to create one.")
+        return 0
+    with open(args.baseline) as f:
+        regressions = compare(report["benchmarks"], json.load(f), args.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} benchmark(s) regressed by more than {args.threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,278 @@
+"""
+Load driver: signs up synthetic users against a running CareerPilot app, gives each a resume
+and a job, then hits the main pages and AI tools at each concurrency level and reports
+p50/p95/p99 latency, throughput and errors per scenario.
+
+    python -m loadtest.driver --base-url http://127.0.0.1:5000 --concurrency 1,4,16 --duration 30
+
+Point the app's OLLAMA_HOST at loadtest/fake_ollama.py (or use loadtest/run.py, which starts
+both) so no real model is needed.
+"""
+import argparse
+import itertools
+import json
+import os
+import re
+import threading
+import time
+from datetime import datetime
+
+import requests
+
+from benchmarks.fake_ollama import FIXTURES
+
+PASSWORD = "LoadTest1!"
+SCENARIOS = ("dashboard", "jobs", "compare", "ranking", "cover_letter")
+RESUME_ID_RE = re.compile(r"resume_id=(\d+)")
+# Pages that come back 200 but report a failure: an error flash, a failed analysis, an unscored
+# resume, or a task still running when the request timeout ran out
+FAILURE_MARKERS = {
+    "alert alert-error": "error message",
+    "Error during analysis": "analysis failed",
+    "could not be scored": "ranking failed",
+    "Working on it": "task timed out",
+}
+# Seconds between status checks of a queued tool run
+TASK_POLL_INTERVAL = 0.25
+# AI tools answer with their task instead of a redirect to its page
+API_HEADERS = {"Accept": "application/json"}
+
+
+class SyntheticUser:
+    """One logged-in session with a resume and a job to run the tools on."""
+
+    def __init__(self, base_url, index, timeout):
+        self.base_url = base_url.rstrip("/")
+        self.index = index
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.resume_id = None
+        self.job_id = None
+        self.description = None
+
+    def url(self, path):
+        return self.base_url + path
+
+    def setup(self, description, resume_path):
+        """Registers (unless the user exists from an earlier run), logs in and uploads what the tools need."""
+        email = f"loadtest{self.index}@example.com"
+        self.session.post(self.url("/register"), data={
+            "username": f"loadtest{self.index}", "email": email, "password": PASSWORD, "confirm": PASSWORD,
+            "phone": "555-0100", "address": "1 Test St", "city": "Austin", "state": "TX", "zip_code": "73301",
+            "country": "US",
+        }, timeout=self.timeout)
+        response = self.session.post(self.url("/login"), data={"email": email, "password": PASSWORD},
+                                     allow_redirects=False, timeout=self.timeout)
+        if response.status_code != 302 or "session" not in self.session.cookies:
+            raise RuntimeError(f"Could not log in {email} (HTTP {response.status_code})")
+
+        # Resume names are unique across all users, and reruns may reuse the database
+        with open(resume_path, "rb") as f:
+            response = self.session.post(self.url("/upload_resume"), data={"name": f"Load test resume {self.index} {time.time_ns()}"},
+                                         files={"resume_file": ("resume.pdf", f, "application/pdf")},
+                                         allow_redirects=False, timeout=self.timeout)
+        match = RESUME_ID_RE.search(response.headers.get("Location", ""))
+        if not match:
+            raise RuntimeError(f"Resume upload failed for {email} (HTTP {response.status_code})")
+        self.resume_id = int(match.group(1))
+
+        self.description = description
+        self.session.post(self.url("/jobs/create"), data={
+            "title": "Senior Backend Engineer", "company": "Acme Payments", "description": description,
+            "status": "Saved",
+        }, allow_redirects=False, timeout=self.timeout)
+        jobs = self.session.get(self.url("/api/jobs/typeahead"), params={"limit": 1}, timeout=self.timeout).json()
+        if not jobs.get("results"):
+            raise RuntimeError(f"Job creation failed for {email}")
+        self.job_id = jobs["results"][0]["id"]
+
+    def follow_task(self, response):
+        """Polls a queued tool run until a worker has finished it, then loads the page showing its result."""
+        if response.status_code != 202:
+            return response
+        task = response.json()
+        deadline = time.monotonic() + self.timeout
+        while time.monotonic() < deadline:
+            status = self.session.get(self.url(task["status_url"]), timeout=self.timeout).json()
+            if status.get("status") in ("done", "failed"):
+                break
+            time.sleep(TASK_POLL_INTERVAL)
+        return self.session.get(self.url(task["result_url"]), allow_redirects=False, timeout=self.timeout)
+
+    def request(self, scenario, nonce, unique):
+        """Runs one scenario and returns the response; AI tools are timed until their result page loads."""
+        # A nonce in the text makes each AI request a response-cache miss, so it reaches the model
+        description = f"{self.description}<p>Ref {nonce}</p>" if unique else self.description
+        if scenario == "dashboard":
+            return self.session.get(self.url("/dashboard"), allow_redirects=False, timeout=self.timeout)
+        if scenario == "jobs":
+            return self.session.get(self.url("/jobs"), allow_redirects=False, timeout=self.timeout)
+        if scenario == "compare":
+            return self.follow_task(self.session.post(
+                self.url(f"/compare/{self.resume_id}"), data={"job_description": description},
+                headers=API_HEADERS, allow_redirects=False, timeout=self.timeout,
+            ))
+        if scenario == "ranking":
+            # Scores the user's saved job, so only its first run per user reaches the model
+            return self.follow_task(self.session.get(self.url("/ranking/process"), params={
+                "job_id": self.job_id, "resume_ids": str(self.resume_id), "mode": "full",
+            }, headers=API_HEADERS, allow_redirects=False, timeout=self.timeout))
+        if scenario == "cover_letter":
+            return self.follow_task(self.session.post(self.url("/cover-letter"), data={
+                "resume_id": self.resume_id, "job_description": description, "regenerate": "1" if unique else "",
+            }, headers=API_HEADERS, allow_redirects=False, timeout=self.timeout))
+        raise ValueError(f"Unknown scenario {scenario}")
+
+
+def failure(response):
+    """Why a response counts as an error, or None if it succeeded."""
+    if response.status_code != 200:
+        return f"HTTP {response.status_code}"
+    for marker, reason in FAILURE_MARKERS.items():
+        if marker in response.text:
+            return reason
+    return None
+
+
+def percentile(ordered, pct):
+    """Nearest-rank percentile of an ascending list."""
+    if not ordered:
+        return None
+    rank = max(1, int(round(pct / 100 * len(ordered) + 0.5)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def summarize(samples, elapsed):
+    """samples: (latency_seconds, ok) pairs. Latencies in ms, throughput in requests per second."""
+    ordered = sorted(latency for latency, _ in samples)
+    errors = sum(1 for _, ok in samples if not ok)
+
+    def ms(value):
+        return None if value is None else round(value * 1000, 1)
+    return {
+        "requests": len(samples),
+        "errors": errors,
+        "error_rate": round(errors / len(samples), 4) if samples else 0.0,
+        "throughput_rps": round(len(samples) / elapsed, 2) if elapsed else 0.0,
+        "p50_ms": ms(percentile(ordered, 50)),
+        "p95_ms": ms(percentile(ordered, 95)),
+        "p99_ms": ms(percentile(ordered, 99)),
+        "max_ms": ms(ordered[-1] if ordered else None),
+    }
+
+
+def run_level(users, concurrency, duration, scenarios, unique):
+    """Runs `concurrency` workers for `duration` seconds, each cycling through the scenarios."""
+    samples = {scenario: [] for scenario in scenarios}
+    errors = {}
+    lock = threading.Lock()
+    nonce = itertools.count()
+    deadline = time.monotonic() + duration
+
+    def worker(number):
+        user = users[number % len(users)]
+        # Workers start at different points of the mix so every scenario is in flight at once
+        for scenario in itertools.islice(itertools.cycle(scenarios), number, None):
+            if time.monotonic() >= deadline:
+                return
+            started = time.perf_counter()
+            try:
+                reason = failure(user.request(scenario, next(nonce), unique))
+            except requests.RequestException as e:
+                reason = type(e).__name__
+            latency = time.perf_counter() - started
+            with lock:
+                samples[scenario].append((latency, reason is None))
+                if reason:
+                    key = f"{scenario}: {reason}"
+                    errors[key] = errors.get(key, 0) + 1
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker, args=(n,), daemon=True) for n in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    return {
+        "concurrency": concurrency,
+        "seconds": round(elapsed, 2),
+        "total": summarize([sample for values in samples.values() for sample in values], elapsed),
+        "scenarios": {scenario: summarize(values, elapsed) for scenario, values in samples.items()},
+        "errors": errors,
+    }
+
+
+def print_level(level):
+    print(f"\nconcurrency {level['concurrency']} ({level['seconds']}s)")
+    print(f"  {'scenario':<14} {'requests':>8} {'errors':>7} {'rps':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    rows = list(level["scenarios"].items()) + [("total", level["total"])]
+    for name, stats in rows:
+        def fmt(value):
+            return "-" if value is None else f"{value:.1f}"
+        print(f"  {name:<14} {stats['requests']:>8} {stats['errors']:>7} {stats['throughput_rps']:>8.2f}"
+              f" {fmt(stats['p50_ms']):>9} {fmt(stats['p95_ms']):>9} {fmt(stats['p99_ms']):>9}")
+    for error, count in sorted(level["errors"].items()):
+        print(f"  ! {error} x{count}")
+
+
+def add_arguments(parser):
+    parser.add_argument("--users", type=int, default=8, help="synthetic users to sign up (default 8)")
+    parser.add_argument("--concurrency", default="1,4,16",
+                        help="comma-separated concurrency levels to run in turn (default 1,4,16)")
+    parser.add_argument("--duration", type=float, default=30, help="seconds per concurrency level (default 30)")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS),
+                        help=f"comma-separated scenarios (default {','.join(SCENARIOS)})")
+    parser.add_argument("--cached", action="store_true",
+                        help="repeat identical AI requests so they are served from the response cache")
+    parser.add_argument("--timeout", type=float, default=120, help="per-request timeout in seconds (default 120)")
+    parser.add_argument("--output", help="write the report as JSON to this path")
+
+
+def drive(base_url, args, settings=None):
+    """Sets up the users, runs every level, prints the report and returns it."""
+    scenarios = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = set(scenarios) - set(SCENARIOS)
+    if unknown:
+        raise SystemExit(f"Unknown scenarios: {', '.join(sorted(unknown))}")
+    levels = [int(level) for level in args.concurrency.split(",")]
+
+    with open(os.path.join(FIXTURES, "job_description.html")) as f:
+        description = f.read()
+    users = [SyntheticUser(base_url, index, args.timeout) for index in range(args.users)]
+    for user in users:
+        user.setup(description, os.path.join(FIXTURES, "resume_small.pdf"))
+    print(f"{len(users)} synthetic users ready on {base_url}", flush=True)
+
+    report = {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "base_url": base_url,
+        "users": len(users),
+        "cached": args.cached,
+        "settings": settings or {},
+        "levels": [],
+    }
+    for concurrency in levels:
+        level = run_level(users, concurrency, args.duration, scenarios, unique=not args.cached)
+        print_level(level)
+        report["levels"].append(level)
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nReport written to {args.output}")
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Drive load against a running CareerPilot app.")
+    parser.add_argument("--base-url", default="http://127.0.0.1:5000")
+    add_arguments(parser)
+    args = parser.parse_args(argv)
+    drive(args.base_url, args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+"""
+A local stand-in for the Ollama HTTP API, for load tests that must not depend on a real model.
+
+    python -m loadtest.fake_ollama --port 11434 --latency 0.8 --tokens-per-second 40 --error-rate 0.01
+
+Answers come from benchmarks/fixtures/responses.json (a JSON Schema `format` gets the canned
+answer with those keys). Timing follows a real server: a request waits for one of --parallel
+slots (OLLAMA_NUM_PARALLEL), spends --latency seconds on the prompt, then produces tokens at
+--tokens-per-second, streamed or all at once. --error-rate of requests fail with HTTP 500.
+"""
+import argparse
+import json
+import logging
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from benchmarks.fake_ollama import FakeOllamaClient
+
+logger = logging.getLogger(__name__)
+
+MODELS = ["gpt-oss:120b-cloud", "llama3"]
+
+
+class FakeOllamaServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, latency=0.5, jitter=0.1, tokens_per_second=50.0, error_rate=0.0, parallel=4, seed=0):
+        super().__init__(address, FakeOllamaHandler)
+        self.latency = latency
+        self.jitter = jitter
+        self.tokens_per_second = tokens_per_second
+        self.error_rate = error_rate
+        self.slots = threading.BoundedSemaphore(parallel)
+        self.answers = FakeOllamaClient()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def draw(self):
+        """Returns (fail, prompt_seconds) for one request; seeded, so runs are repeatable."""
+        with self._lock:
+            self.requests += 1
+            fail = self._random.random() < self.error_rate
+            if fail:
+                self.errors += 1
+            return fail, max(0.0, self.latency + self._random.uniform(-self.jitter, self.jitter))
+
+    def start(self):
+        threading.Thread(target=self.serve_forever, name="fake-ollama", daemon=True).start()
+        return self
+
+
+class FakeOllamaHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        logger.debug(format % args)
+
+    def _json(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/api/tags":
+            self._json(200, {"models": [{"name": name, "model": name} for name in MODELS]})
+        elif self.path == "/api/ps":
+            self._json(200, {"models": [{"name": name, "model": name} for name in MODELS]})
+        elif self.path == "/api/version":
+            self._json(200, {"version": "0.0.0-fake"})
+        else:
+            self._json(404, {"error": "not found"})
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        request = json.loads(self.rfile.read(length) or b"{}")
+        if self.path != "/api/chat":
+            self._json(404, {"error": "not found"})
+            return
+
+        server = self.server
+        model = request.get("model", MODELS[0])
+        messages = request.get("messages") or []
+        if not messages:
+            # A preload (keep_alive) request: nothing to generate
+            self._json(200, self._chunk(model, "", done=True))
+            return
+
+        fail, prompt_seconds = server.draw()
+        with server.slots:
+            time.sleep(prompt_seconds)
+            if fail:
+                self._json(500, {"error": "fake ollama: simulated failure"})
+                return
+            content = server.answers.content_for(request.get("format"))
+            prompt_tokens = sum(len(message.get("content", "")) for message in messages) // 4
+            completion_tokens = max(1, len(content) // 4)
+            seconds_per_token = 1.0 / server.tokens_per_second if server.tokens_per_second > 0 else 0.0
+            counts = {"prompt_eval_count": prompt_tokens, "eval_count": completion_tokens}
+
+            if request.get("stream", True):
+                self._stream(model, content, seconds_per_token, counts)
+            else:
+                time.sleep(completion_tokens * seconds_per_token)
+                self._json(200, self._chunk(model, content, done=True, **counts))
+
+    def _stream(self, model, content, seconds_per_token, counts):
+        # Newline-delimited JSON until the connection closes, like Ollama's streaming responses
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+        piece = 16  # characters per chunk: about four tokens
+        for start in range(0, len(content), piece):
+            time.sleep(seconds_per_token * 4)
+            self.wfile.write(json.dumps(self._chunk(model, content[start:start + piece])).encode() + b"\n")
+            self.wfile.flush()
+        self.wfile.write(json.dumps(self._chunk(model, "", done=True, **counts)).encode() + b"\n")
+
+    @staticmethod
+    def _chunk(model, content, done=False, **counts):
+        chunk = {
+            "model": model,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "message": {"role": "assistant", "content": content},
+            "done": done,
+        }
+        if done:
+            chunk.update(done_reason="stop", **counts)
+        return chunk
+
+
+def add_arguments(parser):
+    parser.add_argument("--latency", type=float, default=0.5, help="seconds spent on the prompt (default 0.5)")
+    parser.add_argument("--jitter", type=float, default=0.1, help="+/- random seconds on the latency (default 0.1)")
+    parser.add_argument("--tokens-per-second", type=float, default=50.0, help="generation speed (default 50)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests that fail (default 0)")
+    parser.add_argument("--parallel", type=int, default=4, help="requests generated at once (default 4)")
+    parser.add_argument("--seed", type=int, default=0, help="random seed for latency jitter and failures")
+
+
+def server_from_args(args, host="127.0.0.1", port=0):
+    return FakeOllamaServer(
+        (host, port), latency=args.latency, jitter=args.jitter, tokens_per_second=args.tokens_per_second,
+        error_rate=args.error_rate, parallel=args.parallel, seed=args.seed,
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run a fake Ollama server for load tests.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11434)
+    add_arguments(parser)
+    args = parser.parse_args(argv)
+
+    server = server_from_args(args, args.host, args.port)
+    print(f"Fake Ollama listening on {server.url}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+End-to-end load test on one machine, fully offline: starts the fake Ollama server, starts the
+app against it with a throwaway database, cache and upload folder, runs the load driver and
+shuts everything down.
+
+    python -m loadtest.run --concurrency 1,4,16 --duration 30 --latency 0.8 --tokens-per-second 40
+
+The app runs under Flask's threaded server. To measure a production setup instead, start the
+app yourself (e.g. under your WSGI server, with OLLAMA_HOST pointing at `python -m
+loadtest.fake_ollama`) and run `python -m loadtest.driver --base-url ...` against it.
+"""
+import argparse
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+import requests
+
+from loadtest import driver
+from loadtest.fake_ollama import add_arguments as add_ollama_arguments, server_from_args
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def app_environment(workdir, ollama_url):
+    env = dict(os.environ)
+    env.update({
+        "OLLAMA_HOST": ollama_url,
+        "DATABASE_URL": f"sqlite:///{os.path.join(workdir, 'loadtest.db')}",
+        "CACHE_DIR": os.path.join(workdir, "cache"),
+        "UPLOAD_FOLDER": os.path.join(workdir, "uploads", "resumes"),
+        "INDEX_FOLDER": os.path.join(workdir, "uploads", "index"),
+        # Never reach out for embedding models or tokenizer files mid-test
+        "HF_HUB_OFFLINE": "1",
+        "TRANSFORMERS_OFFLINE": "1",
+        "PYTHONUNBUFFERED": "1",
+    })
+    return env
+
+
+def start_app(env, port, log):
+    subprocess.run([sys.executable, "-m", "flask", "--app", "main", "db", "upgrade"], cwd=ROOT, env=env,
+                   stdout=log, stderr=subprocess.STDOUT, check=True)
+    process = subprocess.Popen(
+        [sys.executable, "-m", "flask", "--app", "main", "run", "--port", str(port), "--no-reload", "--with-threads"],
+        cwd=ROOT, env=env, stdout=log, stderr=subprocess.STDOUT,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"The app exited during startup; see {log.name}")
+        try:
+            requests.get(base_url + "/login", timeout=1)
+            return process, base_url
+        except requests.RequestException:
+            time.sleep(0.25)
+    process.terminate()
+    raise RuntimeError(f"The app did not start within 60 seconds; see {log.name}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test the app end to end against a fake Ollama server.")
+    parser.add_argument("--port", type=int, default=0, help="port for the app (default: any free port)")
+    parser.add_argument("--keep", action="store_true", help="keep the temporary database, cache and logs")
+    driver.add_arguments(parser)
+    add_ollama_arguments(parser)
+    args = parser.parse_args(argv)
+
+    workdir = tempfile.mkdtemp(prefix="careerpilot-loadtest-")
+    ollama = server_from_args(args).start()
+    print(f"Fake Ollama on {ollama.url} (latency {args.latency}s, {args.tokens_per_second} tokens/s, "
+          f"error rate {args.error_rate:.0%}, {args.parallel} parallel)", flush=True)
+
+    log_path = os.path.join(workdir, "app.log")
+    with open(log_path, "w") as log:
+        process, base_url = start_app(app_environment(workdir, ollama.url), args.port or free_port(), log)
+        try:
+            settings = {
+                "latency": args.latency, "jitter": args.jitter, "tokens_per_second": args.tokens_per_second,
+                "error_rate": args.error_rate, "parallel": args.parallel, "server": "flask --with-threads",
+            }
+            driver.drive(base_url, args, settings)
+            print(f"\nFake Ollama served {ollama.requests} generations ({ollama.errors} simulated failures)")
+        finally:
+            process.terminate()
+            process.wait(timeout=10)
+            ollama.shutdown()
+            ollama.server_close()
+
+    if args.keep:
+        print(f"App log and data kept in {workdir}")
+    else:
+        import shutil
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -11,23 +11,84 @@ from routes.jobs import jobs_bp
 from routes.resumes import resumes_bp
 from routes.tools import tools_bp
 from routes.settings import settings_bp
+from routes.tasks import tasks_bp
+from utils.ingest import resumes_cli
+from utils.search_index import search_cli
+from utils.tasks import tasks_cli
+from utils.stats import stats_cli
+from utils.query_budget import init_query_budget
+from utils.database import database_uri, engine_options, init_sqlite_pragmas
 
 app = Flask(__name__)
 
 app.config["SECRET_KEY"] = os.environ.get("SECRET_KEY", "dev-secret-key-change-me")
 
-# SQLite database configuration
-app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///users.db"
+# Database: SQLite by default, any SQLAlchemy URL (e.g. postgresql://...) through DATABASE_URL
+app.config["SQLALCHEMY_DATABASE_URI"] = database_uri(os.environ.get("DATABASE_URL", "sqlite:///users.db"))
 app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+# Connection pool per process (size/overflow are ignored on SQLite); recycle and timeout in seconds
+app.config["SQLALCHEMY_ENGINE_OPTIONS"] = engine_options(
+    app.config["SQLALCHEMY_DATABASE_URI"],
+    pool_size=int(os.environ.get("DB_POOL_SIZE", 5)),
+    max_overflow=int(os.environ.get("DB_MAX_OVERFLOW", 10)),
+    pool_recycle=int(os.environ.get("DB_POOL_RECYCLE", 1800)),
+    pool_timeout=int(os.environ.get("DB_POOL_TIMEOUT", 30)),
+)
+# SQLite connection pragmas: busy timeout in milliseconds, memory-mapped I/O size in bytes
+app.config["SQLITE_SYNCHRONOUS"] = os.environ.get("SQLITE_SYNCHRONOUS", "NORMAL")
+app.config["SQLITE_BUSY_TIMEOUT"] = int(os.environ.get("SQLITE_BUSY_TIMEOUT", 5000))
+app.config["SQLITE_MMAP_SIZE"] = int(os.environ.get("SQLITE_MMAP_SIZE", 256 * 1024 * 1024))
 
 # File upload configuration
-app.config["UPLOAD_FOLDER"] = os.path.join(os.path.dirname(__file__), "uploads", "resumes")
+app.config["UPLOAD_FOLDER"] = os.environ.get("UPLOAD_FOLDER", os.path.join(os.path.dirname(__file__), "uploads", "resumes"))
 app.config["ALLOWED_RESUME_EXTENSIONS"] = {"pdf", "doc", "docx"}
 app.config["MAX_CONTENT_LENGTH"] = 16 * 1024 * 1024  # 16 MB
 
+# Semantic search indexes (FAISS files per user for resumes and jobs) live next to the uploads
+app.config["INDEX_FOLDER"] = os.environ.get("INDEX_FOLDER", os.path.join(os.path.dirname(__file__), "uploads", "index"))
+
+# Background text extraction for uploaded resumes
+app.config["INGEST_MAX_WORKERS"] = int(os.environ.get("INGEST_MAX_WORKERS", 2))
+app.config["INGEST_QUEUE_SIZE"] = int(os.environ.get("INGEST_QUEUE_SIZE", 32))
+
+# Resume ranking: parallel model calls across all rankings in this process and per-candidate timeout (seconds)
+app.config["RANKING_MAX_WORKERS"] = int(os.environ.get("RANKING_MAX_WORKERS", 4))
+app.config["RANKING_TIMEOUT"] = int(os.environ.get("RANKING_TIMEOUT", 120))
+# Only the top-K resumes by embedding similarity get a full LLM analysis (0 sends all)
+app.config["RANKING_TOP_K"] = int(os.environ.get("RANKING_TOP_K", 10))
+
+# Bulk job import: URLs per request, concurrent fetches overall and per site, seconds between
+# requests to one site, extraction threads (model fallbacks run here) and jobs per commit
+app.config["BULK_IMPORT_MAX_URLS"] = int(os.environ.get("BULK_IMPORT_MAX_URLS", 500))
+app.config["BULK_IMPORT_CONCURRENCY"] = int(os.environ.get("BULK_IMPORT_CONCURRENCY", 20))
+app.config["BULK_IMPORT_PER_DOMAIN"] = int(os.environ.get("BULK_IMPORT_PER_DOMAIN", 2))
+app.config["BULK_IMPORT_DOMAIN_INTERVAL"] = float(os.environ.get("BULK_IMPORT_DOMAIN_INTERVAL", 0.25))
+app.config["BULK_IMPORT_EXTRACT_WORKERS"] = int(os.environ.get("BULK_IMPORT_EXTRACT_WORKERS", 4))
+app.config["BULK_IMPORT_BATCH_SIZE"] = int(os.environ.get("BULK_IMPORT_BATCH_SIZE", 25))
+
+# Dashboard: resumes shown per page in the sidebar
+app.config["DASHBOARD_RESUMES_PER_PAGE"] = int(os.environ.get("DASHBOARD_RESUMES_PER_PAGE", 5))
+
+# Page sizes: jobs list pages, resumes pre-rendered in selectors, and typeahead results
+app.config["JOBS_PER_PAGE"] = int(os.environ.get("JOBS_PER_PAGE", 25))
+app.config["SELECT_RESUMES_LIMIT"] = int(os.environ.get("SELECT_RESUMES_LIMIT", 20))
+app.config["TYPEAHEAD_LIMIT"] = int(os.environ.get("TYPEAHEAD_LIMIT", 10))
+
+# Background AI tasks: worker threads per process (0 = only `flask tasks worker` runs tasks),
+# how often idle workers check the task table, and when a running task counts as abandoned
+app.config["TASK_MAX_WORKERS"] = int(os.environ.get("TASK_MAX_WORKERS", 4))
+app.config["TASK_POLL_INTERVAL"] = float(os.environ.get("TASK_POLL_INTERVAL", 2))
+app.config["TASK_TIMEOUT"] = int(os.environ.get("TASK_TIMEOUT", 900))
+
+# SQL statements a request may run before it is logged (0 disables); strict mode fails the request instead
+app.config["QUERY_BUDGET"] = int(os.environ.get("QUERY_BUDGET", 20))
+app.config["QUERY_BUDGET_STRICT"] = os.environ.get("QUERY_BUDGET_STRICT", "0") == "1"
+
 # Initialize extensions
 db.init_app(app)
+init_sqlite_pragmas(app)
 migrate = Migrate(app, db)
+init_query_budget(app)
 
 # Register Blueprints
 app.register_blueprint(auth_bp)
@@ -36,6 +97,13 @@ app.register_blueprint(jobs_bp)
 app.register_blueprint(resumes_bp)
 app.register_blueprint(tools_bp)
 app.register_blueprint(settings_bp)
+app.register_blueprint(tasks_bp)
+
+# Register CLI commands
+app.cli.add_command(resumes_cli)
+app.cli.add_command(search_cli)
+app.cli.add_command(tasks_cli)
+app.cli.add_command(stats_cli)
 
 # Register Template Filters
 @app.template_filter('markdown')
@@ -0,0 +1,185 @@
+"""Add job_posting table shared across users
+
+Revision ID: f3a7c1d9e052
+Revises: e4f8a2c6b913
+Create Date: 2026-10-16 23:12:47.508214
+
+"""
+import hashlib
+import html
+import re
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f3a7c1d9e052'
+down_revision = 'e4f8a2c6b913'
+branch_labels = None
+depends_on = None
+
+job = sa.table(
+    'job',
+    sa.column('id', sa.Integer),
+    sa.column('title', sa.String),
+    sa.column('company', sa.String),
+    sa.column('location', sa.String),
+    sa.column('salary_range', sa.String),
+    sa.column('job_url', sa.String),
+    sa.column('description', sa.Text),
+    sa.column('posting_id', sa.Integer),
+)
+# A full Table so inserts report the new posting's id
+job_posting = sa.Table(
+    'job_posting',
+    sa.MetaData(),
+    sa.Column('id', sa.Integer, primary_key=True),
+    sa.Column('canonical_url', sa.String),
+    sa.Column('content_hash', sa.String),
+    sa.Column('title', sa.String),
+    sa.Column('company', sa.String),
+    sa.Column('location', sa.String),
+    sa.Column('salary_range', sa.String),
+    sa.Column('description', sa.Text),
+    sa.Column('clean_text', sa.Text),
+    sa.Column('source', sa.String),
+)
+
+# Copies of the normalization in utils/postings.py as of this revision, so the data migration
+# keeps producing the same hashes and URLs when the application code changes
+TRACKING_PARAM_RE = re.compile(
+    r"^(utm_\w+|gclid|fbclid|msclkid|dclid|mc_cid|mc_eid|_hsenc|_hsmi|igshid|si|ref|refid|trk|trkinfo|"
+    r"trackingid|src|source|campaign|lipi|gh_src|hsa_\w+|yclid)$",
+    re.IGNORECASE,
+)
+BOILERPLATE_RE = re.compile(
+    r"equal (employment )?opportunity|affirmative action|e-verify|without regard to (race|sex|age)|"
+    r"reasonable accommodation|protected veteran|genetic information|sexual orientation|"
+    r"privacy (policy|notice|statement)|cookie|all rights reserved|terms of (use|service)|"
+    r"^(apply( now)?|share( this job)?|save( job)?|report( this)? job|back to (search|jobs)|"
+    r"sign in|log in|similar jobs)\W*$",
+    re.IGNORECASE,
+)
+BLOCK_TAG_RE = re.compile(r"<\s*(br|/p|/div|/ul|/ol|/h[1-6]|/tr)\b[^>]*>", re.IGNORECASE)
+LIST_ITEM_RE = re.compile(r"<\s*li\b[^>]*>", re.IGNORECASE)
+TAG_RE = re.compile(r"<[^<]+?>")
+
+
+def canonical_url(url):
+    parts = urlsplit((url or "").strip())
+    if parts.scheme.lower() not in ("http", "https") or not parts.netloc:
+        return None
+    query = sorted((key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+                   if not TRACKING_PARAM_RE.match(key))
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, urlencode(query), ""))[:500]
+
+
+def posting_text(description):
+    text = BLOCK_TAG_RE.sub("\n", description or "")
+    text = html.unescape(TAG_RE.sub(" ", LIST_ITEM_RE.sub("\n- ", text)))
+    lines = [re.sub(r"[ \t\f\v]+", " ", line).strip() for line in text.splitlines()]
+    text = re.sub(r"\n{3,}", "\n\n", "\n".join(lines)).strip()
+    kept = []
+    seen = set()
+    for line in text.splitlines():
+        key = line.lower().strip(" -*•")
+        if key:
+            if key in seen:
+                continue
+            seen.add(key)
+            if len(line) < 400 and BOILERPLATE_RE.search(line):
+                continue
+        kept.append(line)
+    return re.sub(r"\n{3,}", "\n\n", "\n".join(kept)).strip()
+
+
+def content_hash(text):
+    normalized = re.sub(r"\s+", " ", text).strip().lower()
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+def upgrade():
+    # ### commands auto generated by Alembic - please adjust! ###
+    op.create_table('job_posting',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('canonical_url', sa.String(length=500), nullable=True),
+    sa.Column('content_hash', sa.String(length=64), nullable=False),
+    sa.Column('title', sa.String(length=150), nullable=True),
+    sa.Column('company', sa.String(length=150), nullable=True),
+    sa.Column('location', sa.String(length=100), nullable=True),
+    sa.Column('salary_range', sa.String(length=100), nullable=True),
+    sa.Column('description', sa.Text(), nullable=False),
+    sa.Column('clean_text', sa.Text(), nullable=False),
+    sa.Column('source', sa.String(length=20), nullable=True),
+    sa.Column('embedding', sa.LargeBinary(), nullable=True),
+    sa.Column('embedding_model', sa.String(length=100), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('canonical_url'),
+    sa.UniqueConstraint('content_hash')
+    )
+    with op.batch_alter_table('job', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('posting_id', sa.Integer(), nullable=True))
+        batch_op.alter_column('description',
+               existing_type=sa.TEXT(),
+               nullable=True)
+        batch_op.create_index(batch_op.f('ix_job_posting_id'), ['posting_id'], unique=False)
+        batch_op.create_foreign_key('fk_job_posting_id_job_posting', 'job_posting', ['posting_id'], ['id'])
+
+    # ### end Alembic commands ###
+
+    # Move existing descriptions into postings, one per distinct text
+    connection = op.get_bind()
+    postings = {}
+    urls = set()
+    rows = connection.execute(sa.select(
+        job.c.id, job.c.title, job.c.company, job.c.location, job.c.salary_range, job.c.job_url, job.c.description,
+    )).all()
+    for row in rows:
+        clean_text = posting_text(row.description)
+        if not clean_text:
+            continue
+        digest = content_hash(clean_text)
+        posting_id = postings.get(digest)
+        if posting_id is None:
+            url = canonical_url(row.job_url)
+            if url in urls:
+                url = None
+            urls.add(url)
+            posting_id = connection.execute(job_posting.insert().values(
+                canonical_url=url, content_hash=digest, title=row.title, company=row.company,
+                location=row.location, salary_range=row.salary_range, description=row.description,
+                clean_text=clean_text, source='manual',
+            )).inserted_primary_key[0]
+            postings[digest] = posting_id
+        connection.execute(
+            job.update().where(job.c.id == row.id).values(posting_id=posting_id, description=None)
+        )
+
+
+def downgrade():
+    # Copy the shared descriptions back onto each job before the table goes
+    connection = op.get_bind()
+    connection.execute(
+        job.update().where(job.c.description.is_(None)).values(
+            description=sa.func.coalesce(
+                sa.select(job_posting.c.description).where(job_posting.c.id == job.c.posting_id).scalar_subquery(),
+                '',
+            )
+        )
+    )
+
+    # ### commands auto generated by Alembic - please adjust! ###
+    with op.batch_alter_table('job', schema=None) as batch_op:
+        batch_op.drop_constraint('fk_job_posting_id_job_posting', type_='foreignkey')
+        batch_op.drop_index(batch_op.f('ix_job_posting_id'))
+        batch_op.alter_column('description',
+               existing_type=sa.TEXT(),
+               nullable=False)
+        batch_op.drop_column('posting_id')
+
+    op.drop_table('job_posting')
+    # ### end Alembic commands ###
@@ -1,6 +1,9 @@
 from .user import User
 from .resumes import Resume
 from .job import Job
+from .job_posting import JobPosting
+from .task import Task
+from .application_kit import ApplicationKit
+from .user_stats import UserStats
 
-__all__ = ["User", "Resume", "Job"]
-
+__all__ = ["User", "Resume", "Job", "JobPosting", "Task", "ApplicationKit", "UserStats"]
@@ -0,0 +1,43 @@
+from extensions import db
+from datetime import datetime
+import json
+
+class ApplicationKit(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    job_id = db.Column(db.Integer, db.ForeignKey('job.id'), nullable=True, index=True)
+    resume_id = db.Column(db.Integer, db.ForeignKey('resume.id'), nullable=True)
+    model_name = db.Column(db.String(100), nullable=True)
+    cover_letter = db.Column(db.Text, nullable=False) # Markdown
+    interview_prep = db.Column(db.Text, nullable=False) # JSON
+    networking = db.Column(db.Text, nullable=False) # JSON
+    linkedin = db.Column(db.Text, nullable=False) # JSON
+    created_at = db.Column(db.DateTime, default=datetime.now)
+
+    job = db.relationship('Job', back_populates='kits')
+    resume = db.relationship('Resume')
+
+    def __repr__(self):
+        return f"<ApplicationKit {self.id}>"
+
+    @classmethod
+    def from_generated(cls, kit, user_id, job_id=None, resume_id=None, model_name=None):
+        return cls(
+            user_id=user_id,
+            job_id=job_id,
+            resume_id=resume_id,
+            model_name=model_name,
+            cover_letter=kit["cover_letter"],
+            interview_prep=json.dumps(kit["interview_prep"]),
+            networking=json.dumps(kit["networking"]),
+            linkedin=json.dumps(kit["linkedin"]),
+        )
+
+    def sections(self):
+        """The four artifacts in the shapes the individual tool templates expect."""
+        return {
+            "cover_letter": self.cover_letter,
+            "interview_prep": json.loads(self.interview_prep),
+            "networking": json.loads(self.networking),
+            "linkedin": json.loads(self.linkedin),
+        }
@@ -4,12 +4,14 @@ from datetime import datetime
 class Job(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(150), nullable=False)
-    description = db.Column(db.Text, nullable=False) # Can store HTML
+    # Shared posting content; description_override is only set when a job's text differs from it
+    posting_id = db.Column(db.Integer, db.ForeignKey('job_posting.id'), nullable=True, index=True)
+    description_override = db.Column('description', db.Text, nullable=True) # Can store HTML
     company = db.Column(db.String(150), nullable=True)
     job_url = db.Column(db.String(500), nullable=True)
     status = db.Column(db.String(50), default='Saved') # Saved, Applied, Interviewing, Offer, Rejected
     notes = db.Column(db.Text, nullable=True)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     
     # Enhanced Tracking Fields
@@ -19,5 +21,28 @@ class Job(db.Model):
     interview_date = db.Column(db.DateTime, nullable=True)
     application_date = db.Column(db.DateTime, default=datetime.utcnow)
 
+    # Lazy by default; views that use these eager-load them (joinedload/selectinload) in the same query
+    resume = db.relationship('Resume', back_populates='jobs')
+    posting = db.relationship('JobPosting')
+    # Kits are bulk-deleted with the job, so deleting a job doesn't need to load them
+    kits = db.relationship('ApplicationKit', back_populates='job', order_by='ApplicationKit.created_at.desc()',
+                           passive_deletes=True)
+
+    # Lists filter by user and order by date; the dashboard and stats group by status
+    __table_args__ = (
+        db.Index('ix_job_user_id_created_at', 'user_id', 'created_at'),
+        db.Index('ix_job_user_id_status', 'user_id', 'status'),
+    )
+
     def __repr__(self):
         return f'<Job {self.title}>'
+
+    @property
+    def description(self):
+        if self.description_override is not None:
+            return self.description_override
+        return self.posting.description if self.posting else ""
+
+    @description.setter
+    def description(self, value):
+        self.description_override = value
@@ -0,0 +1,35 @@
+from extensions import db
+from datetime import datetime
+
+class JobPosting(db.Model):
+    """
+    A job posting's shared content, stored once however many users save it (see utils/postings.py).
+    Found by canonical URL or by the hash of its normalized text; Job rows point here.
+    """
+    id = db.Column(db.Integer, primary_key=True)
+    canonical_url = db.Column(db.String(500), unique=True, nullable=True)
+    content_hash = db.Column(db.String(64), unique=True, nullable=False)
+    title = db.Column(db.String(150), nullable=True)
+    company = db.Column(db.String(150), nullable=True)
+    location = db.Column(db.String(100), nullable=True)
+    salary_range = db.Column(db.String(100), nullable=True)
+    description = db.Column(db.Text, nullable=False) # HTML
+    clean_text = db.Column(db.Text, nullable=False) # Normalized plain text the hash is taken over
+    source = db.Column(db.String(20), nullable=True) # json-ld, meta, llm, manual
+    embedding = db.Column(db.LargeBinary, nullable=True) # float32 vector of the posting document
+    embedding_model = db.Column(db.String(100), nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.now)
+
+    def __repr__(self):
+        return f"<JobPosting {self.id} {self.title}>"
+
+    def fields(self):
+        """The extracted fields in the shape /api/extract-job returns."""
+        return {
+            "title": self.title,
+            "company": self.company,
+            "location": self.location,
+            "salary_range": self.salary_range,
+            "description": self.description,
+            "source": self.source,
+        }
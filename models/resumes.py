@@ -7,9 +7,23 @@ class Resume(db.Model):
     name = db.Column(db.String(80), unique=True, nullable=False)
     resume_text = db.Column(db.Text, nullable=False)
     resume_file_path = db.Column(db.String(255), nullable=False)
-    created_at = db.Column(db.DateTime, default=datetime.now)
+    created_at = db.Column(db.DateTime, default=datetime.now, nullable=False)
     updated_at = db.Column(db.DateTime, default=datetime.now, onupdate=datetime.now)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+
+    # Text extraction metadata, filled by the ingest pipeline after upload
+    text_status = db.Column(db.String(20), default='pending') # pending, ready, failed
+    content_hash = db.Column(db.String(64), nullable=True)
+    page_count = db.Column(db.Integer, nullable=True)
+    token_count = db.Column(db.Integer, nullable=True)
+    text_extracted_at = db.Column(db.DateTime, nullable=True)
+
+    jobs = db.relationship('Job', back_populates='resume')
+
+    __table_args__ = (
+        db.Index('ix_resume_user_id_created_at', 'user_id', 'created_at'),
+    )
+
     def __repr__(self):
         return f"<Resume {self.name}>"
 
@@ -17,4 +31,5 @@ class Resume(db.Model):
         self.name = name
         self.resume_text = resume_text
         self.resume_file_path = resume_file_path
-        self.user_id = user_id
\ No newline at end of file
+        self.user_id = user_id
+        self.text_status = "pending"
@@ -0,0 +1,38 @@
+from extensions import db
+from datetime import datetime
+import json
+
+class Task(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    kind = db.Column(db.String(50), nullable=False) # analyze, cover_letter, interview_prep, ...
+    status = db.Column(db.String(20), default='queued', index=True) # queued, running, done, failed
+    payload = db.Column(db.Text, nullable=False) # JSON arguments for the handler
+    result = db.Column(db.Text, nullable=True) # JSON result once done
+    error = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.now)
+    started_at = db.Column(db.DateTime, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+
+    def __repr__(self):
+        return f"<Task {self.id} {self.kind} {self.status}>"
+
+    @property
+    def pending(self):
+        return self.status in ("queued", "running")
+
+    @property
+    def result_data(self):
+        return json.loads(self.result) if self.result else None
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "result": self.result_data,
+            "error": self.error,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+        }
@@ -0,0 +1,30 @@
+from extensions import db
+from datetime import datetime
+
+# Job statuses with their own counter column
+JOB_STATUS_COLUMNS = {
+    "Saved": "saved_count",
+    "Applied": "applied_count",
+    "Interviewing": "interviewing_count",
+    "Offer": "offer_count",
+    "Rejected": "rejected_count",
+}
+
+class UserStats(db.Model):
+    """Per-user dashboard counters, kept up to date as jobs and resumes change (see utils/stats.py)."""
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), primary_key=True)
+    job_count = db.Column(db.Integer, default=0, nullable=False)
+    saved_count = db.Column(db.Integer, default=0, nullable=False)
+    applied_count = db.Column(db.Integer, default=0, nullable=False)
+    interviewing_count = db.Column(db.Integer, default=0, nullable=False)
+    offer_count = db.Column(db.Integer, default=0, nullable=False)
+    rejected_count = db.Column(db.Integer, default=0, nullable=False)
+    resume_count = db.Column(db.Integer, default=0, nullable=False)
+    updated_at = db.Column(db.DateTime, default=datetime.now, onupdate=datetime.now)
+
+    def __repr__(self):
+        return f"<UserStats {self.user_id}>"
+
+    @property
+    def interviews_count(self):
+        return self.interviewing_count + self.offer_count
@@ -1,5 +1,6 @@
-from flask import Blueprint, render_template, session, flash, redirect, url_for, request
+from flask import Blueprint, render_template, session, flash, redirect, url_for, request, current_app
 from models import Job, Resume
+from utils.stats import get_user_stats
 import os
 from pathlib import Path
 
@@ -11,7 +12,20 @@ def dashboard():
         flash("Please log in to access the dashboard.", "error")
         return redirect(url_for("auth.login"))
 
-    resumes = Resume.query.order_by(Resume.created_at.desc()).all()
+    user_id = session["user_id"]
+
+    # Job and resume counts come from the per-user stats row
+    stats = get_user_stats(user_id)
+
+    resume_page = Resume.query.filter_by(user_id=user_id).order_by(Resume.created_at.desc(), Resume.id.desc()).paginate(
+        page=request.args.get("resume_page", 1, type=int),
+        per_page=current_app.config["DASHBOARD_RESUMES_PER_PAGE"],
+        error_out=False,
+        count=False,
+    )
+    # The stats row already knows the total, so paging needs no COUNT query
+    resume_page.total = stats.resume_count
+    resumes = resume_page.items
 
     selected_resume = None
     can_preview_pdf = False
@@ -19,7 +33,7 @@ def dashboard():
 
     selected_id = request.args.get("resume_id", type=int)
     if selected_id:
-        selected_resume = Resume.query.get(selected_id)
+        selected_resume = Resume.query.filter_by(id=selected_id, user_id=user_id).first()
     elif resumes:
         selected_resume = resumes[0]
 
@@ -29,22 +43,19 @@ def dashboard():
             can_preview_pdf = True
             viewer_url = url_for("resumes.view_resume_inline", resume_id=selected_resume.id)
 
-    # Fetch Job Stats
-    jobs = Job.query.filter_by(user_id=session["user_id"]).all()
-    total_applications = len(jobs)
-    interviews_count = len([j for j in jobs if j.status in ['Interviewing', 'Offer']])
-    
     # Recent Activity (Last 5 jobs)
-    recent_jobs = Job.query.filter_by(user_id=session["user_id"]).order_by(Job.created_at.desc()).limit(5).all()
+    recent_jobs = Job.query.filter_by(user_id=user_id).order_by(Job.created_at.desc()).limit(5).all()
 
     return render_template(
         "dashboard.html",
         username=session.get("username"),
         resumes=resumes,
+        resume_page=resume_page,
+        stats=stats,
         selected_resume=selected_resume,
         can_preview_pdf=can_preview_pdf,
         viewer_url=viewer_url,
-        total_applications=total_applications,
-        interviews_count=interviews_count,
+        total_applications=stats.job_count,
+        interviews_count=stats.interviews_count,
         recent_jobs=recent_jobs
     )
@@ -1,9 +1,17 @@
-from flask import Blueprint, render_template, request, redirect, url_for, session, flash, jsonify
-from models import Job, Resume
+from flask import Blueprint, render_template, request, redirect, url_for, session, flash, jsonify, current_app, Response, stream_with_context
+from models import Job, Resume, ApplicationKit
 from extensions import db
 from datetime import datetime
+from sqlalchemy.orm import load_only, joinedload, selectinload
 from services import analyzer
 from utils.scraper import fetch_url_content, extract_job_info
+from utils.search_index import index_job, unindex_job, search_jobs
+from utils.ingest import ensure_resume_text
+from utils.pagination import keyset_page, recent_resumes
+from utils.bulk_import import clean_import_urls, import_jobs
+from utils.postings import attach_posting, find_posting, get_or_create_posting
+from utils.tasks import get_task
+import json
 
 jobs_bp = Blueprint('jobs', __name__)
 
@@ -12,8 +20,11 @@ def jobs_list():
     if "user_id" not in session:
         return redirect(url_for("auth.login"))
     
-    jobs = Job.query.filter_by(user_id=session["user_id"]).order_by(Job.created_at.desc()).all()
-    return render_template("jobs/list.html", jobs=jobs)
+    cursor = request.args.get("cursor")
+    jobs, next_cursor = keyset_page(
+        Job.query.filter_by(user_id=session["user_id"]), Job, cursor, current_app.config["JOBS_PER_PAGE"]
+    )
+    return render_template("jobs/list.html", jobs=jobs, next_cursor=next_cursor, paged=bool(cursor))
 
 @jobs_bp.route("/jobs/create", methods=["GET", "POST"])
 def jobs_create():
@@ -56,8 +67,12 @@ def jobs_create():
                     interview_date=interview_date,
                     user_id=user_id
                 )
+                # The description is stored once in the shared posting store
+                attach_posting(new_job)
                 db.session.add(new_job)
                 db.session.commit()
+                index_job(new_job)
+                db.session.commit()
                 flash("Job created successfully!", "success")
                 return redirect(url_for("jobs.jobs_list"))
             except Exception as e:
@@ -66,23 +81,43 @@ def jobs_create():
         else:
             flash("Job title is required.", "error")
             
-    # Fetch Resumes for dropdown
-    resumes = Resume.query.filter_by(user_id=user_id).all()
+    # Most recent resumes for the dropdown; older ones are found through the typeahead
+    resumes = recent_resumes(user_id, current_app.config["SELECT_RESUMES_LIMIT"])
     return render_template("jobs/create.html", resumes=resumes)
 
+@jobs_bp.route("/jobs/import")
+def jobs_import():
+    if "user_id" not in session:
+        return redirect(url_for("auth.login"))
+
+    return render_template("jobs/import.html", max_urls=current_app.config["BULK_IMPORT_MAX_URLS"])
+
 @jobs_bp.route("/jobs/<int:job_id>")
 def jobs_detail(job_id):
     if "user_id" not in session:
         return redirect(url_for("auth.login"))
     
-    job = Job.query.get_or_404(job_id)
+    # The linked resume comes back in the same query, the kits in one more
+    job = Job.query.options(joinedload(Job.resume), joinedload(Job.posting), selectinload(Job.kits)).get_or_404(job_id)
     if job.user_id != session["user_id"]:
         flash("Access denied.", "error")
         return redirect(url_for("jobs.jobs_list"))
         
-    resume = Resume.query.get(job.resume_id) if job.resume_id else None
+    # An application kit queued from this page: open it once it is ready
+    task = None
+    task_id = request.args.get("task_id", type=int)
+    if task_id:
+        task = get_task(task_id, session["user_id"])
+        if task is None or task.kind != "application_kit":
+            task = None
+        elif task.status == "done":
+            return redirect(url_for("tools.application_kit_view", kit_id=task.result_data["kit_id"]))
+        elif task.status == "failed":
+            flash(task.error or "Failed to generate the application kit. Please try again.", "error")
+
+    resumes = recent_resumes(session["user_id"], current_app.config["SELECT_RESUMES_LIMIT"], include_id=job.resume_id)
         
-    return render_template("jobs/detail.html", job=job, resume=resume)
+    return render_template("jobs/detail.html", job=job, resume=job.resume, resumes=resumes, kits=job.kits, task=task)
 
 @jobs_bp.route("/jobs/<int:job_id>/delete", methods=["POST"])
 def delete_job(job_id):
@@ -95,6 +130,8 @@ def delete_job(job_id):
         return redirect(url_for("jobs.jobs_list"))
         
     try:
+        unindex_job(job)
+        ApplicationKit.query.filter_by(job_id=job.id).delete()
         db.session.delete(job)
         db.session.commit()
         flash("Job deleted successfully.", "success")
@@ -115,15 +152,135 @@ def api_extract_job():
     if not url:
         return jsonify({"error": "No URL provided"}), 400
         
-    # 1. Fetch content
+    # 1. Postings someone already imported need no fetch or extraction
+    posting = find_posting(url)
+    if posting:
+        return jsonify(posting.fields())
+        
+    # 2. Fetch content
     html_content = fetch_url_content(url)
     if not html_content:
         return jsonify({"error": "Failed to fetch URL. Check if it's valid."}), 400
         
-    # 2. Extract Info using AI
+    # 3. Extract Info using AI
     extracted_data = extract_job_info(html_content, analyzer)
     
     if extracted_data:
+        if extracted_data.get("description"):
+            get_or_create_posting(
+                extracted_data["description"], url=url, title=extracted_data.get("title"),
+                company=extracted_data.get("company"), location=extracted_data.get("location"),
+                salary_range=extracted_data.get("salary_range"), source=extracted_data.get("source"),
+            )
+            db.session.commit()
         return jsonify(extracted_data)
     else:
         return jsonify({"error": "Failed to extract job info."}), 500
+
+def _sse(event, data):
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+@jobs_bp.route("/api/jobs/import", methods=["POST"])
+def api_import_jobs():
+    if "user_id" not in session:
+        return jsonify({"error": "Unauthorized"}), 401
+
+    # JSON {"urls": [...]} or a form field with one URL per line
+    data = request.get_json(silent=True) or {}
+    urls = clean_import_urls(data.get("urls") or request.form.get("urls", "").split())
+    max_urls = current_app.config["BULK_IMPORT_MAX_URLS"]
+    if not urls:
+        return jsonify({"error": "No valid URLs provided"}), 400
+    if len(urls) > max_urls:
+        return jsonify({"error": f"At most {max_urls} URLs can be imported at once"}), 400
+
+    user_id = session["user_id"]
+
+    # Progress streams as Server-Sent Events while the pages are fetched concurrently
+    def generate():
+        yield _sse("start", {"total": len(urls)})
+        for event, payload in import_jobs(user_id, urls, analyzer):
+            yield _sse(event, payload)
+
+    return Response(stream_with_context(generate()), mimetype="text/event-stream", headers={
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no",
+    })
+
+@jobs_bp.route("/api/jobs/search", methods=["POST"])
+def api_search_jobs():
+    if "user_id" not in session:
+        return jsonify({"error": "Unauthorized"}), 401
+
+    data = request.get_json(silent=True) or {}
+    resume_id = data.get("resume_id")
+    try:
+        k = int(data.get("k") or 5)
+    except (TypeError, ValueError, OverflowError):
+        k = 5
+    k = min(max(k, 1), 50)
+
+    resume = Resume.query.get(resume_id) if resume_id else None
+    if not resume or resume.user_id != session["user_id"]:
+        return jsonify({"error": "Resume not found"}), 404
+
+    matches = search_jobs(session["user_id"], ensure_resume_text(resume), k)
+    if matches is None:
+        return jsonify({"error": "Semantic search is not available on this server."}), 503
+
+    jobs = {
+        j.id: j for j in Job.query.filter(
+            Job.id.in_([job_id for job_id, _ in matches]),
+            Job.user_id == session["user_id"],
+        )
+    }
+    results = [
+        {
+            "id": job_id,
+            "title": jobs[job_id].title,
+            "company": jobs[job_id].company,
+            "status": jobs[job_id].status,
+            "score": round(similarity, 4),
+            "url": url_for("jobs.jobs_detail", job_id=job_id),
+        }
+        for job_id, similarity in matches if job_id in jobs
+    ]
+    return jsonify({"results": results})
+
+@jobs_bp.route("/api/jobs/typeahead")
+def api_jobs_typeahead():
+    if "user_id" not in session:
+        return jsonify({"error": "Unauthorized"}), 401
+
+    query = Job.query.filter_by(user_id=session["user_id"])
+    q = request.args.get("q", "").strip()
+    if q:
+        pattern = f"%{q}%"
+        query = query.filter(Job.title.ilike(pattern) | Job.company.ilike(pattern))
+    # Only the columns the selectors show; descriptions are fetched per job on pick
+    query = query.options(load_only(Job.id, Job.title, Job.company, Job.created_at))
+
+    limit = min(max(request.args.get("limit", current_app.config["TYPEAHEAD_LIMIT"], type=int), 1), 50)
+    jobs, next_cursor = keyset_page(query, Job, request.args.get("cursor"), limit)
+    return jsonify({
+        "results": [
+            {"id": job.id, "title": job.title, "company": job.company, "created_at": job.created_at.isoformat()}
+            for job in jobs
+        ],
+        "next_cursor": next_cursor,
+    })
+
+@jobs_bp.route("/api/jobs/<int:job_id>")
+def api_job(job_id):
+    if "user_id" not in session:
+        return jsonify({"error": "Unauthorized"}), 401
+
+    job = Job.query.get(job_id)
+    if not job or job.user_id != session["user_id"]:
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify({
+        "id": job.id,
+        "title": job.title,
+        "company": job.company,
+        "description": job.description,
+    })
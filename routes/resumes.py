@@ -1,6 +1,10 @@
-from flask import Blueprint, send_file, request, redirect, url_for, session, flash, current_app, abort
+from flask import Blueprint, send_file, request, redirect, url_for, session, flash, current_app, abort, jsonify
 from models import Resume
 from extensions import db
+from utils.ingest import schedule_ingest
+from utils.search_index import search_resumes, unindex_resume
+from utils.pagination import keyset_page
+from sqlalchemy.orm import load_only
 from werkzeug.utils import secure_filename
 import os
 import time
@@ -51,6 +55,9 @@ def upload_resume():
     db.session.add(resume)
     db.session.commit()
 
+    # Text extraction happens off the request path
+    schedule_ingest(resume)
+
     flash("Resume uploaded successfully.", "success")
     return redirect(url_for("dashboard.dashboard", resume_id=resume.id))
 
@@ -86,6 +93,7 @@ def delete_resume(resume_id: int):
             # If deletion fails, we still remove the DB record
             pass
 
+    unindex_resume(resume)
     db.session.delete(resume)
     db.session.commit()
 
@@ -107,3 +115,64 @@ def view_resume_inline(resume_id: int):
         abort(415)
 
     return send_file(resume.resume_file_path, mimetype="application/pdf")
+
+@resumes_bp.route("/api/resumes/search", methods=["POST"])
+def api_search_resumes():
+    if "user_id" not in session:
+        return jsonify({"error": "Unauthorized"}), 401
+
+    data = request.get_json(silent=True) or {}
+    query = (data.get("job_description") or "").strip()
+    try:
+        k = int(data.get("k") or 5)
+    except (TypeError, ValueError, OverflowError):
+        k = 5
+    k = min(max(k, 1), 50)
+
+    if not query:
+        return jsonify({"error": "No job description provided"}), 400
+
+    matches = search_resumes(session["user_id"], query, k)
+    if matches is None:
+        return jsonify({"error": "Semantic search is not available on this server."}), 503
+
+    # The index can briefly lag deletes, so only return rows that still exist
+    resumes = {
+        r.id: r for r in Resume.query.filter(
+            Resume.id.in_([resume_id for resume_id, _ in matches]),
+            Resume.user_id == session["user_id"],
+        )
+    }
+    results = [
+        {
+            "id": resume_id,
+            "name": resumes[resume_id].name,
+            "score": round(similarity, 4),
+            "created_at": resumes[resume_id].created_at.isoformat(),
+            "compare_url": url_for("tools.compare_resume", resume_id=resume_id),
+        }
+        for resume_id, similarity in matches if resume_id in resumes
+    ]
+    return jsonify({"results": results})
+
+@resumes_bp.route("/api/resumes/typeahead")
+def api_resumes_typeahead():
+    if "user_id" not in session:
+        return jsonify({"error": "Unauthorized"}), 401
+
+    query = Resume.query.filter_by(user_id=session["user_id"]).options(
+        load_only(Resume.id, Resume.name, Resume.created_at)
+    )
+    q = request.args.get("q", "").strip()
+    if q:
+        query = query.filter(Resume.name.ilike(f"%{q}%"))
+
+    limit = min(max(request.args.get("limit", current_app.config["TYPEAHEAD_LIMIT"], type=int), 1), 50)
+    resumes, next_cursor = keyset_page(query, Resume, request.args.get("cursor"), limit)
+    return jsonify({
+        "results": [
+            {"id": r.id, "name": r.name, "created_at": r.created_at.isoformat()}
+            for r in resumes
+        ],
+        "next_cursor": next_cursor,
+    })
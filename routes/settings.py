@@ -1,10 +1,19 @@
-from flask import Blueprint, render_template, request, redirect, url_for, session, flash
+from flask import Blueprint, render_template, request, redirect, url_for, session, flash, jsonify
 from models import User
 from extensions import db
-import ollama
+from services import analyzer
+from AI.registry import registry
+from AI.prompts import usage
+from utils.fetcher import fetcher
 
 settings_bp = Blueprint('settings', __name__)
 
+@settings_bp.before_app_request
+def warm_models():
+    # Keeps the model every analyzer call runs on loaded; the registry throttles repeat calls
+    if "user_id" in session:
+        registry.warm(analyzer.model_name)
+
 @settings_bp.route("/settings", methods=["GET", "POST"])
 def settings():
     if "user_id" not in session:
@@ -12,14 +21,8 @@ def settings():
 
     user = User.query.get(session["user_id"])
     
-    # Fetch available models from Ollama
-    try:
-        models_info = ollama.list()
-        # Extract model names. The structure of models_info might vary, usually it's {'models': [{'name': '...'}, ...]}
-        available_models = [m['name'] for m in models_info.get('models', [])]
-    except Exception as e:
-        available_models = ["gpt-oss:120b-cloud", "llama3", "mistral"] # Fallback
-        print(f"Error fetching models: {e}")
+    # Cached model list, refreshed in the background
+    available_models = registry.available_models()
 
     if request.method == "POST":
         action = request.form.get("action")
@@ -49,4 +52,24 @@ def settings():
 
         return redirect(url_for("settings.settings"))
 
-    return render_template("settings.html", user=user, available_models=available_models)
+    return render_template("settings.html", user=user, available_models=available_models,
+                           model_state=registry.load_state(user.selected_model))
+
+@settings_bp.route("/api/cache/stats")
+def cache_stats():
+    if "user_id" not in session:
+        return jsonify({"error": "Unauthorized"}), 401
+
+    return jsonify({
+        "pdf_text": analyzer.text_cache.stats(),
+        "llm_responses": analyzer.response_cache.stats(),
+        "prompt_tokens": usage.stats(),
+        "http": fetcher.stats(),
+    })
+
+@settings_bp.route("/api/models")
+def models_status():
+    if "user_id" not in session:
+        return jsonify({"error": "Unauthorized"}), 401
+
+    return jsonify(registry.status())
@@ -0,0 +1,43 @@
+from flask import Blueprint, request, session, jsonify, url_for
+from utils.tasks import TASK_HANDLERS, TaskError, enqueue_task, get_task, task_payload
+
+tasks_bp = Blueprint('tasks', __name__)
+
+def task_response(task, result_url=None):
+    """202 with what a client needs to follow a queued task."""
+    body = {
+        "task_id": task.id,
+        "status": task.status,
+        "status_url": url_for("tasks.api_task_status", task_id=task.id),
+    }
+    if result_url:
+        body["result_url"] = result_url
+    return jsonify(body), 202
+
+@tasks_bp.route("/api/tasks/<kind>", methods=["POST"])
+def api_enqueue_task(kind):
+    if "user_id" not in session:
+        return jsonify({"error": "Unauthorized"}), 401
+
+    if kind not in TASK_HANDLERS:
+        return jsonify({"error": f"Unknown task type '{kind}'"}), 404
+
+    # Accept the tool forms as-is as well as JSON bodies
+    data = request.get_json(silent=True) or request.form
+    try:
+        payload = task_payload(kind, data, session["user_id"])
+    except TaskError as e:
+        return jsonify({"error": str(e)}), 400
+
+    task = enqueue_task(session["user_id"], kind, payload)
+    return task_response(task)
+
+@tasks_bp.route("/api/tasks/<int:task_id>")
+def api_task_status(task_id):
+    if "user_id" not in session:
+        return jsonify({"error": "Unauthorized"}), 401
+
+    task = get_task(task_id, session["user_id"])
+    if task is None:
+        return jsonify({"error": "Task not found"}), 404
+    return jsonify(task.to_dict())
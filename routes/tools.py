@@ -1,64 +1,99 @@
-from flask import Blueprint, render_template, request, redirect, url_for, session, flash
-from models import Job, Resume
+from flask import Blueprint, render_template, request, redirect, url_for, session, flash, current_app, jsonify, Response
+from models import Job, Resume, ApplicationKit
 from services import analyzer
+from utils.ingest import ensure_resume_text
+from utils.pagination import recent_resumes
+from utils.tasks import TaskError, enqueue_task, get_task, task_payload
+from routes.tasks import task_response
+from sqlalchemy.orm import joinedload
 import os
+import json
 from pathlib import Path
 
 tools_bp = Blueprint('tools', __name__)
 
+def _queue(kind, data, endpoint, **values):
+    """
+    Enqueues a tool run and answers right away: 202 with the task id for API clients, otherwise
+    a redirect to the page that renders the task's result once a worker has finished it.
+    Raises TaskError when the input is unusable.
+    """
+    payload = task_payload(kind, data, session["user_id"])
+    task = enqueue_task(session["user_id"], kind, payload)
+    result_url = url_for(endpoint, task_id=task.id, **values)
+    if request.accept_mimetypes.best == "application/json":
+        return task_response(task, result_url)
+    return redirect(result_url)
+
+def _page_task(kind):
+    """
+    The task named by ?task_id= as (task, payload, result); result is set once the task is done
+    and a failed task flashes its error. Returns (None, {}, None) when there is no such task.
+    """
+    task_id = request.args.get("task_id", type=int)
+    task = get_task(task_id, session["user_id"]) if task_id else None
+    if task is None or task.kind != kind:
+        if task_id:
+            flash("That result is no longer available.", "error")
+        return None, {}, None
+    if task.status == "failed":
+        flash(task.error or "The task failed. Please try again.", "error")
+    return task, json.loads(task.payload), task.result_data
+
 @tools_bp.route("/ranking/select", methods=["GET", "POST"])
 def ranking_select():
     if "user_id" not in session:
         return redirect(url_for("auth.login"))
     
     if request.method == "POST":
-        job_id = request.form.get("job_id")
-        resume_ids = request.form.getlist("resume_ids")
-        
-        if not job_id or not resume_ids:
-            flash("Please select a job and at least one candidate.", "error")
+        data = {
+            "job_id": request.form.get("job_id"),
+            "resume_ids": request.form.getlist("resume_ids"),
+            "top_k": request.form.get("top_k"),
+            "mode": "fast" if request.form.get("quick") else "full",
+        }
+        try:
+            return _queue("ranking", data, "tools.ranking_process")
+        except TaskError as e:
+            flash(str(e), "error")
             return redirect(url_for("tools.ranking_select"))
-            
-        return redirect(url_for("tools.ranking_process", job_id=job_id, resume_ids=",".join(resume_ids)))
 
-    # GET: Show Selection Form
-    jobs = Job.query.filter_by(user_id=session["user_id"]).order_by(Job.created_at.desc()).all()
-    resumes = Resume.query.filter_by(user_id=session["user_id"]).order_by(Resume.created_at.desc()).all()
-    return render_template("ranking/select.html", jobs=jobs, resumes=resumes)
+    # GET: Show Selection Form with the most recent jobs and resumes; the rest load through the typeaheads
+    limit = current_app.config["SELECT_RESUMES_LIMIT"]
+    jobs = Job.query.filter_by(user_id=session["user_id"]).order_by(Job.created_at.desc(), Job.id.desc()).limit(limit).all()
+    resumes = recent_resumes(session["user_id"], limit)
+    return render_template("ranking/select.html", jobs=jobs, resumes=resumes, top_k=current_app.config["RANKING_TOP_K"])
 
 @tools_bp.route("/ranking/process")
 def ranking_process():
     if "user_id" not in session:
         return redirect(url_for("auth.login"))
 
-    job_id = request.args.get("job_id")
-    resume_ids_str = request.args.get("resume_ids")
-    
-    if not job_id or not resume_ids_str:
+    # Links with the selection itself (job_id, resume_ids, top_k, mode) queue the ranking first
+    if "task_id" not in request.args:
+        if not request.args.get("job_id") or not request.args.get("resume_ids"):
+            return redirect(url_for("tools.ranking_select"))
+        try:
+            return _queue("ranking", request.args, "tools.ranking_process")
+        except TaskError as e:
+            flash(str(e), "error")
+            return redirect(url_for("tools.ranking_select"))
+
+    task, payload, ranking = _page_task("ranking")
+    if task is None:
         return redirect(url_for("tools.ranking_select"))
-        
-    job = Job.query.get_or_404(job_id)
-    resume_ids = [int(id) for id in resume_ids_str.split(",")]
+    job = Job.query.get_or_404(payload["job_id"])
 
-    resumes = Resume.query.filter(Resume.id.in_(resume_ids)).all()
-    
-    results = []
-    
-    for resume in resumes:
-        try:
-            analysis = analyzer.analyze(resume.resume_file_path, job.description)
-            if analysis:
-                results.append({
-                    "resume": resume,
-                    "score": analysis.get("score", 0),
-                    "summary": analysis.get("summary", "No summary available")
-                })
-        except Exception as e:
-            print(f"Failed to analyze resume {resume.id}: {e}")
-            
-    results.sort(key=lambda x: x["score"], reverse=True)
-    
-    return render_template("ranking/results.html", job=job, results=results)
+    results, failures = [], []
+    if ranking:
+        # The task stores resume ids; the rows are loaded in one query
+        resumes = {
+            r.id: r for r in Resume.query.filter(Resume.id.in_(payload["resume_ids"]), Resume.user_id == session["user_id"])
+        }
+        results = [{**result, "resume": resumes[result["resume"]]} for result in ranking["results"] if result["resume"] in resumes]
+        failures = [{**failure, "resume": resumes[failure["resume"]]} for failure in ranking["failures"] if failure["resume"] in resumes]
+
+    return render_template("ranking/results.html", job=job, task=task, results=results, failures=failures)
 
 @tools_bp.route("/compare/<int:resume_id>", methods=["GET", "POST"])
 def compare_resume(resume_id: int):
@@ -71,6 +106,29 @@ def compare_resume(resume_id: int):
         flash("You are not allowed to view this resume.", "error")
         return redirect(url_for("dashboard.dashboard"))
 
+    task = None
+    job_description_html = ""
+    analysis_results = None
+
+    if request.method == "POST":
+        # Quick and full analyses both run as background tasks
+        data = {**request.form.to_dict(), "resume_id": resume.id}
+        try:
+            return _queue("analyze", data, "tools.compare_resume", resume_id=resume.id)
+        except TaskError as e:
+            flash(str(e), "error")
+        job_description_html = request.form.get("job_description", "")
+    elif "task_id" in request.args:
+        task, payload, analysis_results = _page_task("analyze")
+        job_description_html = payload.get("job_description", "")
+    else:
+        # Coming from a ranking: preload the job and show the instant local score (no model call)
+        job_id = request.args.get("job_id", type=int)
+        job = Job.query.get(job_id) if job_id else None
+        if job and job.user_id == session["user_id"]:
+            job_description_html = job.description
+            analysis_results = analyzer.analyze(ensure_resume_text(resume), job_description_html, mode="fast")
+
     can_preview_pdf = False
     viewer_url = None
     if os.path.exists(resume.resume_file_path):
@@ -79,183 +137,169 @@ def compare_resume(resume_id: int):
             can_preview_pdf = True
             viewer_url = url_for("resumes.view_resume_inline", resume_id=resume.id)
 
-    job_description_html = ""
-    analysis_results = None
-
-    if request.method == "POST":
-        job_description_html = request.form.get("job_description", "")
-        
-        # Real AI Analysis
-        if job_description_html.replace("<p>", "").replace("</p>", "").strip():
-            try:
-                analysis_results = analyzer.analyze(resume.resume_file_path, job_description_html)
-                if not analysis_results:
-                     flash("Analysis failed. Please try again.", "error")
-            except Exception as e:
-                flash(f"An error occurred during analysis: {e}", "error")
-        else:
-            flash("Please enter a job description.", "error")
-
-    # Fetch Saved Jobs for Sidebar/Dropdown
-    saved_jobs = Job.query.filter_by(user_id=session["user_id"]).order_by(Job.created_at.desc()).all()
-
     return render_template(
         "compare.html",
         resume=resume,
+        task=task,
         can_preview_pdf=can_preview_pdf,
         viewer_url=viewer_url,
         job_description_html=job_description_html,
-        analysis_results=analysis_results,
-        jobs=saved_jobs
+        analysis_results=analysis_results
     )
 
-@tools_bp.route("/cover-letter", methods=["GET", "POST"])
-def cover_letter():
+def _resume_tool(kind, template, result_name):
+    """
+    The resume + job description tools: a POST queues the generation, and the page named by
+    ?task_id= shows it running and then renders its result.
+    """
     if "user_id" not in session:
         return redirect(url_for("auth.login"))
-        
+
     user_id = session["user_id"]
-    resumes = Resume.query.filter_by(user_id=user_id).all()
-    jobs = Job.query.filter_by(user_id=user_id).all()
-    
-    generated_letter = None
-    selected_resume_id = None
-    job_description = ""
-    
+    task = None
+    result = None
+
     if request.method == "POST":
-        resume_id = request.form.get("resume_id")
-        job_description = request.form.get("job_description")
-        
-        if resume_id and job_description:
-            selected_resume_id = int(resume_id)
-            resume = Resume.query.get(resume_id)
-            if resume and resume.user_id == user_id:
-                # Generate Cover Letter
-                generated_letter = analyzer.generate_cover_letter(resume.resume_file_path, job_description)
-                if not generated_letter:
-                    flash("Failed to generate cover letter. Please try again.", "error")
-            else:
-                flash("Invalid resume selected.", "error")
-        else:
-            flash("Please select a resume and provide a job description.", "error")
-            
-    return render_template("tools/cover_letter.html", resumes=resumes, jobs=jobs, generated_letter=generated_letter, selected_resume_id=selected_resume_id, job_description=job_description)
+        try:
+            return _queue(kind, request.form, request.endpoint)
+        except TaskError as e:
+            flash(str(e), "error")
+        payload = request.form.to_dict()
+    else:
+        task, payload, result = _page_task(kind)
+
+    selected_resume_id = int(payload["resume_id"]) if str(payload.get("resume_id") or "").isdigit() else None
+    # Saved jobs load lazily through /api/jobs/typeahead
+    resumes = recent_resumes(user_id, current_app.config["SELECT_RESUMES_LIMIT"], include_id=selected_resume_id)
+    return render_template(
+        template,
+        resumes=resumes,
+        task=task,
+        selected_resume_id=selected_resume_id,
+        job_description=payload.get("job_description") or "",
+        **{result_name: result},
+    )
+
+@tools_bp.route("/cover-letter", methods=["GET", "POST"])
+def cover_letter():
+    return _resume_tool("cover_letter", "tools/cover_letter.html", "generated_letter")
 
 @tools_bp.route("/interview-prep", methods=["GET", "POST"])
 def interview_prep():
-    if "user_id" not in session:
-        return redirect(url_for("auth.login"))
-        
-    user_id = session["user_id"]
-    resumes = Resume.query.filter_by(user_id=user_id).all()
-    jobs = Job.query.filter_by(user_id=user_id).all()
-    
-    prep_material = None
-    selected_resume_id = None
-    job_description = ""
-    
-    if request.method == "POST":
-        resume_id = request.form.get("resume_id")
-        job_description = request.form.get("job_description")
-        
-        if resume_id and job_description:
-            selected_resume_id = int(resume_id)
-            resume = Resume.query.get(resume_id)
-            if resume and resume.user_id == user_id:
-                # Generate Interview Prep
-                prep_material = analyzer.generate_interview_prep(resume.resume_file_path, job_description)
-                if not prep_material:
-                    flash("Failed to generate interview prep material. Please try again.", "error")
-            else:
-                flash("Invalid resume selected.", "error")
-        else:
-            flash("Please select a resume and provide a job description.", "error")
-            
-    return render_template("tools/interview_prep.html", resumes=resumes, jobs=jobs, prep_material=prep_material, selected_resume_id=selected_resume_id, job_description=job_description)
+    return _resume_tool("interview_prep", "tools/interview_prep.html", "prep_material")
 
 @tools_bp.route("/networking", methods=["GET", "POST"])
 def networking():
-    if "user_id" not in session:
-        return redirect(url_for("auth.login"))
-        
-    user_id = session["user_id"]
-    resumes = Resume.query.filter_by(user_id=user_id).all()
-    jobs = Job.query.filter_by(user_id=user_id).all()
-    
-    generated_content = None
-    selected_resume_id = None
-    job_description = ""
-    
-    if request.method == "POST":
-        resume_id = request.form.get("resume_id")
-        job_description = request.form.get("job_description")
-        
-        if resume_id and job_description:
-            selected_resume_id = int(resume_id)
-            resume = Resume.query.get(resume_id)
-            if resume and resume.user_id == user_id:
-                # Generate Networking Messages
-                generated_content = analyzer.generate_networking_messages(resume.resume_file_path, job_description)
-                if not generated_content:
-                    flash("Failed to generate networking messages. Please try again.", "error")
-            else:
-                flash("Invalid resume selected.", "error")
-        else:
-            flash("Please select a resume and provide a job description.", "error")
-            
-    return render_template("tools/networking.html", resumes=resumes, jobs=jobs, generated_content=generated_content, selected_resume_id=selected_resume_id, job_description=job_description)
+    return _resume_tool("networking", "tools/networking.html", "generated_content")
 
 @tools_bp.route("/linkedin", methods=["GET", "POST"])
 def linkedin():
-    if "user_id" not in session:
-        return redirect(url_for("auth.login"))
-        
-    user_id = session["user_id"]
-    resumes = Resume.query.filter_by(user_id=user_id).all()
-    jobs = Job.query.filter_by(user_id=user_id).all()
-    
-    generated_content = None
-    selected_resume_id = None
-    job_description = ""
-    
-    if request.method == "POST":
-        resume_id = request.form.get("resume_id")
-        job_description = request.form.get("job_description")
-        
-        if resume_id and job_description:
-            selected_resume_id = int(resume_id)
-            resume = Resume.query.get(resume_id)
-            if resume and resume.user_id == user_id:
-                # Generate LinkedIn Optimization
-                generated_content = analyzer.optimize_linkedin(resume.resume_file_path, job_description)
-                if not generated_content:
-                    flash("Failed to generate LinkedIn optimization. Please try again.", "error")
-            else:
-                flash("Invalid resume selected.", "error")
-        else:
-            flash("Please select a resume and provide a job description.", "error")
-            
-    return render_template("tools/linkedin.html", resumes=resumes, jobs=jobs, generated_content=generated_content, selected_resume_id=selected_resume_id, job_description=job_description)
+    return _resume_tool("linkedin", "tools/linkedin.html", "generated_content")
 
 @tools_bp.route("/negotiation", methods=["GET", "POST"])
 def negotiation():
     if "user_id" not in session:
         return redirect(url_for("auth.login"))
-        
+
+    task = None
     generated_content = None
-    job_title = ""
-    offer_details = ""
-    
+
     if request.method == "POST":
-        job_title = request.form.get("job_title")
-        offer_details = request.form.get("offer_details")
-        
-        if job_title:
-            # Generate Negotiation Scripts
-            generated_content = analyzer.generate_negotiation_scripts(job_title, offer_details)
-            if not generated_content:
-                flash("Failed to generate negotiation scripts. Please try again.", "error")
-        else:
-            flash("Please enter a job title.", "error")
-            
-    return render_template("tools/negotiation.html", generated_content=generated_content, job_title=job_title, offer_details=offer_details)
+        try:
+            return _queue("negotiation", request.form, "tools.negotiation")
+        except TaskError as e:
+            flash(str(e), "error")
+        payload = request.form.to_dict()
+    else:
+        task, payload, generated_content = _page_task("negotiation")
+
+    return render_template(
+        "tools/negotiation.html",
+        task=task,
+        generated_content=generated_content,
+        job_title=payload.get("job_title") or "",
+        offer_details=payload.get("offer_details") or "",
+    )
+
+@tools_bp.route("/application-kit", methods=["POST"])
+def application_kit():
+    if "user_id" not in session:
+        return redirect(url_for("auth.login"))
+
+    # All four artifacts come from a single generation; the job page follows it and opens the kit
+    job_id = request.form.get("job_id", type=int)
+    try:
+        return _queue("application_kit", request.form, "jobs.jobs_detail", job_id=job_id)
+    except TaskError as e:
+        flash(str(e), "error")
+    if job_id:
+        return redirect(url_for("jobs.jobs_detail", job_id=job_id))
+    return redirect(url_for("jobs.jobs_list"))
+
+@tools_bp.route("/application-kit/<int:kit_id>")
+def application_kit_view(kit_id):
+    if "user_id" not in session:
+        return redirect(url_for("auth.login"))
+
+    kit = ApplicationKit.query.options(
+        joinedload(ApplicationKit.job), joinedload(ApplicationKit.resume)
+    ).get_or_404(kit_id)
+    if kit.user_id != session["user_id"]:
+        flash("Access denied.", "error")
+        return redirect(url_for("jobs.jobs_list"))
+
+    sections = kit.sections()
+    return render_template(
+        "tools/application_kit.html",
+        kit=kit,
+        job=kit.job,
+        resume=kit.resume,
+        generated_letter=sections["cover_letter"],
+        prep_material=sections["interview_prep"],
+        networking_content=sections["networking"],
+        linkedin_content=sections["linkedin"],
+    )
+
+def _sse(event, data):
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+def _stream_tool(tool):
+    """Runs a generation tool as a Server-Sent Events stream of tokens or completed JSON fields."""
+    if "user_id" not in session:
+        return jsonify({"error": "Unauthorized"}), 401
+
+    resume_id = request.form.get("resume_id")
+    job_description = request.form.get("job_description")
+    regenerate = request.form.get("regenerate") == "1"
+
+    resume = Resume.query.get(resume_id) if resume_id else None
+    if not resume or resume.user_id != session["user_id"] or not job_description:
+        return jsonify({"error": "Please select a resume and provide a job description."}), 400
+
+    # Resolve everything that needs the database before the response starts streaming
+    resume_text = ensure_resume_text(resume)
+
+    def generate():
+        for event, payload in analyzer.stream_tool(tool, resume_text, job_description, regenerate=regenerate):
+            yield _sse(event, payload)
+
+    return Response(generate(), mimetype="text/event-stream", headers={
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no",
+    })
+
+@tools_bp.route("/cover-letter/stream", methods=["POST"])
+def cover_letter_stream():
+    return _stream_tool("cover_letter")
+
+@tools_bp.route("/interview-prep/stream", methods=["POST"])
+def interview_prep_stream():
+    return _stream_tool("interview_prep")
+
+@tools_bp.route("/networking/stream", methods=["POST"])
+def networking_stream():
+    return _stream_tool("networking")
+
+@tools_bp.route("/linkedin/stream", methods=["POST"])
+def linkedin_stream():
+    return _stream_tool("linkedin")
@@ -0,0 +1,33 @@
+import os
+import tempfile
+
+import pytest
+
+# The app reads its configuration at import time: an in-memory database, no task workers,
+# and caches, uploads and indexes kept out of the working tree
+_tmp = tempfile.mkdtemp(prefix="careerpilot-tests-")
+os.environ["DATABASE_URL"] = "sqlite://"
+os.environ["TASK_MAX_WORKERS"] = "0"
+os.environ["CACHE_DIR"] = os.path.join(_tmp, "cache")
+os.environ["UPLOAD_FOLDER"] = os.path.join(_tmp, "uploads")
+os.environ["INDEX_FOLDER"] = os.path.join(_tmp, "index")
+os.environ.setdefault("OLLAMA_HOST", "http://127.0.0.1:9")
+
+from main import app as flask_app  # noqa: E402
+from extensions import db  # noqa: E402
+
+
+@pytest.fixture
+def app():
+    flask_app.config.update(TESTING=True, QUERY_BUDGET_STRICT=False)
+    with flask_app.app_context():
+        db.create_all()
+    # No context is held open during the test, so each request gets its own session
+    yield flask_app
+    with flask_app.app_context():
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
@@ -0,0 +1,34 @@
+"""A batch that fails to save is reported per URL and the import still finishes."""
+from extensions import db
+from models import Job, User
+from utils import bulk_import
+
+
+def test_failed_batch_is_reported_and_import_continues(app, monkeypatch):
+    def extracted(urls, analyzer, settings):
+        for url in urls:
+            yield "job", url, {"title": "Engineer", "description": f"<p>Build things at {url}.</p>"}
+
+    monkeypatch.setattr(bulk_import, "extract_jobs", extracted)
+    with app.app_context():
+        user = User(
+            username="dave", email="dave@example.com", phone="555-0103", address="4 Main St",
+            city="Springfield", state="IL", zip_code="62701", country="US", role="user", status="active",
+        )
+        user.set_password("password123")
+        db.session.add(user)
+        db.session.commit()
+        user_id = user.id
+
+        def broken_commit():
+            raise RuntimeError("database is locked")
+
+        monkeypatch.setattr(db.session, "commit", broken_commit)
+        urls = ["https://jobs.example.com/1", "https://jobs.example.com/2"]
+        events = list(bulk_import.import_jobs(user_id, urls, analyzer=None))
+
+        assert [event for event, _ in events] == ["error", "error", "done"]
+        assert [payload["url"] for _, payload in events[:2]] == urls
+        assert events[-1][1]["created"] == 0 and events[-1][1]["failed"] == 2
+        monkeypatch.undo()
+        assert Job.query.filter_by(user_id=user_id).count() == 0
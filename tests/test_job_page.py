@@ -0,0 +1,29 @@
+import json
+
+from utils.job_page import parse_job_page
+
+
+def page(posting):
+    return (
+        "<html><head><title>Page title</title>"
+        f'<script type="application/ld+json">{json.dumps(posting)}</script>'
+        "</head><body><main>Too short to use.</main></body></html>"
+    )
+
+
+def test_json_ld_description_list_is_joined():
+    result = parse_job_page(page({"@type": "JobPosting", "title": "Engineer", "description": ["<p>One</p>", "<p>Two</p>"]}))
+    assert result["source"] == "json-ld"
+    assert result["title"] == "Engineer"
+    assert result["description"] == "<p>One</p><p>Two</p>"
+
+
+def test_json_ld_non_text_fields_fall_through():
+    for posting in (
+        {"@type": "JobPosting", "title": "Engineer", "description": {"text": "Build things"}},
+        {"@type": "JobPosting", "title": {"name": "Engineer"}, "description": "Build things"},
+        {"@type": "JobPosting", "title": "Engineer", "description": [1, 2]},
+    ):
+        result = parse_job_page(page(posting))
+        assert "source" not in result
+        assert result["title"] == "Page title"
@@ -0,0 +1,36 @@
+"""A description the user typed must never be found by another user looking up the job's URL."""
+from extensions import db
+from models import Job, User
+from utils.postings import attach_posting, find_posting, get_or_create_posting
+
+URL = "https://jobs.example.com/42?utm_source=mail"
+
+
+def _user():
+    user = User(
+        username="carol", email="carol@example.com", phone="555-0102", address="3 Main St",
+        city="Springfield", state="IL", zip_code="62701", country="US", role="user", status="active",
+    )
+    user.set_password("password123")
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+
+def test_manual_posting_is_not_keyed_by_url(app):
+    with app.app_context():
+        job = Job(title="Engineer", company="Acme", description="<p>My private notes.</p>", job_url=URL, user_id=_user().id)
+        attach_posting(job)
+        db.session.add(job)
+        db.session.commit()
+
+        assert job.posting.canonical_url is None
+        assert find_posting(URL) is None
+
+
+def test_fetched_posting_is_keyed_by_url(app):
+    with app.app_context():
+        posting = get_or_create_posting("<p>Build things.</p>", url=URL, source="extracted")
+        db.session.commit()
+
+        assert find_posting("https://jobs.example.com/42").id == posting.id
@@ -0,0 +1,99 @@
+"""
+Pins the number of SQL statements the main views run. The seeded user has several jobs,
+resumes and kits, so a lazy load per row (an N+1) changes these counts and fails the test.
+"""
+import pytest
+
+from extensions import db
+from models import ApplicationKit, Job, Resume, User
+from utils.postings import attach_posting
+from utils.stats import rebuild_user_stats
+
+JOBS = 6
+RESUMES = 4
+KIT = {
+    "cover_letter": "Dear hiring manager,",
+    "interview_prep": {
+        "technical_questions": [{"question": "Why Python?", "ideal_answer_points": "Experience"}],
+        "behavioral_questions": [{"question": "A hard bug?", "star_answer_guide": "Situation first"}],
+        "questions_to_ask_interviewer": ["What does the team ship?"],
+    },
+    "networking": {
+        "cold_email_hiring_manager": {"subject": "Hello", "body": "I applied."},
+        "linkedin_connection_request": "Let's connect.",
+        "informational_interview_request": "Could we talk?",
+    },
+    "linkedin": {
+        "headline": "Engineer",
+        "about_section": "I build things.",
+        "key_skills_to_pin": ["Python"],
+        "experience_enhancements": ["Shipped things"],
+    },
+}
+
+
+@pytest.fixture
+def seeded(app, client):
+    with app.app_context():
+        ids = _seed()
+    with client.session_transaction() as session:
+        session["user_id"] = ids["user"]
+        session["username"] = "alice"
+    return ids
+
+
+def _seed():
+    user = User(
+        username="alice", email="alice@example.com", phone="555-0100", address="1 Main St",
+        city="Springfield", state="IL", zip_code="62701", country="US", role="user", status="active",
+    )
+    user.set_password("password123")
+    db.session.add(user)
+    db.session.commit()
+
+    resumes = [Resume(f"resume-{i}", f"Resume text {i}", f"/nonexistent/resume-{i}.pdf", user.id) for i in range(RESUMES)]
+    db.session.add_all(resumes)
+    db.session.commit()
+
+    jobs = []
+    for i in range(JOBS):
+        job = Job(
+            title=f"Engineer {i}", company=f"Company {i}", description=f"<p>Build things, variant {i}.</p>",
+            job_url=f"https://jobs.example.com/{i}", status="Applied" if i % 2 else "Saved",
+            resume_id=resumes[i % RESUMES].id, user_id=user.id,
+        )
+        attach_posting(job)
+        db.session.add(job)
+        jobs.append(job)
+    db.session.commit()
+
+    kits = []
+    for job in jobs[:3]:
+        for resume in resumes[:2]:
+            kits.append(ApplicationKit.from_generated(KIT, user.id, job_id=job.id, resume_id=resume.id, model_name="test"))
+    db.session.add_all(kits)
+    db.session.commit()
+    rebuild_user_stats(user.id)
+    return {"user": user.id, "job": jobs[0].id, "kit": kits[0].id}
+
+
+def query_count(client, path):
+    response = client.get(path)
+    assert response.status_code == 200, path
+    return int(response.headers["X-Query-Count"])
+
+
+def test_jobs_list_query_count(client, seeded):
+    assert query_count(client, "/jobs") == 1
+
+
+def test_jobs_detail_query_count(client, seeded):
+    assert query_count(client, f"/jobs/{seeded['job']}") == 3
+
+
+def test_dashboard_query_count(client, seeded):
+    assert query_count(client, "/dashboard") == 3
+
+
+def test_application_kit_query_count(client, seeded):
+    assert query_count(client, f"/application-kit/{seeded['kit']}") == 1
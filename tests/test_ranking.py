@@ -0,0 +1,55 @@
+import threading
+import time
+from types import SimpleNamespace
+
+from utils.ranking import score_resumes
+
+
+class FakeAnalyzer:
+    """Records how many analyses run at once; resume text "fail" raises like a dropped connection."""
+
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.running = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def analyze(self, resume_text, job_description, raise_errors=False):
+        with self.lock:
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+        try:
+            time.sleep(self.delay)
+            if resume_text == "fail":
+                raise ConnectionError("model server unreachable")
+            return {"score": 80, "summary": "Strong Fit"}
+        finally:
+            with self.lock:
+                self.running -= 1
+
+
+def candidates(texts, start=1):
+    return [(SimpleNamespace(id=start + i), text) for i, text in enumerate(texts)]
+
+
+def test_model_errors_are_failures_not_zero_scores():
+    results, failures = score_resumes(FakeAnalyzer(delay=0), "Engineer", candidates(["ok", "fail", None]))
+    assert [r["resume"].id for r in results] == [1]
+    assert [(f["resume"].id, f["error"]) for f in failures] == [
+        (2, "model server unreachable"),
+        (3, "No text could be extracted from this resume."),
+    ]
+
+
+def test_parallel_calls_are_limited_across_rankings():
+    analyzer = FakeAnalyzer()
+    rankings = [
+        threading.Thread(target=score_resumes, args=(analyzer, "Engineer", candidates(["ok"] * 8, start)),
+                         kwargs={"max_workers": 4})
+        for start in (1, 100)
+    ]
+    for ranking in rankings:
+        ranking.start()
+    for ranking in rankings:
+        ranking.join()
+    assert analyzer.peak <= 4
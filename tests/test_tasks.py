@@ -0,0 +1,81 @@
+"""
+Tool pages queue their work and render the stored task result; the model is only called by
+the task worker. Tests run with TASK_MAX_WORKERS=0, so tasks are run here with run_task.
+"""
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from extensions import db
+from models import Resume, Task, User
+from services import analyzer
+from utils.tasks import run_task
+
+
+@pytest.fixture
+def user_resume(app, client):
+    with app.app_context():
+        user = User(
+            username="bob", email="bob@example.com", phone="555-0101", address="2 Main St",
+            city="Springfield", state="IL", zip_code="62701", country="US", role="user", status="active",
+        )
+        user.set_password("password123")
+        db.session.add(user)
+        db.session.commit()
+        resume = Resume("bob-resume", "Python engineer, ten years", "/nonexistent/bob.pdf", user.id)
+        resume.text_status = "ready"
+        db.session.add(resume)
+        db.session.commit()
+        ids = user.id, resume.id
+    with client.session_transaction() as session:
+        session["user_id"] = ids[0]
+        session["username"] = "bob"
+    return ids[1]
+
+
+def task_id(response):
+    assert response.status_code == 302
+    return int(parse_qs(urlsplit(response.headers["Location"]).query)["task_id"][0])
+
+
+def run(app, task_id):
+    with app.app_context():
+        run_task(task_id)
+        task = db.session.get(Task, task_id)
+        return task.status, task.error
+
+
+def test_cover_letter_renders_task_result_without_calling_model(app, client, user_resume, monkeypatch):
+    calls = []
+    monkeypatch.setattr(analyzer, "generate_cover_letter", lambda *args, **kwargs: calls.append(1) or "Dear team, hire me.")
+
+    response = client.post("/cover-letter", data={"resume_id": user_resume, "job_description": "<p>Python role</p>"})
+    queued = task_id(response)
+    assert calls == []
+    assert "Working on it" in client.get(response.headers["Location"]).get_data(as_text=True)
+
+    assert run(app, queued) == ("done", None)
+    page = client.get(response.headers["Location"]).get_data(as_text=True)
+    assert "Dear team, hire me." in page
+    assert calls == [1]
+
+
+def test_api_clients_get_the_task_id(client, user_resume):
+    response = client.post("/cover-letter", data={"resume_id": user_resume, "job_description": "<p>Python role</p>"},
+                           headers={"Accept": "application/json"})
+    assert response.status_code == 202
+    body = response.get_json()
+    assert body["status"] == "queued"
+    assert f"task_id={body['task_id']}" in body["result_url"]
+
+
+def test_failed_analysis_is_a_failed_task(app, client, user_resume, monkeypatch):
+    def unreachable(*args, **kwargs):
+        raise ConnectionError("model server unreachable")
+    monkeypatch.setattr(analyzer, "chat_json", unreachable)
+
+    response = client.post(f"/compare/{user_resume}", data={"job_description": "<p>Python role</p>", "mode": "full"})
+    status, error = run(app, task_id(response))
+    assert status == "failed"
+    assert "model server unreachable" in error
+    assert "model server unreachable" in client.get(response.headers["Location"]).get_data(as_text=True)
@@ -0,0 +1,18 @@
+from extensions import db
+from models import ApplicationKit
+from services import analyzer
+from utils.ingest import ensure_resume_text
+
+
+def create_application_kit(user_id, resume, job, regenerate=False):
+    """
+    Generates the full application kit for a resume and saved job in one model call and
+    stores it. Returns the ApplicationKit row, or None if generation failed.
+    """
+    kit = analyzer.generate_application_kit(ensure_resume_text(resume), job.description, regenerate=regenerate)
+    if not kit:
+        return None
+    row = ApplicationKit.from_generated(kit, user_id, job_id=job.id, resume_id=resume.id, model_name=analyzer.model_name)
+    db.session.add(row)
+    db.session.commit()
+    return row
@@ -0,0 +1,278 @@
+import asyncio
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from urllib.parse import urlsplit
+
+import httpx
+from flask import current_app
+
+from extensions import db
+from models import Job, JobPosting
+from utils.postings import attach_posting, canonical_url
+from utils.fetcher import FETCH_CONNECT_TIMEOUT, FETCH_READ_TIMEOUT, FETCH_USER_AGENT, decode_body, fetcher
+from utils.scraper import extract_job_info
+from utils.search_index import index_job
+
+logger = logging.getLogger(__name__)
+
+
+class BulkImportError(Exception):
+    """Raised for a URL that cannot be imported; the message is shown to the user."""
+
+
+class DomainLimiter:
+    """Per-host rate limit: at most `concurrency` requests in flight and one request start every `interval` seconds."""
+
+    def __init__(self, concurrency, interval):
+        self.concurrency = concurrency
+        self.interval = interval
+        self._semaphores = {}
+        self._next_start = {}
+
+    @asynccontextmanager
+    async def slot(self, host):
+        semaphore = self._semaphores.setdefault(host, asyncio.Semaphore(self.concurrency))
+        async with semaphore:
+            now = asyncio.get_running_loop().time()
+            start = max(now, self._next_start.get(host, now))
+            self._next_start[host] = start + self.interval
+            if start > now:
+                await asyncio.sleep(start - now)
+            yield
+
+
+def clean_import_urls(urls):
+    """Strips, de-duplicates (keeping order) and keeps only http(s) URLs that fit Job.job_url."""
+    cleaned = []
+    seen = set()
+    for url in urls:
+        url = (url or "").strip()
+        parts = urlsplit(url)
+        if parts.scheme in ("http", "https") and parts.netloc and len(url) <= 500 and url not in seen:
+            seen.add(url)
+            cleaned.append(url)
+    return cleaned
+
+
+async def _fetch(client, url, limiter, global_slots, retries):
+    """
+    Fetches a page through the shared HTTP cache: fresh pages skip the network, stale ones are
+    revalidated. The cache reads and writes files, so it runs in the loop's default executor.
+    """
+    loop = asyncio.get_running_loop()
+    text, headers = await loop.run_in_executor(None, fetcher.cached, url)
+    if text is not None:
+        return text
+
+    for attempt in range(retries + 1):
+        async with limiter.slot(urlsplit(url).netloc), global_slots:
+            async with client.stream("GET", url, headers=headers) as response:
+                if response.status_code == 304 and headers:
+                    return await loop.run_in_executor(None, fetcher.revalidated_text, url, response.headers)
+                if response.status_code in (429, 500, 502, 503, 504) and attempt < retries:
+                    retry = True
+                else:
+                    retry = False
+                    response.raise_for_status()
+                    chunks = []
+                    size = 0
+                    async for chunk in response.aiter_bytes():
+                        chunks.append(chunk)
+                        size += len(chunk)
+                        if size >= fetcher.max_bytes:
+                            break
+                    text = decode_body(b"".join(chunks)[:fetcher.max_bytes], response.headers.get("Content-Type"))
+        if not retry:
+            await loop.run_in_executor(None, fetcher.remember, url, response.headers, text)
+            return text
+        await asyncio.sleep(0.5 * 2 ** attempt)
+
+
+async def _import(urls, events, cancelled, analyzer, pool, settings):
+    loop = asyncio.get_running_loop()
+    limiter = DomainLimiter(settings["per_domain"], settings["domain_interval"])
+    global_slots = asyncio.Semaphore(settings["concurrency"])
+    async with httpx.AsyncClient(
+        timeout=httpx.Timeout(FETCH_READ_TIMEOUT, connect=FETCH_CONNECT_TIMEOUT),
+        limits=httpx.Limits(max_connections=settings["concurrency"]),
+        headers={"User-Agent": FETCH_USER_AGENT},
+        follow_redirects=True,
+    ) as client:
+
+        async def run(url):
+            if cancelled.is_set():
+                return
+            try:
+                page = await _fetch(client, url, limiter, global_slots, fetcher.retries)
+                if not page:
+                    raise BulkImportError("Failed to fetch this page.")
+                # Parsing is CPU work and the model fallback blocks, so both run in the bounded pool
+                info = await loop.run_in_executor(pool, extract_job_info, page, analyzer)
+                if not info or not info.get("title"):
+                    raise BulkImportError("Could not find a job posting on this page.")
+                events.put(("job", url, info))
+            except BulkImportError as e:
+                events.put(("error", url, str(e)))
+            except httpx.HTTPStatusError as e:
+                events.put(("error", url, f"The site returned HTTP {e.response.status_code}."))
+            except httpx.HTTPError as e:
+                events.put(("error", url, f"Failed to fetch this page ({type(e).__name__})."))
+            except Exception as e:
+                logger.error(f"Error importing {url}: {e}")
+                events.put(("error", url, "An error occurred while importing this page."))
+
+        await asyncio.gather(*(run(url) for url in urls))
+
+
+def extract_jobs(urls, analyzer, settings, idle_timeout=1.0):
+    """
+    Fetches and extracts urls concurrently on a background event loop and yields
+    ("job", url, info) or ("error", url, message) as each finishes, plus None whenever
+    idle_timeout passes without a result. Closing the generator stops URLs not yet started.
+    """
+    events = queue.Queue()
+    cancelled = threading.Event()
+
+    def run():
+        try:
+            with ThreadPoolExecutor(max_workers=settings["extract_workers"], thread_name_prefix="bulk-extract") as pool:
+                asyncio.run(_import(urls, events, cancelled, analyzer, pool, settings))
+        except Exception as e:
+            logger.error(f"Bulk import failed: {e}")
+        finally:
+            events.put(None)
+
+    threading.Thread(target=run, name="bulk-import", daemon=True).start()
+    try:
+        while True:
+            try:
+                event = events.get(timeout=idle_timeout)
+            except queue.Empty:
+                yield None
+                continue
+            if event is None:
+                return
+            yield event
+    finally:
+        cancelled.set()
+
+
+def _clip(value, length):
+    value = (value or "").strip()
+    return value[:length] or None
+
+
+def _new_job(user_id, url, fields):
+    return Job(
+        title=_clip(fields["title"], 150) or "Untitled Job",
+        company=_clip(fields.get("company"), 150),
+        location=_clip(fields.get("location"), 100),
+        salary_range=_clip(fields.get("salary_range"), 100),
+        job_url=url,
+        status="Saved",
+        user_id=user_id,
+    )
+
+
+def import_jobs(user_id, urls, analyzer):
+    """
+    Imports job postings from urls for a user, yielding (event, payload) progress pairs:
+    "skipped" for URLs already saved, "error" per failed URL, "job" per saved Job and a final
+    "done". URLs already in the shared posting store are saved without being fetched. Jobs are
+    added through the ORM (so dashboard counters follow) and committed in batches of
+    BULK_IMPORT_BATCH_SIZE, or sooner when results stop arriving for a moment.
+    """
+    config = current_app.config
+    settings = {
+        "concurrency": config["BULK_IMPORT_CONCURRENCY"],
+        "per_domain": config["BULK_IMPORT_PER_DOMAIN"],
+        "domain_interval": config["BULK_IMPORT_DOMAIN_INTERVAL"],
+        "extract_workers": config["BULK_IMPORT_EXTRACT_WORKERS"],
+    }
+    batch_size = config["BULK_IMPORT_BATCH_SIZE"]
+    started = time.perf_counter()
+
+    saved = {
+        job_url for (job_url,) in db.session.query(Job.job_url).filter(Job.user_id == user_id, Job.job_url.in_(urls))
+    }
+    for url in urls:
+        if url in saved:
+            yield "skipped", {"url": url}
+    urls = [url for url in urls if url not in saved]
+
+    created = 0
+    failed = 0
+    pending = []
+
+    canonical = {url: canonical_url(url) for url in urls}
+    known = {
+        posting.canonical_url: posting
+        for posting in JobPosting.query.filter(JobPosting.canonical_url.in_(set(canonical.values())))
+    }
+    for url in urls:
+        posting = known.get(canonical[url])
+        if posting is not None:
+            job = _new_job(user_id, url, {"title": posting.title or "", **posting.fields()})
+            job.posting = posting
+            db.session.add(job)
+            pending.append(job)
+            created += 1
+    urls = [url for url in urls if canonical[url] not in known]
+
+    def flush():
+        # A batch that fails to save is reported URL by URL and the import goes on with the next one
+        nonlocal created, failed
+        batch_urls = [job.job_url for job in pending]
+        try:
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error saving imported jobs: {e}")
+            created -= len(pending)
+            failed += len(pending)
+            pending.clear()
+            return [("error", {"url": url, "error": "An error occurred while saving this job."}) for url in batch_urls]
+
+        events = [
+            ("job", {"url": job.job_url, "id": job.id, "title": job.title, "company": job.company})
+            for job in pending
+        ]
+        # The jobs are saved; a vector that can't be stored on its posting is only logged
+        try:
+            for job in pending:
+                index_job(job)
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error indexing imported jobs: {e}")
+        pending.clear()
+        return events
+
+    for event in extract_jobs(urls, analyzer, settings):
+        if event is not None:
+            kind, url, payload = event
+            if kind == "error":
+                failed += 1
+                yield "error", {"url": url, "error": payload}
+                continue
+            job = _new_job(user_id, url, payload)
+            job.description = payload.get("description") or ""
+            attach_posting(job, url=url, source=payload.get("source"))
+            db.session.add(job)
+            pending.append(job)
+            created += 1
+        if pending and (len(pending) >= batch_size or event is None):
+            yield from flush()
+    if pending:
+        yield from flush()
+
+    yield "done", {
+        "created": created,
+        "failed": failed,
+        "skipped": len(saved),
+        "seconds": round(time.perf_counter() - started, 2),
+    }
@@ -0,0 +1,53 @@
+import logging
+import sqlite3
+
+from sqlalchemy import event
+
+from extensions import db
+
+logger = logging.getLogger(__name__)
+
+
+def database_uri(url):
+    # Hosting platforms still hand out postgres:// URLs, which SQLAlchemy no longer accepts
+    if url.startswith("postgres://"):
+        url = "postgresql://" + url[len("postgres://"):]
+    return url
+
+
+def engine_options(uri, pool_size, max_overflow, pool_recycle, pool_timeout):
+    """SQLALCHEMY_ENGINE_OPTIONS for uri. Pool sizing only applies to server databases."""
+    options = {"pool_pre_ping": True, "pool_recycle": pool_recycle}
+    if not uri.startswith("sqlite"):
+        options.update(pool_size=pool_size, max_overflow=max_overflow, pool_timeout=pool_timeout)
+    return options
+
+
+def init_sqlite_pragmas(app):
+    """
+    Tunes every new SQLite connection: WAL lets readers run alongside a writer, synchronous=NORMAL
+    skips the per-commit fsync WAL doesn't need, busy_timeout makes a second writer wait for the
+    lock instead of failing with "database is locked", and mmap_size serves reads from the page cache.
+    Other databases are left alone.
+    """
+    pragmas = {
+        "journal_mode": "WAL",
+        "synchronous": app.config["SQLITE_SYNCHRONOUS"],
+        "busy_timeout": app.config["SQLITE_BUSY_TIMEOUT"],
+        "mmap_size": app.config["SQLITE_MMAP_SIZE"],
+    }
+
+    def set_pragmas(dbapi_connection, connection_record):
+        if not isinstance(dbapi_connection, sqlite3.Connection):
+            return
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+    with app.app_context():
+        if db.engine.dialect.name == "sqlite":
+            event.listen(db.engine, "connect", set_pragmas)
+            logger.info(f"SQLite pragmas: {pragmas}")
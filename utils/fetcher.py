@@ -0,0 +1,220 @@
+import json
+import logging
+import os
+import re
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from AI.cache import CACHE_DIR, SQLiteStore, TieredCache
+
+logger = logging.getLogger(__name__)
+
+FETCH_USER_AGENT = os.environ.get(
+    "FETCH_USER_AGENT",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/91.0.4472.114 Safari/537.36",
+)
+FETCH_CONNECT_TIMEOUT = float(os.environ.get("FETCH_CONNECT_TIMEOUT", 5))
+FETCH_READ_TIMEOUT = float(os.environ.get("FETCH_READ_TIMEOUT", 10))
+# Pages are cut off after this many bytes; job text sits well inside the first megabyte
+FETCH_MAX_BYTES = int(os.environ.get("FETCH_MAX_BYTES", 1024 * 1024))
+FETCH_RETRIES = int(os.environ.get("FETCH_RETRIES", 2))
+FETCH_POOL_SIZE = int(os.environ.get("FETCH_POOL_SIZE", 10))
+# How long a page without caching headers is reused before it is revalidated, in seconds
+FETCH_CACHE_FRESHNESS = int(os.environ.get("FETCH_CACHE_FRESHNESS", 3600))
+FETCH_CACHE_MAX_ENTRIES = int(os.environ.get("FETCH_CACHE_MAX_ENTRIES", 1000))
+
+META_CHARSET_RE = re.compile(rb"<meta[^>]+charset=[\"']?([\w-]+)", re.I)
+
+
+def freshness(headers, default):
+    """Seconds a response may be reused without revalidation, or None if it must not be stored."""
+    cache_control = headers.get("Cache-Control", "").lower()
+    if "no-store" in cache_control:
+        return None
+    if "no-cache" in cache_control:
+        return 0
+    match = re.search(r"max-age=(\d+)", cache_control)
+    if match:
+        return int(match.group(1))
+    return default
+
+
+def decode_body(body, content_type):
+    """
+    Decodes a page with the charset from Content-Type, else from a <meta> tag, else UTF-8
+    (HTTP clients assume ISO-8859-1 for text/* without a charset, which is rarely right).
+    """
+    match = re.search(r"charset=[\"']?([\w-]+)", content_type or "", re.I) or META_CHARSET_RE.search(body[:4096])
+    encoding = match.group(1) if match else "utf-8"
+    if isinstance(encoding, bytes):
+        encoding = encoding.decode()
+    try:
+        return body.decode(encoding, errors="replace")
+    except LookupError:
+        return body.decode("utf-8", errors="replace")
+
+
+class HTTPCache(TieredCache):
+    """
+    Fetched pages keyed by URL, with the validators (ETag, Last-Modified) needed to revalidate
+    them. Entries are kept after they go stale so a refetch can be a conditional request.
+    """
+
+    def __init__(self, path=None, max_entries=FETCH_CACHE_MAX_ENTRIES, memory_entries=64):
+        super().__init__(memory_entries)
+        self.max_entries = max_entries
+        self.disk = SQLiteStore(path or os.path.join(CACHE_DIR, "http.db"), "http_responses")
+        self._writes = 0
+
+    def lookup(self, url):
+        entry = self.memory.get(url)
+        if entry is not None:
+            self._count("memory_hits")
+            return entry
+
+        raw = self.disk.get(url)
+        if raw is not None:
+            entry = json.loads(raw)
+            self.memory.set(url, entry)
+            self._count("disk_hits")
+            return entry
+
+        self._count("misses")
+        return None
+
+    def store(self, url, entry):
+        self.memory.set(url, entry)
+        self.disk.set(url, json.dumps(entry))
+        with self._lock:
+            self._writes += 1
+            prune = self._writes % 100 == 0
+        if prune:
+            self.disk.prune(self.max_entries)
+
+
+class PageFetcher:
+    """
+    Process-wide page fetcher for job URLs. One requests.Session keeps connections to job boards
+    alive between fetches and retries transient failures with backoff. Bodies are streamed and
+    cut off at max_bytes, and pages are cached: a fresh copy is served without a request, a stale
+    one is revalidated with If-None-Match/If-Modified-Since so an unchanged page costs a 304.
+    """
+
+    def __init__(self, cache=None, connect_timeout=FETCH_CONNECT_TIMEOUT, read_timeout=FETCH_READ_TIMEOUT,
+                 max_bytes=FETCH_MAX_BYTES, retries=FETCH_RETRIES, pool_size=FETCH_POOL_SIZE,
+                 default_freshness=FETCH_CACHE_FRESHNESS):
+        self.cache = cache or HTTPCache()
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_bytes = max_bytes
+        self.retries = retries
+        self.pool_size = pool_size
+        self.default_freshness = default_freshness
+        self._session = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self.fetched = 0
+        self.revalidated = 0
+
+    @property
+    def session(self):
+        # Rebuilt after a fork (e.g. gunicorn preload) so workers never share a socket
+        with self._lock:
+            if self._session is None or self._pid != os.getpid():
+                retry = Retry(
+                    total=self.retries,
+                    backoff_factor=0.5,
+                    status_forcelist=(429, 500, 502, 503, 504),
+                    allowed_methods=("GET",),
+                    raise_on_status=False,
+                )
+                adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size, max_retries=retry)
+                session = requests.Session()
+                session.headers["User-Agent"] = FETCH_USER_AGENT
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                self._session = session
+                self._pid = os.getpid()
+            return self._session
+
+    def cached(self, url):
+        """
+        Returns (text, headers): the cached text if it is still fresh, otherwise None and the
+        conditional request headers for revalidating whatever is cached.
+        """
+        entry = self.cache.lookup(url)
+        if entry is None:
+            return None, {}
+        if time.time() - entry["fetched_at"] < entry["fresh_for"]:
+            return entry["text"], {}
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return None, headers
+
+    def revalidated_text(self, url, response_headers):
+        """Handles a 304: refreshes the cached entry and returns its text."""
+        entry = self.cache.lookup(url)
+        if entry is None:
+            return None
+        with self._lock:
+            self.revalidated += 1
+        entry.update(fetched_at=time.time(), fresh_for=freshness(response_headers, self.default_freshness) or 0)
+        self.cache.store(url, entry)
+        return entry["text"]
+
+    def remember(self, url, response_headers, text):
+        """Caches a fetched page unless its headers forbid it."""
+        with self._lock:
+            self.fetched += 1
+        fresh_for = freshness(response_headers, self.default_freshness)
+        if fresh_for is not None:
+            self.cache.store(url, {
+                "text": text,
+                "etag": response_headers.get("ETag"),
+                "last_modified": response_headers.get("Last-Modified"),
+                "fetched_at": time.time(),
+                "fresh_for": fresh_for,
+            })
+
+    def fetch(self, url):
+        """Returns the page text (at most max_bytes of it), or None if it could not be fetched."""
+        text, headers = self.cached(url)
+        if text is not None:
+            return text
+
+        try:
+            with self.session.get(url, headers=headers, timeout=self.timeout, stream=True) as response:
+                if response.status_code == 304 and headers:
+                    return self.revalidated_text(url, response.headers)
+                response.raise_for_status()
+                text = self._read(response)
+        except requests.RequestException as e:
+            logger.warning(f"Error fetching {url}: {e}")
+            return None
+
+        self.remember(url, response.headers, text)
+        return text
+
+    def _read(self, response):
+        chunks = []
+        size = 0
+        for chunk in response.iter_content(chunk_size=64 * 1024):
+            chunks.append(chunk)
+            size += len(chunk)
+            if size >= self.max_bytes:
+                logger.info(f"Stopped reading {response.url} after {size} bytes")
+                break
+        return decode_body(b"".join(chunks)[:self.max_bytes], response.headers.get("Content-Type"))
+
+    def stats(self):
+        return {**self.cache.stats(), "fetched": self.fetched, "revalidated": self.revalidated}
+
+
+fetcher = PageFetcher()
@@ -0,0 +1,128 @@
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+import click
+from flask import current_app
+from flask.cli import AppGroup
+
+from extensions import db
+from models import Resume
+from services import analyzer
+from AI.cache import normalize_text
+from AI.tokens import count_tokens
+from utils.search_index import index_resume
+
+logger = logging.getLogger(__name__)
+
+# Runs text extraction after upload so request handlers never parse PDFs themselves
+_executor = None
+_slots = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    global _executor, _slots
+    with _executor_lock:
+        if _executor is None:
+            workers = current_app.config.get("INGEST_MAX_WORKERS", 2)
+            _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="resume-ingest")
+            _slots = threading.BoundedSemaphore(current_app.config.get("INGEST_QUEUE_SIZE", 32))
+    return _executor, _slots
+
+
+def extract_resume(file_path, fallback_text=""):
+    """
+    Extracts and normalizes the text of a resume file.
+    Returns a dict with the Resume columns to update.
+    """
+    extracted = None
+    if Path(file_path).suffix.lower() == ".pdf" and os.path.exists(file_path):
+        extracted = analyzer.extract_pdf(file_path)
+
+    if extracted and extracted["text"]:
+        text = extracted["text"]
+        fields = {"content_hash": extracted["sha256"], "page_count": extracted["page_count"]}
+    elif fallback_text:
+        # Non-PDF uploads (or scanned PDFs) fall back to the text pasted on upload
+        text = normalize_text(fallback_text)
+        fields = {"content_hash": None, "page_count": extracted["page_count"] if extracted else None}
+    else:
+        return {"text_status": "failed", "text_extracted_at": datetime.now()}
+
+    fields.update({
+        "resume_text": text,
+        "token_count": count_tokens(text),
+        "text_status": "ready",
+        "text_extracted_at": datetime.now(),
+    })
+    return fields
+
+
+def ingest_resume(resume):
+    """Extracts text for a resume row and commits the result."""
+    fields = extract_resume(resume.resume_file_path, resume.resume_text)
+    for key, value in fields.items():
+        setattr(resume, key, value)
+    db.session.commit()
+    if resume.text_status == "failed":
+        logger.warning(f"Text extraction failed for resume {resume.id}")
+    else:
+        index_resume(resume)
+    return resume
+
+
+def _run_ingest(app, resume_id, slots):
+    try:
+        with app.app_context():
+            resume = db.session.get(Resume, resume_id)
+            if resume is not None and resume.text_status != "ready":
+                ingest_resume(resume)
+    except Exception as e:
+        logger.error(f"Error ingesting resume {resume_id}: {e}")
+    finally:
+        slots.release()
+
+
+def schedule_ingest(resume):
+    """
+    Queues text extraction for a freshly uploaded resume.
+    If the queue is full the resume stays pending and is ingested on first use instead.
+    """
+    executor, slots = _get_executor()
+    if not slots.acquire(blocking=False):
+        logger.warning(f"Ingest queue full, resume {resume.id} will be extracted on first use")
+        return False
+    executor.submit(_run_ingest, current_app._get_current_object(), resume.id, slots)
+    return True
+
+
+def ensure_resume_text(resume):
+    """
+    Returns the stored text for a resume.
+    Rows that were never ingested (uploaded before the pipeline existed, or dropped
+    from a full queue) are extracted once here and persisted.
+    """
+    if resume.text_status not in ("ready", "failed"):
+        ingest_resume(resume)
+    return resume.resume_text or None
+
+
+resumes_cli = AppGroup("resumes", help="Resume maintenance commands.")
+
+
+@resumes_cli.command("ingest")
+@click.option("--all", "reingest_all", is_flag=True, help="Re-extract resumes that are already ready.")
+def ingest_command(reingest_all):
+    """Extract text for resumes that have not been ingested yet."""
+    query = Resume.query
+    if not reingest_all:
+        query = query.filter((Resume.text_status != "ready") | (Resume.text_status.is_(None)))
+
+    for resume in query.all():
+        ingest_resume(resume)
+        click.echo(f"{resume.id}: {resume.text_status} ({resume.token_count or 0} tokens)")
+
@@ -0,0 +1,293 @@
+import html
+import json
+import logging
+import re
+from html.parser import HTMLParser
+
+from AI.prompts import clean_posting, html_to_text
+
+logger = logging.getLogger(__name__)
+
+# Text inside these never belongs to the posting
+SKIP_TAGS = {"script", "style", "noscript", "template", "svg", "nav", "header", "footer", "aside", "form", "button"}
+# Candidate blocks for the main content, scored when they close
+CONTAINER_TAGS = {"article", "main", "section", "div", "td"}
+BLOCK_TAGS = {"p", "div", "section", "article", "main", "br", "h1", "h2", "h3", "h4", "h5", "h6", "ul", "ol", "tr", "li"}
+VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"}
+META_KEYS = {"og:title", "og:description", "og:site_name", "twitter:title", "twitter:description", "description"}
+# Without JSON-LD, a page's main block must be at least this long to be used without the model
+MIN_CONTENT_CHARS = 600
+
+
+class JobPageParser(HTMLParser):
+    """
+    Single pass over a job page collecting JSON-LD blocks, meta tags, the <title> and the
+    readability-style main content. Each paragraph's text scores its enclosing block (and half
+    of that block's parent) by length and commas; the best-scoring block, discounted by link
+    density, is the main content. Navigation and link lists score low.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.json_ld = []
+        self.meta = {}
+        self.title = ""
+        self.chunks = []
+        self._stack = []
+        self._skip_depth = 0
+        self._script = None
+        self._in_title = False
+        self._link_depth = 0
+        self._best = (0, 0, 0)
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == "meta":
+            key = (attrs.get("property") or attrs.get("name") or "").lower()
+            if key in META_KEYS and attrs.get("content"):
+                self.meta.setdefault(key, attrs["content"].strip())
+            return
+        if tag == "script" and (attrs.get("type") or "").lower() == "application/ld+json":
+            self._script = []
+        if tag == "title":
+            self._in_title = True
+        if tag in VOID_TAGS:
+            if tag == "br":
+                self.chunks.append("\n")
+            return
+        if tag in SKIP_TAGS:
+            self._skip_depth += 1
+        if tag == "a":
+            self._link_depth += 1
+        if tag in BLOCK_TAGS:
+            self.chunks.append("\n- " if tag == "li" else "\n")
+        # tag, first chunk, score, text length, link text length, own text length, own commas
+        self._stack.append([tag, len(self.chunks), 0.0, 0, 0, 0, 0])
+
+    def handle_endtag(self, tag):
+        if tag == "title":
+            self._in_title = False
+        if tag == "script" and self._script is not None:
+            self.json_ld.append("".join(self._script))
+            self._script = None
+        if tag in VOID_TAGS or not any(entry[0] == tag for entry in self._stack):
+            return
+        # Close unclosed children along with their parent, as browsers do
+        while self._stack:
+            entry = self._stack.pop()
+            self._close(entry)
+            if entry[0] == tag:
+                break
+
+    def _close(self, entry):
+        tag, start, score, text_len, link_len, own_len, own_commas = entry
+        if tag in SKIP_TAGS:
+            self._skip_depth -= 1
+        if tag == "a":
+            self._link_depth -= 1
+        if tag in BLOCK_TAGS:
+            self.chunks.append("\n")
+        if self._stack:
+            self._stack[-1][3] += text_len
+            self._stack[-1][4] += link_len
+
+        if own_len >= 25:
+            points = 1 + own_commas + min(own_len / 100, 3)
+            containers = [e for e in reversed(self._stack) if e[0] in CONTAINER_TAGS]
+            if tag in CONTAINER_TAGS:
+                score += points
+                containers = containers[:1]
+                if containers:
+                    containers[0][2] += points / 2
+            else:
+                for weight, container in zip((1, 0.5), containers):
+                    container[2] += points * weight
+
+        if tag in CONTAINER_TAGS and text_len:
+            score *= 1 - link_len / text_len
+            if score > self._best[0]:
+                self._best = (score, start, len(self.chunks))
+
+    def handle_data(self, data):
+        if self._script is not None:
+            self._script.append(data)
+            return
+        if self._in_title:
+            self.title += data
+            return
+        text = data.strip()
+        if self._skip_depth or not text:
+            return
+        self.chunks.append(data)
+        if not self._stack:
+            return
+        self._stack[-1][3] += len(text)
+        if self._link_depth:
+            self._stack[-1][4] += len(text)
+        # Inline text belongs to the nearest enclosing block
+        for entry in reversed(self._stack):
+            if entry[0] in BLOCK_TAGS or entry[0] in CONTAINER_TAGS:
+                entry[5] += len(text)
+                entry[6] += text.count(",")
+                break
+
+    def main_content(self):
+        _, start, end = self._best
+        return clean_posting("".join(self.chunks[start:end]))
+
+
+def _job_posting(data):
+    """Finds a schema.org JobPosting in a parsed JSON-LD block (a dict, list or @graph)."""
+    if isinstance(data, list):
+        for item in data:
+            found = _job_posting(item)
+            if found:
+                return found
+        return None
+    if not isinstance(data, dict):
+        return None
+    types = data.get("@type")
+    if types == "JobPosting" or (isinstance(types, list) and "JobPosting" in types):
+        return data
+    return _job_posting(data.get("@graph", []))
+
+
+def _name(value):
+    if isinstance(value, dict):
+        return value.get("name")
+    return value if isinstance(value, str) else None
+
+
+def _text(value, separator):
+    """A string field, with lists of strings joined; None for anything else (objects, numbers)."""
+    if isinstance(value, list) and value and all(isinstance(item, str) for item in value):
+        value = separator.join(value)
+    return value if isinstance(value, str) else None
+
+
+def _location(posting):
+    places = posting.get("jobLocation") or []
+    if isinstance(places, dict):
+        places = [places]
+    names = []
+    for place in places:
+        address = place.get("address") if isinstance(place, dict) else None
+        if isinstance(address, dict):
+            parts = [address.get("addressLocality"), address.get("addressRegion"), _name(address.get("addressCountry"))]
+            name = ", ".join(part for part in parts if isinstance(part, str) and part)
+        else:
+            name = _name(address) or _name(place)
+        if name and name not in names:
+            names.append(name)
+    if posting.get("jobLocationType") == "TELECOMMUTE":
+        names.append("Remote")
+    return "; ".join(names) or None
+
+
+def _salary(posting):
+    salary = posting.get("baseSalary") or posting.get("estimatedSalary")
+    if isinstance(salary, list):
+        salary = salary[0] if salary else None
+    if not isinstance(salary, dict):
+        return str(salary) if salary else None
+    value = salary.get("value")
+    currency = salary.get("currency") or ""
+    unit = ""
+    if isinstance(value, dict):
+        unit = value.get("unitText") or ""
+        low, high = value.get("minValue"), value.get("maxValue")
+        amount = value.get("value")
+    else:
+        low = high = None
+        amount = value
+
+    def fmt(number):
+        try:
+            return f"{float(number):,.0f}"
+        except (TypeError, ValueError):
+            return str(number)
+
+    if low is not None and high is not None:
+        text = f"{fmt(low)}–{fmt(high)}"
+    elif amount is not None or low is not None:
+        text = fmt(amount if amount is not None else low)
+    else:
+        return None
+    text = f"{currency} {text}".strip()
+    return f"{text} / {unit.lower()}" if unit else text
+
+
+def text_to_html(text):
+    """Rebuilds posting text as plain paragraphs and bullet lists, so page markup never reaches the editor."""
+    parts = []
+    in_list = False
+    for line in text.splitlines():
+        line = line.strip()
+        is_item = line.startswith("- ")
+        if in_list and not is_item:
+            parts.append("</ul>")
+            in_list = False
+        if not line:
+            continue
+        if is_item:
+            if not in_list:
+                parts.append("<ul>")
+                in_list = True
+            parts.append(f"<li>{html.escape(line[2:].strip())}</li>")
+        else:
+            parts.append(f"<p>{html.escape(line)}</p>")
+    if in_list:
+        parts.append("</ul>")
+    return "".join(parts)
+
+
+def parse_job_page(page, chunk_size=64 * 1024):
+    """
+    Extracts a posting from a page without the model. Returns a dict with "title" and
+    "description" (plus company, location and salary_range where known) when the page
+    carries a JSON-LD JobPosting, or meta tags and a long enough main content block.
+    Otherwise returns the partial fields, with the main content under "content" so the
+    model only has to read that.
+    """
+    parser = JobPageParser()
+    for start in range(0, len(page), chunk_size):
+        parser.feed(page[start:start + chunk_size])
+    parser.close()
+
+    for block in parser.json_ld:
+        try:
+            posting = _job_posting(json.loads(block.strip()))
+        except ValueError:
+            continue
+        if not posting:
+            continue
+        title = _text(posting.get("title"), " ")
+        description = _text(posting.get("description"), "\n")
+        if title and description:
+            # Some boards entity-encode the HTML inside the JSON
+            if "&lt;" in description:
+                description = html.unescape(description)
+            return {
+                "title": html.unescape(title).strip(),
+                "company": _name(posting.get("hiringOrganization")),
+                "location": _location(posting),
+                "salary_range": _salary(posting),
+                "description": text_to_html(clean_posting(html_to_text(description))),
+                "source": "json-ld",
+            }
+
+    title = parser.meta.get("og:title") or parser.meta.get("twitter:title")
+    content = parser.main_content()
+    result = {
+        "title": title or parser.title.strip() or None,
+        "company": parser.meta.get("og:site_name"),
+        "content": content,
+    }
+    if title and len(content) >= MIN_CONTENT_CHARS:
+        return {
+            "title": title.strip(),
+            "company": result["company"],
+            "description": text_to_html(content),
+            "source": "meta",
+        }
+    return result
@@ -0,0 +1,60 @@
+import base64
+from datetime import datetime
+
+from sqlalchemy import and_, or_
+
+from models import Resume
+
+
+def encode_cursor(row):
+    raw = f"{row.created_at.isoformat()}|{row.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    """Returns (created_at, id), or None for a missing or malformed cursor."""
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, row_id = raw.split("|")
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (ValueError, UnicodeDecodeError):
+        return None
+
+
+def keyset_page(query, model, cursor=None, limit=25):
+    """
+    Newest-first page of query on (created_at, id), starting after cursor.
+    Unlike OFFSET paging, each page is an index range scan whose cost does not grow with how
+    deep the user has paged. Returns (items, next_cursor); next_cursor is None on the last page.
+    """
+    position = decode_cursor(cursor)
+    if position is not None:
+        created_at, row_id = position
+        query = query.filter(or_(
+            model.created_at < created_at,
+            and_(model.created_at == created_at, model.id < row_id),
+        ))
+    rows = query.order_by(model.created_at.desc(), model.id.desc()).limit(limit + 1).all()
+    items = rows[:limit]
+    next_cursor = encode_cursor(items[-1]) if len(rows) > limit else None
+    return items, next_cursor
+
+
+def recent_resumes(user_id, limit, include_id=None):
+    """
+    The user's newest resumes for a selector, plus include_id (e.g. the one already selected)
+    if it is older. The rest are reachable through /api/resumes/typeahead.
+    """
+    resumes = (
+        Resume.query.filter_by(user_id=user_id)
+        .order_by(Resume.created_at.desc(), Resume.id.desc())
+        .limit(limit)
+        .all()
+    )
+    if include_id and all(r.id != include_id for r in resumes):
+        selected = Resume.query.filter_by(id=include_id, user_id=user_id).first()
+        if selected:
+            resumes.append(selected)
+    return resumes
@@ -0,0 +1,131 @@
+import hashlib
+import logging
+import re
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from sqlalchemy import insert
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+
+from extensions import db
+from models import JobPosting
+from AI.prompts import clean_posting, html_to_text
+
+logger = logging.getLogger(__name__)
+
+# Query parameters that identify the click, not the posting
+TRACKING_PARAM_RE = re.compile(
+    r"^(utm_\w+|gclid|fbclid|msclkid|dclid|mc_cid|mc_eid|_hsenc|_hsmi|igshid|si|ref|refid|trk|trkinfo|"
+    r"trackingid|src|source|campaign|lipi|gh_src|hsa_\w+|yclid)$",
+    re.IGNORECASE,
+)
+
+
+def canonical_url(url):
+    """
+    The URL a posting is stored under: lower-case scheme and host, no fragment, no tracking
+    parameters, remaining parameters sorted and no trailing slash. Returns None for non-HTTP URLs.
+    """
+    parts = urlsplit((url or "").strip())
+    if parts.scheme.lower() not in ("http", "https") or not parts.netloc:
+        return None
+    query = sorted((key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+                   if not TRACKING_PARAM_RE.match(key))
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, urlencode(query), ""))[:500]
+
+
+def posting_text(description):
+    """Normalized plain text of a description: what postings are compared and embedded on."""
+    return clean_posting(html_to_text(description or ""))
+
+
+def content_hash(text):
+    # Case and whitespace differences between copies of the same posting don't count
+    normalized = re.sub(r"\s+", " ", text).strip().lower()
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+def find_posting(url):
+    """The stored posting for a URL, or None. One indexed lookup."""
+    url = canonical_url(url)
+    if url is None:
+        return None
+    return JobPosting.query.filter_by(canonical_url=url).first()
+
+
+def get_or_create_posting(description, url=None, title=None, company=None, location=None,
+                          salary_range=None, source=None):
+    """
+    Returns the posting for a description, creating it if neither its URL nor its text has been
+    stored before. Inserts without committing. Returns None for an empty description.
+    """
+    clean_text = posting_text(description)
+    if not clean_text:
+        return None
+    digest = content_hash(clean_text)
+    url = canonical_url(url)
+
+    posting = JobPosting.query.filter_by(content_hash=digest).first()
+    if posting is not None:
+        if url and posting.canonical_url is None and not JobPosting.query.filter_by(canonical_url=url).first():
+            posting.canonical_url = url
+        return posting
+
+    # A URL already stored with different text keeps its original posting; this text is stored without it
+    if url and JobPosting.query.filter_by(canonical_url=url).first():
+        url = None
+
+    values = dict(
+        canonical_url=url,
+        content_hash=digest,
+        title=title,
+        company=company,
+        location=location,
+        salary_range=salary_range,
+        description=description,
+        clean_text=clean_text,
+        source=source,
+    )
+    # Another request may store the same posting first; the unique keys decide, and we use theirs
+    _insert_unless_stored(values)
+    posting = JobPosting.query.filter_by(content_hash=digest).first()
+    if posting is None and url:
+        # The URL was taken by different text in the meantime; store this text without it
+        _insert_unless_stored(dict(values, canonical_url=None))
+        posting = JobPosting.query.filter_by(content_hash=digest).first()
+    return posting
+
+
+def _insert_unless_stored(values):
+    """Inserts a posting row, doing nothing if its URL or hash is already stored."""
+    dialect = db.session.get_bind().dialect.name
+    if dialect in ("sqlite", "postgresql"):
+        statement = (sqlite.insert if dialect == "sqlite" else postgresql.insert)(JobPosting)
+        db.session.execute(statement.values(**values).on_conflict_do_nothing())
+        return
+    # Drivers without ON CONFLICT emit SAVEPOINT properly, so the failed insert is all that rolls back
+    try:
+        with db.session.begin_nested():
+            db.session.execute(insert(JobPosting).values(**values))
+    except IntegrityError:
+        pass
+
+
+def attach_posting(job, url=None, source="manual"):
+    """
+    Moves a job's description into the shared store: the job references the posting and keeps
+    no copy of its own. Call before committing a new job.
+
+    Pass url only for content fetched from that URL. A description the user typed is keyed by
+    its text alone: storing it under the job's URL would hand it to anyone who looks that URL up.
+    """
+    if not job.description_override:
+        return
+    posting = get_or_create_posting(
+        job.description_override, url=url, title=job.title, company=job.company,
+        location=job.location, salary_range=job.salary_range, source=source,
+    )
+    if posting is not None:
+        job.posting = posting
+        job.description_override = None
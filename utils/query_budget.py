@@ -0,0 +1,39 @@
+import logging
+
+from flask import g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBudgetExceeded(Exception):
+    """Raised when a request runs more SQL statements than QUERY_BUDGET and QUERY_BUDGET_STRICT is set."""
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _count_query(conn, cursor, statement, parameters, context, executemany):
+    # Background threads have no request context and are not counted
+    if has_request_context():
+        g.query_count = g.get("query_count", 0) + 1
+
+
+def init_query_budget(app):
+    """
+    Counts the SQL statements each request runs. Responses carry an X-Query-Count header and
+    requests over QUERY_BUDGET are logged, so an N+1 loop (a lazy load per row in a list view)
+    shows up as soon as it is introduced. With QUERY_BUDGET_STRICT the request fails instead,
+    which is how smoke runs and CI should use it.
+    """
+
+    @app.after_request
+    def check_query_budget(response):
+        count = g.get("query_count", 0)
+        response.headers["X-Query-Count"] = str(count)
+        budget = app.config.get("QUERY_BUDGET", 0)
+        if budget and count > budget:
+            message = f"{request.method} {request.path} ran {count} queries (budget {budget})"
+            if app.config.get("QUERY_BUDGET_STRICT"):
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
+        return response
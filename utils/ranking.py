@@ -0,0 +1,153 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from AI.embeddings import strip_html
+
+logger = logging.getLogger(__name__)
+
+
+def _coerce_score(value):
+    try:
+        return max(0, min(100, int(float(value))))
+    except (TypeError, ValueError):
+        return 0
+
+
+def similarity_to_score(similarity):
+    """Maps a cosine similarity onto the 0-100 scale used by the model's scores."""
+    return max(0, min(100, int(round(float(similarity) * 100))))
+
+
+def shortlist_candidates(embedder, job_description, candidates, top_k):
+    """
+    First ranking stage: embeds the job and every resume locally and keeps the top_k closest
+    for full model analysis. Returns (shortlist, screened_out), where screened_out holds result
+    dicts scored by embedding similarity alone. If no embedding model is available every
+    candidate is shortlisted.
+    """
+    if top_k <= 0 or len(candidates) <= top_k:
+        return candidates, []
+
+    scorable = [(resume, text) for resume, text in candidates if text]
+    similarities = embedder.similarities(strip_html(job_description), [text for _, text in scorable])
+    if similarities is None:
+        return candidates, []
+
+    order = sorted(range(len(scorable)), key=lambda i: (-similarities[i], scorable[i][0].id))
+    # Resumes without text stay in the shortlist so score_resumes reports them as failures
+    shortlist = [scorable[i] for i in order[:top_k]] + [c for c in candidates if not c[1]]
+    screened_out = [
+        {
+            "resume": scorable[i][0],
+            "score": similarity_to_score(similarities[i]),
+            "summary": "Semantic similarity only. Not in the shortlist for full AI analysis.",
+            "source": "embedding",
+        }
+        for i in order[top_k:]
+    ]
+    return shortlist, screened_out
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor(max_workers):
+    """
+    The process-wide pool every ranking submits to, created on first use. Its size is the limit
+    on parallel model calls across all concurrent rankings, not per request.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="ranking")
+    return _executor
+
+
+def score_resumes(analyzer, job_description, candidates, max_workers=4, timeout=120):
+    """
+    Scores (resume, resume_text) pairs against a job description, with at most max_workers
+    model calls in flight across the process.
+
+    Each candidate gets `timeout` seconds from the moment its analysis starts; stragglers are
+    reported as failures and abandoned. Model and connection errors are reported as failures
+    too. Returns (results, failures), with results sorted by score and then resume id so the
+    same inputs always produce the same order.
+    """
+    results = []
+    failures = []
+    if not candidates:
+        return results, failures
+
+    started = {}
+
+    def run(resume_id, resume_text):
+        started[resume_id] = time.monotonic()
+        return analyzer.analyze(resume_text, job_description, raise_errors=True)
+
+    executor = _get_executor(max_workers)
+    futures = {}
+    for resume, resume_text in candidates:
+        if not resume_text:
+            failures.append({"resume": resume, "error": "No text could be extracted from this resume."})
+            continue
+        futures[executor.submit(run, resume.id, resume_text)] = resume
+
+    pending = set(futures)
+    try:
+        while pending:
+            done, pending = wait(pending, timeout=0.5, return_when=FIRST_COMPLETED)
+            for future in done:
+                resume = futures[future]
+                try:
+                    analysis = future.result()
+                except Exception as e:
+                    logger.error(f"Failed to analyze resume {resume.id}: {e}")
+                    failures.append({"resume": resume, "error": str(e)})
+                    continue
+                if not analysis:
+                    failures.append({"resume": resume, "error": "The model returned an unreadable response."})
+                    continue
+                results.append({
+                    "resume": resume,
+                    "score": _coerce_score(analysis.get("score", 0)),
+                    "summary": analysis.get("summary", "No summary available"),
+                    "source": "llm",
+                })
+
+            now = time.monotonic()
+            for future in list(pending):
+                resume = futures[future]
+                if resume.id in started and now - started[resume.id] > timeout:
+                    logger.warning(f"Analysis of resume {resume.id} timed out after {timeout}s")
+                    failures.append({"resume": resume, "error": f"Timed out after {timeout} seconds."})
+                    pending.discard(future)
+    finally:
+        # Don't hold the request open for abandoned calls; ones not started yet never run
+        for future in pending:
+            future.cancel()
+
+    results.sort(key=lambda x: (-x["score"], x["resume"].id))
+    failures.sort(key=lambda x: x["resume"].id)
+    return results, failures
+
+
+def quick_score_resumes(analyzer, job_description, candidates):
+    """Scores every candidate with the local fast path; no model calls are made."""
+    results = []
+    failures = []
+    for resume, resume_text in candidates:
+        if not resume_text:
+            failures.append({"resume": resume, "error": "No text could be extracted from this resume."})
+            continue
+        analysis = analyzer.analyze(resume_text, job_description, mode="fast")
+        results.append({
+            "resume": resume,
+            "score": analysis["score"],
+            "summary": analysis["summary"],
+            "source": "fast",
+        })
+    results.sort(key=lambda x: (-x["score"], x["resume"].id))
+    return results, failures
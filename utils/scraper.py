@@ -1,66 +1,50 @@
-import requests
-# Using a simple text extraction approach. 
-# For a production app, use beautifulsoup4.
-# Assuming user has beautifulsoup4 installed as it's common, but if not, we can fall back to simple string manipulation or check deps.
-# Given constraints, let's try to use basic requests + text processing, 
-# or use `ollama` to process the raw HTML if it's not too huge.
+from AI.prompts import prepare_inputs
+from AI.schemas import JobExtraction
+from utils.fetcher import fetcher
+from utils.job_page import parse_job_page
 
 def fetch_url_content(url):
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.114 Safari/537.36'
-    }
-    try:
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
-        return response.text
-    except Exception as e:
-        print(f"Error fetching URL: {e}")
-        return None
+    # Pooled, size-capped and cached; see utils/fetcher.py
+    return fetcher.fetch(url)
 
 def extract_job_info(html_content, analyzer):
     """
-    Uses the AI analyzer to extract Title and Description from HTML.
-    This is expensive but effective for unstructured data.
+    Extracts Title and Description (and company, location, salary where the page has them).
+    Pages with a schema.org JobPosting or usable meta tags and main content are parsed directly;
+    only the rest go to the AI analyzer, which is expensive but effective for unstructured data.
     """
-    # Truncate HTML to avoid token limits (heuristically, body content is usually in first 15k chars for job boards)
-    # or better, use a text extractor first.
-    # For now, let's just strip tags partially or send a chunk.
-    
-    # Simple tag stripping to reduce noise
+    parsed = parse_job_page(html_content)
+    if "description" in parsed:
+        return parsed
+
+    # The model reads the page's main content block, or the whole page if none was found.
+    # Scripts and styles carry no text; the rest is cleaned and trimmed to the scraper's token budget
     import re
-    clean_text = re.sub('<[^<]+?>', ' ', html_content[:20000]) # First 20k chars
-    clean_text = re.sub('\s+', ' ', clean_text).strip()
+    if len(parsed["content"]) >= 200:
+        html_content = parsed["content"]
+    else:
+        html_content = re.sub(r'<(script|style)\b.*?</\1>', ' ', html_content, flags=re.S | re.I)
+    clean_text, _ = prepare_inputs("scraper", html_content)
     
     prompt = f"""
     Analyze the following web page text and extract the Job Title and Job Description.
     Return ONLY a JSON object with keys "title" and "description".
     
     Web Page Text:
-    {clean_text[:8000]} 
+    {clean_text}
     """
     
-    # We can reuse the analyzer's internal LLM call or just call ollama directly if exposed.
-    # Since `ResumeAnalyzer` has `analyze` which is specific to Resume vs JD,
-    # we might need to expose a generic `generate` method or similar.
-    # For now, let's assume we can add a method to `ResumeAnalyzer` or import ollama here.
-    
-    import ollama
     try:
-        response = ollama.chat(model='gpt-oss:120b-cloud', messages=[
-            {'role': 'user', 'content': prompt}
-        ])
-        content = response['message']['content']
-        
-        # Try to parse JSON
-        import json
-        # Find first { and last }
-        start = content.find('{')
-        end = content.rfind('}') + 1
-        if start != -1 and end != -1:
-            json_str = content[start:end]
-            return json.loads(json_str)
-        else:
-            return {"title": "Extracted Job", "description": content}
+        # Goes through the analyzer so repeat extractions are served from the response cache
+        extracted = analyzer.chat_json(prompt, JobExtraction, model_name='gpt-oss:120b-cloud', tool="scraper")
+        if extracted is None:
+            return None
+        # Fields the page stated itself fill in what the model left out
+        for key in ("title", "company"):
+            if parsed.get(key) and not extracted.get(key):
+                extracted[key] = parsed[key]
+        extracted["source"] = "llm"
+        return extracted
             
     except Exception as e:
         print(f"AI Extraction failed: {e}")
@@ -0,0 +1,157 @@
+import logging
+import os
+
+import click
+import numpy as np
+from flask import current_app
+from flask.cli import AppGroup
+
+from extensions import db
+from models import Job, Resume
+from AI.embeddings import embedder, strip_html
+from AI.vector_index import VectorIndex
+
+logger = logging.getLogger(__name__)
+
+
+def resume_index(user_id):
+    return VectorIndex(os.path.join(current_app.config["INDEX_FOLDER"], f"resumes_user_{user_id}.faiss"))
+
+
+def job_index(user_id):
+    return VectorIndex(os.path.join(current_app.config["INDEX_FOLDER"], f"jobs_user_{user_id}.faiss"))
+
+
+def job_document(job):
+    """The text embedded for a saved job: title and company carry most of the signal."""
+    parts = [job.title, job.company or "", strip_html(job.description)]
+    return "\n".join(part for part in parts if part)
+
+
+def _embed_one(text):
+    vectors = embedder.embed([text])
+    return None if vectors is None else vectors[0]
+
+
+def _job_vector(job):
+    """
+    A job's vector. Jobs that use their shared posting unchanged share its vector too: it is
+    stored on the posting the first time, so a posting saved by many users is embedded once.
+    The stored vector is flushed, not committed; the caller commits.
+    """
+    posting = job.posting
+    shared = (posting is not None and job.description_override is None
+              and (job.title, job.company) == (posting.title, posting.company))
+    if shared and posting.embedding is not None and posting.embedding_model == embedder.model_name:
+        return np.frombuffer(posting.embedding, dtype=np.float32)
+    vector = _embed_one(job_document(job))
+    if shared and vector is not None:
+        posting.embedding = vector.astype(np.float32).tobytes()
+        posting.embedding_model = embedder.model_name
+        db.session.flush()
+    return vector
+
+
+def index_resume(resume):
+    """Adds or refreshes a resume's vector in its owner's index. Never raises."""
+    if not resume.resume_text or not VectorIndex.available():
+        return
+    try:
+        vector = _embed_one(resume.resume_text)
+        if vector is not None:
+            resume_index(resume.user_id).upsert(resume.id, vector)
+    except Exception as e:
+        logger.error(f"Error indexing resume {resume.id}: {e}")
+
+
+def unindex_resume(resume):
+    try:
+        resume_index(resume.user_id).remove(resume.id)
+    except Exception as e:
+        logger.error(f"Error removing resume {resume.id} from index: {e}")
+
+
+def rebuild_resume_index(user_id, resumes):
+    items = []
+    for resume in resumes:
+        if resume.resume_text:
+            vector = _embed_one(resume.resume_text)
+            if vector is not None:
+                items.append((resume.id, vector))
+    resume_index(user_id).rebuild(items)
+    return len(items)
+
+
+def search_resumes(user_id, query, k=5):
+    """
+    Returns [(resume_id, similarity)] for the user's resumes closest to the query text,
+    or None when semantic search is unavailable.
+    """
+    if not VectorIndex.available():
+        return None
+    vector = _embed_one(strip_html(query))
+    if vector is None:
+        return None
+    return resume_index(user_id).search(vector, k)
+
+
+def index_job(job):
+    """
+    Adds or refreshes a saved job's vector in its owner's index. Never raises. A vector stored
+    on the job's posting is left for the caller to commit.
+    """
+    if not VectorIndex.available():
+        return
+    try:
+        vector = _job_vector(job)
+        if vector is not None:
+            job_index(job.user_id).upsert(job.id, vector)
+    except Exception as e:
+        logger.error(f"Error indexing job {job.id}: {e}")
+
+
+def unindex_job(job):
+    try:
+        job_index(job.user_id).remove(job.id)
+    except Exception as e:
+        logger.error(f"Error removing job {job.id} from index: {e}")
+
+
+def rebuild_job_index(user_id, jobs):
+    items = []
+    for job in jobs:
+        vector = _job_vector(job)
+        if vector is not None:
+            items.append((job.id, vector))
+    job_index(user_id).rebuild(items)
+    return len(items)
+
+
+def search_jobs(user_id, resume_text, k=5):
+    """
+    Returns [(job_id, similarity)] for the user's saved jobs closest to a resume,
+    or None when semantic search is unavailable.
+    """
+    if not VectorIndex.available() or not resume_text:
+        return None
+    vector = _embed_one(resume_text)
+    if vector is None:
+        return None
+    return job_index(user_id).search(vector, k)
+
+
+search_cli = AppGroup("search", help="Semantic search index commands.")
+
+
+@search_cli.command("reindex")
+def reindex_command():
+    """Rebuild every user's resume and job indexes from the database."""
+    user_ids = {row[0] for row in db.session.query(Resume.user_id).distinct()}
+    user_ids |= {row[0] for row in db.session.query(Job.user_id).distinct()}
+    for user_id in sorted(user_ids):
+        resumes = Resume.query.filter_by(user_id=user_id, text_status="ready").all()
+        jobs = Job.query.filter_by(user_id=user_id).all()
+        resume_count = rebuild_resume_index(user_id, resumes)
+        job_count = rebuild_job_index(user_id, jobs)
+        db.session.commit()
+        click.echo(f"user {user_id}: {resume_count} resumes, {job_count} jobs indexed")
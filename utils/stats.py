@@ -0,0 +1,119 @@
+import logging
+
+import click
+from flask.cli import AppGroup
+from sqlalchemy import event, func
+
+from extensions import db
+from models import Job, Resume, User, UserStats
+from models.user_stats import JOB_STATUS_COLUMNS
+
+logger = logging.getLogger(__name__)
+
+stats_table = UserStats.__table__
+
+
+def compute_user_stats(user_id):
+    """Counts a user's jobs per status and their resumes in SQL; returns UserStats column values."""
+    values = {column: 0 for column in JOB_STATUS_COLUMNS.values()}
+    job_count = 0
+    rows = (
+        db.session.query(Job.status, func.count(Job.id))
+        .filter(Job.user_id == user_id)
+        .group_by(Job.status)
+        .all()
+    )
+    for status, count in rows:
+        job_count += count
+        if status in JOB_STATUS_COLUMNS:
+            values[JOB_STATUS_COLUMNS[status]] = count
+    values["job_count"] = job_count
+    values["resume_count"] = (
+        db.session.query(func.count(Resume.id)).filter(Resume.user_id == user_id).scalar()
+    )
+    return values
+
+
+def rebuild_user_stats(user_id):
+    values = compute_user_stats(user_id)
+    stats = db.session.get(UserStats, user_id)
+    if stats is None:
+        stats = UserStats(user_id=user_id)
+        db.session.add(stats)
+    for key, value in values.items():
+        setattr(stats, key, value)
+    db.session.commit()
+    return stats
+
+
+def get_user_stats(user_id):
+    """
+    Returns the user's stats row, a single primary-key lookup. Users without a row yet
+    (new accounts, or data from before the table existed) are counted once and stored.
+    """
+    stats = db.session.get(UserStats, user_id)
+    if stats is None:
+        stats = rebuild_user_stats(user_id)
+    return stats
+
+
+def _bump(connection, user_id, deltas):
+    """Applies counter deltas inside the current flush. Missing rows are left for get_user_stats to build."""
+    values = {column: stats_table.c[column] + delta for column, delta in deltas.items() if delta}
+    if values:
+        connection.execute(stats_table.update().where(stats_table.c.user_id == user_id).values(**values))
+
+
+def _status_deltas(status, delta):
+    deltas = {"job_count": delta}
+    if status in JOB_STATUS_COLUMNS:
+        deltas[JOB_STATUS_COLUMNS[status]] = delta
+    return deltas
+
+
+# Counters follow ORM inserts, deletes and status changes. Bulk Query.update()/delete() skip these
+# events, so code using them must call rebuild_user_stats.
+@event.listens_for(Job, "after_insert")
+def _job_inserted(mapper, connection, job):
+    _bump(connection, job.user_id, _status_deltas(job.status, 1))
+
+
+@event.listens_for(Job, "after_delete")
+def _job_deleted(mapper, connection, job):
+    _bump(connection, job.user_id, _status_deltas(job.status, -1))
+
+
+@event.listens_for(Job, "after_update")
+def _job_updated(mapper, connection, job):
+    history = db.inspect(job).attrs.status.history
+    if not history.has_changes() or not history.deleted:
+        return
+    deltas = {}
+    old_column = JOB_STATUS_COLUMNS.get(history.deleted[0])
+    new_column = JOB_STATUS_COLUMNS.get(job.status)
+    if old_column:
+        deltas[old_column] = deltas.get(old_column, 0) - 1
+    if new_column:
+        deltas[new_column] = deltas.get(new_column, 0) + 1
+    _bump(connection, job.user_id, deltas)
+
+
+@event.listens_for(Resume, "after_insert")
+def _resume_inserted(mapper, connection, resume):
+    _bump(connection, resume.user_id, {"resume_count": 1})
+
+
+@event.listens_for(Resume, "after_delete")
+def _resume_deleted(mapper, connection, resume):
+    _bump(connection, resume.user_id, {"resume_count": -1})
+
+
+stats_cli = AppGroup("stats", help="Dashboard statistics commands.")
+
+
+@stats_cli.command("rebuild")
+def rebuild_command():
+    """Recount the dashboard statistics of every user."""
+    for (user_id,) in db.session.query(User.id).all():
+        stats = rebuild_user_stats(user_id)
+        click.echo(f"{user_id}: {stats.job_count} jobs, {stats.resume_count} resumes")
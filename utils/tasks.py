@@ -0,0 +1,326 @@
+import json
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import click
+from flask import current_app
+from flask.cli import AppGroup
+
+from extensions import db
+from models import Job, Resume, Task
+from services import analyzer
+from AI.embeddings import embedder
+from utils.ingest import ensure_resume_text
+from utils.application_kit import create_application_kit
+from utils.ranking import quick_score_resumes, score_resumes, shortlist_candidates
+
+logger = logging.getLogger(__name__)
+
+
+class TaskError(Exception):
+    """Raised by a handler when a task cannot run; the message is shown to the user."""
+
+
+def _resume_text(payload):
+    resume = db.session.get(Resume, payload["resume_id"])
+    text = ensure_resume_text(resume) if resume else None
+    if not text:
+        raise TaskError("No text could be extracted from this resume.")
+    return text
+
+
+def _analyze(payload):
+    # Model errors fail the task instead of finishing it with a score-0 "error" result
+    try:
+        return analyzer.analyze(
+            _resume_text(payload), payload["job_description"],
+            regenerate=payload.get("regenerate", False), mode=payload.get("mode", "full"), raise_errors=True,
+        )
+    except TaskError:
+        raise
+    except Exception as e:
+        raise TaskError(f"Analysis failed: {e}") from e
+
+
+def _tool(method):
+    def run(payload):
+        return getattr(analyzer, method)(
+            _resume_text(payload), payload["job_description"], regenerate=payload.get("regenerate", False)
+        )
+    return run
+
+
+def _negotiation(payload):
+    return analyzer.generate_negotiation_scripts(
+        payload["job_title"], payload.get("offer_details"), regenerate=payload.get("regenerate", False)
+    )
+
+
+def _application_kit(payload):
+    resume = db.session.get(Resume, payload["resume_id"])
+    job = db.session.get(Job, payload["job_id"])
+    if resume is None or job is None:
+        raise TaskError("The resume or job no longer exists.")
+    kit = create_application_kit(payload["user_id"], resume, job, regenerate=payload.get("regenerate", False))
+    if kit is None:
+        raise TaskError("Failed to generate the application kit. Please try again.")
+    return {"kit_id": kit.id}
+
+
+def _ranking(payload):
+    job = db.session.get(Job, payload["job_id"])
+    if job is None:
+        raise TaskError("The job no longer exists.")
+    resumes = Resume.query.filter(Resume.id.in_(payload["resume_ids"]), Resume.user_id == job.user_id).all()
+    candidates = [(resume, ensure_resume_text(resume)) for resume in resumes]
+
+    if payload.get("mode") == "fast":
+        # Local scores only; full analysis is one click away on the compare page
+        results, failures = quick_score_resumes(analyzer, job.description, candidates)
+    else:
+        # Stage 1: cheap local embedding scores pick the shortlist for the LLM
+        shortlist, screened_out = shortlist_candidates(embedder, job.description, candidates, payload["top_k"])
+        # Stage 2: full model analysis for the shortlist only
+        results, failures = score_resumes(
+            analyzer,
+            job.description,
+            shortlist,
+            max_workers=current_app.config["RANKING_MAX_WORKERS"],
+            timeout=current_app.config["RANKING_TIMEOUT"],
+        )
+        results.extend(sorted(screened_out, key=lambda x: (-x["score"], x["resume"].id)))
+
+    # Rows are stored by id; the results page loads the resumes again
+    return {
+        "results": [{**result, "resume": result["resume"].id} for result in results],
+        "failures": [{**failure, "resume": failure["resume"].id} for failure in failures],
+    }
+
+
+# Task kind -> handler taking the payload dict and returning a JSON-serializable result
+TASK_HANDLERS = {
+    "analyze": _analyze,
+    "cover_letter": _tool("generate_cover_letter"),
+    "interview_prep": _tool("generate_interview_prep"),
+    "networking": _tool("generate_networking_messages"),
+    "linkedin": _tool("optimize_linkedin"),
+    "negotiation": _negotiation,
+    "application_kit": _application_kit,
+    "ranking": _ranking,
+}
+
+
+def _has_text(html):
+    return bool(html.replace("<p>", "").replace("</p>", "").strip())
+
+
+def task_payload(kind, data, user_id):
+    """
+    Validates a tool's form or JSON input and returns the payload to enqueue for it.
+    Raises TaskError with a message for the user when the input is unusable.
+    """
+    regenerate = str(data.get("regenerate", "")).lower() in ("1", "true")
+
+    if kind == "negotiation":
+        job_title = (data.get("job_title") or "").strip()
+        if not job_title:
+            raise TaskError("Please enter a job title.")
+        return {"job_title": job_title, "offer_details": data.get("offer_details"), "regenerate": regenerate}
+
+    if kind == "application_kit":
+        resume = db.session.get(Resume, data.get("resume_id") or 0)
+        job = db.session.get(Job, data.get("job_id") or 0)
+        if not resume or resume.user_id != user_id or not job or job.user_id != user_id:
+            raise TaskError("Please select a resume and a saved job.")
+        return {"user_id": user_id, "resume_id": resume.id, "job_id": job.id, "regenerate": regenerate}
+
+    if kind == "ranking":
+        job = db.session.get(Job, data.get("job_id") or 0)
+        # A list in JSON, repeated form fields, or the comma-separated query string of older links
+        values = data.getlist("resume_ids") if hasattr(data, "getlist") else data.get("resume_ids") or []
+        if isinstance(values, str):
+            values = [values]
+        try:
+            resume_ids = [int(part) for value in values for part in str(value).split(",") if part.strip()]
+            top_k = int(data.get("top_k") or current_app.config["RANKING_TOP_K"])
+        except (TypeError, ValueError):
+            raise TaskError("Please select a job and at least one candidate.")
+        if not job or job.user_id != user_id or not resume_ids:
+            raise TaskError("Please select a job and at least one candidate.")
+        mode = "fast" if data.get("mode") == "fast" else "full"
+        return {"job_id": job.id, "resume_ids": resume_ids, "top_k": top_k, "mode": mode}
+
+    resume = db.session.get(Resume, data.get("resume_id") or 0)
+    job_description = data.get("job_description") or ""
+    if not resume or resume.user_id != user_id:
+        raise TaskError("Invalid resume selected.")
+    if not _has_text(job_description):
+        raise TaskError("Please provide a job description.")
+    payload = {"resume_id": resume.id, "job_description": job_description, "regenerate": regenerate}
+    if kind == "analyze":
+        payload["mode"] = "fast" if data.get("mode") == "fast" else "full"
+    return payload
+
+
+def claim_next_task():
+    """
+    Atomically moves the oldest queued task to running and returns its id, or None.
+    The conditional UPDATE means several processes can poll the same table without
+    running a task twice.
+    """
+    while True:
+        task_id = db.session.query(Task.id).filter_by(status="queued").order_by(Task.id).limit(1).scalar()
+        if task_id is None:
+            db.session.commit()
+            return None
+        claimed = Task.query.filter_by(id=task_id, status="queued").update(
+            {"status": "running", "started_at": datetime.now()}, synchronize_session=False
+        )
+        db.session.commit()
+        if claimed:
+            return task_id
+
+
+def run_task(task_id):
+    task = db.session.get(Task, task_id)
+    handler = TASK_HANDLERS.get(task.kind)
+    try:
+        if handler is None:
+            raise TaskError(f"Unknown task type '{task.kind}'.")
+        result = handler(json.loads(task.payload))
+        if not result:
+            raise TaskError("The model returned an unreadable response.")
+        task.result = json.dumps(result)
+        task.status = "done"
+    except TaskError as e:
+        task.error = str(e)
+        task.status = "failed"
+    except Exception as e:
+        logger.error(f"Task {task_id} ({task.kind}) failed: {e}")
+        task.error = "An error occurred while running this task."
+        task.status = "failed"
+    task.finished_at = datetime.now()
+    db.session.commit()
+
+
+def fail_stale_tasks(timeout):
+    """Marks tasks left running by a worker that died as failed."""
+    cutoff = datetime.now() - timedelta(seconds=timeout)
+    count = Task.query.filter(Task.status == "running", Task.started_at < cutoff).update(
+        {"status": "failed", "error": "The worker stopped before this task finished.", "finished_at": datetime.now()},
+        synchronize_session=False,
+    )
+    db.session.commit()
+    if count:
+        logger.warning(f"Marked {count} stale tasks as failed")
+
+
+class TaskWorker:
+    """
+    Local worker pool for the task table. A dispatcher thread claims queued tasks only while a
+    worker thread is free and hands them to the pool; enqueue_task wakes it immediately,
+    otherwise it polls so tasks queued by other processes are picked up too.
+    """
+
+    def __init__(self, app, max_workers, poll_interval):
+        self.app = app
+        self.poll_interval = poll_interval
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="task-worker")
+        self.slots = threading.BoundedSemaphore(max_workers)
+        self.wakeup = threading.Event()
+
+    def start(self):
+        thread = threading.Thread(target=self.dispatch, name="task-dispatcher", daemon=True)
+        thread.start()
+        return thread
+
+    def dispatch(self):
+        with self.app.app_context():
+            fail_stale_tasks(self.app.config["TASK_TIMEOUT"])
+        while True:
+            self.slots.acquire()
+            try:
+                with self.app.app_context():
+                    task_id = claim_next_task()
+            except Exception as e:
+                logger.error(f"Error claiming task: {e}")
+                task_id = None
+            if task_id is None:
+                self.slots.release()
+                self.wakeup.wait(self.poll_interval)
+                self.wakeup.clear()
+                continue
+            self.executor.submit(self._run, task_id)
+
+    def _run(self, task_id):
+        try:
+            with self.app.app_context():
+                run_task(task_id)
+        except Exception as e:
+            logger.error(f"Error running task {task_id}: {e}")
+        finally:
+            self.slots.release()
+
+
+_worker = None
+_worker_lock = threading.Lock()
+
+
+def _get_worker():
+    """Starts this process's worker pool on first use (TASK_MAX_WORKERS=0 leaves it to `flask tasks worker`)."""
+    global _worker
+    with _worker_lock:
+        if _worker is None and current_app.config.get("TASK_MAX_WORKERS", 4) > 0:
+            _worker = TaskWorker(
+                current_app._get_current_object(),
+                current_app.config["TASK_MAX_WORKERS"],
+                current_app.config.get("TASK_POLL_INTERVAL", 2),
+            )
+            _worker.start()
+    return _worker
+
+
+def enqueue_task(user_id, kind, payload):
+    """Stores a task and wakes the local worker pool. Returns the Task row."""
+    task = Task(user_id=user_id, kind=kind, status="queued", payload=json.dumps(payload))
+    db.session.add(task)
+    db.session.commit()
+    worker = _get_worker()
+    if worker is not None:
+        worker.wakeup.set()
+    return task
+
+
+def get_task(task_id, user_id):
+    _get_worker()
+    task = db.session.get(Task, task_id)
+    if task is None or task.user_id != user_id:
+        return None
+    return task
+
+
+tasks_cli = AppGroup("tasks", help="Background task commands.")
+
+
+@tasks_cli.command("worker")
+@click.option("--workers", type=int, default=None, help="Worker threads (defaults to TASK_MAX_WORKERS).")
+def worker_command(workers):
+    """Run a standalone task worker in the foreground."""
+    app = current_app._get_current_object()
+    workers = workers or app.config["TASK_MAX_WORKERS"] or 1
+    click.echo(f"Task worker running with {workers} threads")
+    TaskWorker(app, workers, app.config.get("TASK_POLL_INTERVAL", 2)).dispatch()
+
+
+@tasks_cli.command("prune")
+@click.option("--days", type=int, default=7, help="Delete finished tasks older than this.")
+def prune_command(days):
+    """Delete finished tasks."""
+    cutoff = datetime.now() - timedelta(days=days)
+    count = Task.query.filter(Task.status.in_(["done", "failed"]), Task.finished_at < cutoff).delete(
+        synchronize_session=False
+    )
+    db.session.commit()
+    click.echo(f"Deleted {count} tasks")